@@ -13,7 +13,8 @@ import java.util.concurrent.TimeUnit;
 public class SolutionSpaceBenchmark {
 
     /**
-     * Benchmark filterSolution on a small (c=6,d=4) space — exercises the serial path.
+     * Benchmark the first filterSolution on a small (c=6,d=4) space, which enumerates
+     * the consistent codes with {@link ConsistentCodes}.
      * Reset is done per-invocation since filterSolution mutates state.
      */
     @Benchmark
@@ -24,7 +25,7 @@ public class SolutionSpaceBenchmark {
     }
 
     /**
-     * Benchmark filterSolution on a large (c=9,d=5) space — exercises the parallel path.
+     * Benchmark the first filterSolution on a large (c=9,d=5) space.
      */
     @Benchmark
     @OutputTimeUnit(TimeUnit.MILLISECONDS)
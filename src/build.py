@@ -28,6 +28,7 @@ console = Console()
 
 _ROOT = Path(__file__).parents[1]
 _SRC_JAVA = _ROOT / "src" / "main" / "java"
+_SRC_RESOURCES = _ROOT / "src" / "main" / "resources"
 _CLASSES = _ROOT / "target" / "classes"
 _OUT_JAR = _ROOT / "src" / "main" / "mastermind-solver.jar"
 _OUT_JRE = _ROOT / "src" / "main" / "jre"
@@ -109,6 +110,10 @@ def _compile(javac: Path, jar_tool: Path):
     with console.status("Compiling Java sources..."):
         subprocess.run([str(javac), "-d", str(_CLASSES)] + sources, check=True)
 
+    # Resources (e.g. the second guess book) are packaged next to the classes
+    if _SRC_RESOURCES.is_dir():
+        shutil.copytree(_SRC_RESOURCES, _CLASSES, dirs_exist_ok=True)
+
     tmp_jar = _ROOT / "target" / "mastermind-solver.jar"
     tmp_jar.parent.mkdir(parents=True, exist_ok=True)
 
@@ -1,13 +1,27 @@
 package org.mastermind;
 
+import org.mastermind.codes.CanonicalCode;
 import org.mastermind.codes.ConvertCode;
 import org.mastermind.compute.ExpectedSize;
+import org.mastermind.compute.MachineProfile;
+import org.mastermind.compute.SecretOrbits;
 import org.mastermind.compute.SolutionSpace;
 import org.mastermind.solver.BestFirstGuess;
 import org.mastermind.solver.BestGuess;
 import org.mastermind.solver.GuessStrategy;
+import org.mastermind.solver.RetainedCandidates;
+import org.mastermind.solver.SearchControl;
+import org.mastermind.solver.SearchProgress;
+import org.mastermind.solver.SecondGuessBook;
 
+import java.io.IOException;
+import java.nio.ByteBuffer;
+import java.nio.ByteOrder;
+import java.nio.channels.FileChannel;
+import java.nio.file.Path;
+import java.nio.file.StandardOpenOption;
 import java.util.ArrayList;
+import java.util.Arrays;
 import java.util.Collections;
 import java.util.List;
 
@@ -19,15 +33,48 @@ import java.util.List;
  * <p>Guess and secret array selection is delegated to {@link GuessStrategy},
  * which can be edited independently to change strategy behavior.
  * </p>
+ *
+ * <p>The strongest guesses of each search are kept in a {@link RetainedCandidates},
+ * whose histograms follow every recorded feedback. The best of them bounds the
+ * next search from its start (see {@link #setCandidateRetention(int)}).
+ * </p>
+ *
+ * <p>When a search scores against the whole solution space, the feedback of the
+ * suggested guess against every secret is kept, and recording that guess filters
+ * the space by those feedbacks instead of computing them again
+ * (see {@link #setPartitionReuse(boolean)}).
+ * </p>
+ *
+ * <p>A session can be saved with {@link #save(Path)} and resumed with
+ * {@link #resume(Path)} without filtering again: the file holds the history and
+ * the solution space as it is (see {@link SolutionSpace#save(Path)}), so resuming
+ * costs one copy of the space instead of one filter per turn.
+ * </p>
  */
 public final class MastermindSession {
 
-    private final int           c;
-    private final int           d;
-    private final int           winFeedback;        // d*10 — all d pegs correct
-    private final SolutionSpace solutionSpace;
-    private final List<int[]>   history;    // each element: {guess, feedback}
-    private       boolean       solved;
+    /** Number of guesses retained across turns by default. */
+    private static final int DEFAULT_RETAINED = 8;
+    /** Default undo budget, as a fraction of the c^d / 8 bytes of a dense solution space. */
+    private static final int UNDO_BUDGET_DIVISOR = 4;
+
+    private static final int FILE_MAGIC   = 0x4D4D5345;  // "MMSE"
+    private static final int FILE_VERSION = 1;
+    /** Bytes before the history in a saved session, then 8 per turn, which keeps the space 8-byte aligned. */
+    private static final int FILE_HEADER_BYTES = 16;
+
+    private final    int                c;
+    private final    int                d;
+    private final    int                winFeedback;     // d*10 — all d pegs correct
+    private final    SolutionSpace      solutionSpace;
+    private final    List<int[]>        history;         // each element: {guess, feedback}
+    private          RetainedCandidates retained;        // strong guesses of past searches
+    private          StrategyTree       strategyTree;    // precomputed suggestions, or null
+    private          boolean            reusePartition = true;
+    private          int                partitionGuess;  // guess whose feedbacks are kept
+    private          byte[]             partition;       // its feedback against each secret, or null
+    private          boolean            solved;
+    private volatile SearchControl      activeSearch;    // control of the running suggestion, if any
 
     /**
      * Create a new Mastermind session.
@@ -36,12 +83,80 @@ public final class MastermindSession {
      * @param d number of digit positions (1–9)
      */
     public MastermindSession(int c, int d) {
-        this.c = c;
-        this.d = d;
+        this(new SolutionSpace(c, d));
+    }
+
+    /** Create a session over a solution space, with an empty history. */
+    private MastermindSession(SolutionSpace solutionSpace) {
+        this.c = solutionSpace.getC();
+        this.d = solutionSpace.getD();
         this.winFeedback = d * 10;
-        this.solutionSpace = new SolutionSpace(c, d);
+        this.solutionSpace = solutionSpace;
         this.history = new ArrayList<>();
+        this.retained = new RetainedCandidates(c, d, DEFAULT_RETAINED);
         this.solved = false;
+        solutionSpace.setJournalBudget((long) Math.pow(c, d) / 8 / UNDO_BUDGET_DIVISOR);
+        MachineProfile.current();  // calibrate now, if needed, rather than inside the first search
+    }
+
+    /**
+     * Answer suggestions from a precomputed strategy tree while the game follows
+     * it. Once a recorded guess differs from the tree's suggestion, the session
+     * searches as usual.
+     *
+     * @param tree strategy tree of this game's size, or null to always search
+     * @throws IllegalArgumentException if the tree is for another game size
+     */
+    public void setStrategyTree(StrategyTree tree) {
+        if (tree != null && (tree.getC() != c || tree.getD() != d))
+            throw new IllegalArgumentException("Strategy tree is for c=" + tree.getC() + ", d=" + tree.getD() + ".");
+        strategyTree = tree;
+    }
+
+    /**
+     * Set how many of the strongest guesses of each search are kept, with their
+     * feedback histograms, for the following turns.
+     *
+     * <p>After each recorded feedback the histograms are updated by the secrets it
+     * eliminated, and the best retained guess is handed to {@link BestGuess} as an
+     * incumbent whenever the search scores guesses against every remaining secret.
+     * The suggestion is then the same as without retention, except that a retained
+     * guess is suggested when it is strictly better than every candidate searched.
+     *
+     * @param count number of guesses to retain, 0 to disable (default 8)
+     */
+    public void setCandidateRetention(int count) {
+        retained = new RetainedCandidates(c, d, count);
+    }
+
+    /**
+     * Keep the feedback of each suggested guess against every secret, one byte per
+     * secret, so that recording it does not compute them again (enabled by default).
+     * Only applies to suggestions scored against the whole solution space.
+     *
+     * @param enable {@code true} to keep the feedbacks of the suggested guess
+     */
+    public void setPartitionReuse(boolean enable) {
+        reusePartition = enable;
+        if (!enable) partition = null;
+    }
+
+    /**
+     * Set how many bytes of past solution space states are kept so that
+     * {@link #undo(int)} does not filter again (see {@link SolutionSpace#setJournalBudget(long)}).
+     *
+     * <p>Keeping a state trades memory for an undo without filtering. The default,
+     * a quarter of the size of a dense solution space, only keeps sparse states:
+     * a dense state is a copy of the whole space (48 MB for 9×9), kept on every
+     * turn in case of an undo that may never come, while undoing past it replays
+     * the history in a single pass. Raise the budget to undo dense turns of a large
+     * game without that pass, e.g. in assisted play where mistakes are common;
+     * lower it to 0 to keep no state but the free one before the first guess.
+     *
+     * @param bytes undo budget in bytes (default c^d / 32)
+     */
+    public void setUndoBudget(long bytes) {
+        solutionSpace.setJournalBudget(bytes);
     }
 
     /**
@@ -49,7 +164,9 @@ public final class MastermindSession {
      *
      * <p>Array selection (which candidates to evaluate and which secrets to score
      * against) is handled by {@link GuessStrategy}. If only one secret remains,
-     * it is returned immediately without invoking the BestGuess search.
+     * it is returned immediately without invoking the BestGuess search, and the
+     * second guess after the first guess of {@link BestFirstGuess} is read from
+     * the {@link SecondGuessBook} when it has an entry.
      *
      * @return the recommended guess as a code index (0-based, base-c encoding)
      * @throws IllegalStateException if the game is already solved
@@ -69,8 +186,56 @@ public final class MastermindSession {
      * @throws IllegalStateException if the game is already solved
      */
     public long[] suggestGuessWithDetails() {
+        return suggestGuessWithDetails(SearchControl.unlimited());
+    }
+
+    /**
+     * Suggest the best next guess found within a time limit.
+     *
+     * <p>When the deadline passes, the search stops and returns the best guess
+     * scored so far (at least one guess is always scored). The deadline also
+     * covers choosing the search space: once it has passed, the cheapest sampled
+     * space is searched. The search can also be stopped early from another thread
+     * with {@link #cancelSearch()}.
+     *
+     * @param timeoutMillis time allowed for the search, in milliseconds
+     * @return long[] where [0]=guess, [1]=rank, [2]=scoring secrets length
+     * @throws IllegalStateException if the game is already solved
+     */
+    public long[] suggestGuessWithDetails(long timeoutMillis) {
+        return suggestGuessWithDetails(SearchControl.withTimeout(timeoutMillis));
+    }
+
+    /**
+     * Stop the running {@link #suggestGuessWithDetails} search, if any, which then
+     * returns the best guess scored so far. Safe to call from any thread
+     * (including a Python thread through JPype); does nothing when no search runs.
+     */
+    public void cancelSearch() {
+        SearchControl control = activeSearch;
+        if (control != null) control.cancel();
+    }
+
+    /**
+     * Take a snapshot of the running {@link #suggestGuessWithDetails} search, for
+     * live display. Safe to call from any thread, and cheap enough to poll several
+     * times per second.
+     *
+     * @return progress of the running search, or null when no search runs
+     */
+    public SearchProgress getSearchProgress() {
+        SearchControl control = activeSearch;
+        return control == null ? null : control.progress();
+    }
+
+    private long[] suggestGuessWithDetails(SearchControl control) {
         if (solved) throw new IllegalStateException("Game is already solved.");
 
+        if (strategyTree != null) {
+            long[] node = strategyTree.lookup(history);
+            if (node != null) return node;
+        }
+
         if (history.isEmpty()) {
             long[] first = BestFirstGuess.of(c, d);
             return new long[] {
@@ -83,9 +248,40 @@ public final class MastermindSession {
             return new long[] { only[0], 1L, 1L };
         }
 
-        int[][] searchSpace = GuessStrategy.select(c, d, solutionSpace);  // {guesses, secrets}
-        long[]  result      = BestGuess.findBestGuess(searchSpace[0], searchSpace[1], c, d);
-        return new long[] { result[0], result[1], searchSpace[1].length };    // {guess, rank, secrets length}
+        // Second turn after the usual first guess: look the answer up in the opening book
+        if (history.size() == 1) {
+            int[]  first = history.get(0);
+            long[] book  = SecondGuessBook.of(c, d, ConvertCode.toCode(c, d, first[0]), first[1]);
+            if (book != null) return new long[] { ConvertCode.toIndex(c, d, (int) book[0]), book[1], book[2] };
+        }
+
+        // Published before choosing the search space, so an early cancel is not lost
+        activeSearch = control;
+        try {
+            int[] pastGuesses = new int[history.size()];
+            for (int i = 0; i < pastGuesses.length; i++) pastGuesses[i] = history.get(i)[0];
+
+            // {guesses, secrets}
+            int[][] searchSpace = GuessStrategy.select(c, d, solutionSpace, pastGuesses, control);
+
+            // Weighted secrets and retained ranks are only exact when scoring against the whole solution space,
+            // which only the tier tells: a sample drawn with replacement may hold as many secrets
+            boolean      exact  = control.progress().tier().scoresAllSecrets();
+            SecretOrbits orbits = exact ?
+                    new SecretOrbits(solutionSpace, CanonicalCode.unusedColors(c, d, pastGuesses), c, d) : null;
+            if (exact && reusePartition) control.keepBestFeedbacks();
+            long[] result = BestGuess.findBestGuess(searchSpace[0], searchSpace[1], orbits, c, d, control,
+                                                    exact ? retained.best() : null);
+
+            if (exact) retained.retain(control.bestGuesses(), searchSpace[1]);
+            if (control.bestFeedbacks() != null) {
+                partitionGuess = (int) result[0];
+                partition = control.bestFeedbacks();
+            }
+            return new long[] { result[0], result[1], searchSpace[1].length };  // {guess, rank, secrets length}
+        } finally {
+            activeSearch = null;
+        }
     }
 
     /**
@@ -100,6 +296,8 @@ public final class MastermindSession {
         if (solved) throw new IllegalStateException("Game is already solved.");
 
         history.add(new int[] { guess, feedback });
+        byte[] known = guess == partitionGuess ? partition : null;  // feedbacks of the suggested guess
+        partition = null;
 
         // If game is solved, skip filtering directly
         if (feedback == winFeedback) {
@@ -107,8 +305,10 @@ public final class MastermindSession {
             return;
         }
 
-        // Otherwise filter solution space
-        solutionSpace.filterSolution(guess, feedback);
+        // Otherwise filter solution space, and the histograms of the retained guesses with it
+        if (known != null) solutionSpace.filterPartition(known, feedback);
+        else solutionSpace.filterSolution(guess, feedback);
+        retained.update(solutionSpace);
 
         // Handle error case when no solution remains
         if (solutionSpace.getSize() == 0) {
@@ -118,8 +318,51 @@ public final class MastermindSession {
     }
 
     /**
-     * Undo the last {@code n} recorded guesses, reconstructing the solution space
-     * by replaying the remaining history from scratch.
+     * Record several guesses and their feedbacks at once, e.g. to enter a game
+     * played elsewhere. The solution space is filtered by all of them in a single
+     * pass (see {@link SolutionSpace#filterSolutions}), which is faster than
+     * recording them one by one.
+     *
+     * @param guesses   the guesses as code indices (0-based, base-c encoding), in play order
+     * @param feedbacks feedback of each guess (black*10 + white)
+     * @throws IllegalStateException    if the game is already solved
+     * @throws IllegalArgumentException if the arrays differ in length, a guess other than
+     *                                  the last wins, or the feedbacks leave no valid secrets
+     */
+    public void recordGuesses(int[] guesses, int[] feedbacks) {
+        if (solved) throw new IllegalStateException("Game is already solved.");
+        if (guesses.length != feedbacks.length)
+            throw new IllegalArgumentException("Every guess needs exactly one feedback.");
+        for (int i = 0; i < feedbacks.length - 1; i++) {
+            if (feedbacks[i] == winFeedback) throw new IllegalArgumentException("Only the last guess can win.");
+        }
+        if (guesses.length == 0) return;
+
+        for (int i = 0; i < guesses.length; i++) history.add(new int[] { guesses[i], feedbacks[i] });
+        partition = null;
+
+        // The winning guess, if any, does not filter the solution space
+        int filtered = guesses.length;
+        if (feedbacks[filtered - 1] == winFeedback) {
+            solved = true;
+            filtered--;
+        }
+        if (filtered == 0) return;
+
+        solutionSpace.filterSolutions(Arrays.copyOf(guesses, filtered), Arrays.copyOf(feedbacks, filtered));
+        retained.update(solutionSpace);
+
+        // Handle error case when no solution remains
+        if (solutionSpace.getSize() == 0) {
+            throw new IllegalArgumentException(
+                    "No valid secrets remain. The feedback provided may be inconsistent with prior guesses.");
+        }
+    }
+
+    /**
+     * Undo the last {@code n} recorded guesses. The solution space is restored from
+     * its journal of past states, or, for turns older than the journal keeps,
+     * reconstructed by replaying the remaining history from scratch.
      *
      * @param n number of guesses to undo (must be &gt;= 1 and &lt;= turn count)
      * @throws IllegalArgumentException if {@code n} is out of range
@@ -131,10 +374,14 @@ public final class MastermindSession {
         int         keep = history.size() - n;
         List<int[]> kept = new ArrayList<>(history.subList(0, keep));
 
-        // Reconstruct solution space from the beginning
-        solutionSpace.reset();
-        for (int[] entry : kept) {
-            solutionSpace.filterSolution(entry[0], entry[1]);
+        // The winning guess did not filter the solution space
+        int filtered = solved ? n - 1 : n;
+        retained.clear();
+        partition = null;
+        if (!solutionSpace.undo(filtered)) {
+            // Reconstruct solution space from the beginning, in a single pass
+            solutionSpace.reset();
+            solutionSpace.filterSolutions(column(kept, 0), column(kept, 1));
         }
 
         history.clear();
@@ -142,6 +389,73 @@ public final class MastermindSession {
         solved = false;
     }
 
+    /**
+     * Save the game state, i.e. the history and the solution space, to a file,
+     * replacing it if it exists. Settings, the retained guesses and the undo
+     * journal are not saved.
+     *
+     * @param path file to write
+     * @throws IOException if the file cannot be written
+     */
+    public void save(Path path) throws IOException {
+        try (FileChannel channel = FileChannel.open(path, StandardOpenOption.CREATE, StandardOpenOption.READ,
+                                                    StandardOpenOption.WRITE, StandardOpenOption.TRUNCATE_EXISTING)) {
+            ByteBuffer buffer = channel.map(FileChannel.MapMode.READ_WRITE, 0,
+                                            FILE_HEADER_BYTES + 8L * history.size());
+            buffer.order(ByteOrder.LITTLE_ENDIAN);
+            buffer.putInt(FILE_MAGIC).putInt(FILE_VERSION);
+            buffer.put((byte) c).put((byte) d).put((byte) (solved ? 1 : 0)).put((byte) 0);
+            buffer.putInt(history.size());
+            for (int[] entry : history) buffer.putInt(entry[0]).putInt(entry[1]);
+            solutionSpace.write(channel, buffer.limit());
+        }
+    }
+
+    /**
+     * Resume a game saved by {@link #save(Path)}, reading its solution space
+     * instead of filtering it again. The session has default settings, and its
+     * undo journal starts empty, so {@link #undo(int)} replays the history.
+     *
+     * @param path file to read
+     * @return the session, in the state it was saved in
+     * @throws IOException if the file cannot be read or is not a saved session of this version
+     */
+    public static MastermindSession resume(Path path) throws IOException {
+        try (FileChannel channel = FileChannel.open(path, StandardOpenOption.READ)) {
+            if (channel.size() < FILE_HEADER_BYTES) throw new IOException("Not a saved session.");
+            ByteBuffer header = channel.map(FileChannel.MapMode.READ_ONLY, 0, FILE_HEADER_BYTES);
+            header.order(ByteOrder.LITTLE_ENDIAN);
+            if (header.getInt() != FILE_MAGIC) throw new IOException("Not a saved session.");
+            int version = header.getInt();
+            if (version != FILE_VERSION) throw new IOException("Unsupported session version: " + version);
+
+            int     c      = header.get(8);
+            int     d      = header.get(9);
+            boolean solved = header.get(10) != 0;
+            int     turns  = header.getInt(12);
+            if (turns < 0 || channel.size() - FILE_HEADER_BYTES < 8L * turns)
+                throw new IOException("Saved session is truncated.");
+
+            long          spaceStart = FILE_HEADER_BYTES + 8L * turns;
+            SolutionSpace space      = SolutionSpace.read(channel, spaceStart);
+            if (space.getC() != c || space.getD() != d) throw new IOException("Saved session is corrupt.");
+
+            MastermindSession session = new MastermindSession(space);
+            ByteBuffer        entries = channel.map(FileChannel.MapMode.READ_ONLY, FILE_HEADER_BYTES, 8L * turns);
+            entries.order(ByteOrder.LITTLE_ENDIAN);
+            for (int i = 0; i < turns; i++) session.history.add(new int[] { entries.getInt(), entries.getInt() });
+            session.solved = solved;
+            return session;
+        }
+    }
+
+    /** @return the given element of each history entry */
+    private static int[] column(List<int[]> entries, int element) {
+        int[] column = new int[entries.size()];
+        for (int i = 0; i < column.length; i++) column[i] = entries.get(i)[element];
+        return column;
+    }
+
     /** @return {@code true} if the secret has been identified */
     public boolean isSolved() { return solved; }
 
@@ -0,0 +1,294 @@
+package org.mastermind;
+
+import org.mastermind.compute.Feedback;
+
+import java.io.BufferedInputStream;
+import java.io.BufferedOutputStream;
+import java.io.DataInputStream;
+import java.io.DataOutputStream;
+import java.io.IOException;
+import java.io.InputStream;
+import java.io.OutputStream;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.List;
+
+/**
+ * The complete strategy {@link MastermindSession} follows in a small game: for
+ * every history of (guess, feedback) a game can reach, the guess it suggests.
+ *
+ * <p>Each node holds the suggested guess with its details, and one child per
+ * feedback to that guess that leaves at least one secret (other than the
+ * winning feedback). The tree is built by replaying every history in a fresh
+ * session, so it is exactly what the session would suggest in a live game.
+ * A session given the tree with {@link MastermindSession#setStrategyTree}
+ * then answers in O(depth) without searching, as long as the game stays on the
+ * tree's guesses.
+ *
+ * <p>Trees are built for games of at most {@value #MAX_CODES} codes (7×5).
+ * Run {@link #main(String[])} to build one and write it to a file, e.g.
+ * {@code StrategyTree 6x4 strategy-6x4.bin}. The binary format stores the nodes
+ * in preorder, each child right after the feedback that leads to it.
+ */
+public final class StrategyTree {
+    /** Largest c^d for which a tree is built. */
+    public static final int MAX_CODES = 16807;
+
+    private static final int MAGIC   = 0x4D4D5354;  // "MMST"
+    private static final int VERSION = 1;
+
+    private final int    c;
+    private final int    d;
+    private final int[]  guess;          // suggested guess index of each node
+    private final long[] rank;           // its rank
+    private final int[]  secretsLength;  // number of secrets it was scored against
+    private final int[]  childStart;     // first edge of each node
+    private final int[]  childCount;     // number of edges of each node
+    private final byte[] edgeFeedback;   // feedback leading to each edge's child
+    private final int[]  edgeChild;      // child node of each edge
+
+    private StrategyTree(int c, int d, int[] guess, long[] rank, int[] secretsLength, int[] childStart,
+                         int[] childCount, byte[] edgeFeedback, int[] edgeChild) {
+        this.c = c;
+        this.d = d;
+        this.guess = guess;
+        this.rank = rank;
+        this.secretsLength = secretsLength;
+        this.childStart = childStart;
+        this.childCount = childCount;
+        this.edgeFeedback = edgeFeedback;
+        this.edgeChild = edgeChild;
+    }
+
+    /**
+     * Build the strategy tree of a game.
+     *
+     * @param c number of colors (1–9)
+     * @param d number of digit positions (1–9)
+     * @return the tree of every history reachable by following the session's suggestions
+     * @throws IllegalArgumentException if the game has more than {@value #MAX_CODES} codes
+     */
+    public static StrategyTree build(int c, int d) {
+        if (Math.pow(c, d) > MAX_CODES)
+            throw new IllegalArgumentException("Game too large for a strategy tree: c=" + c + ", d=" + d);
+
+        NodeBuilder builder = new NodeBuilder(c, d);
+        builder.addNode(new ArrayList<>());
+        return builder.toTree();
+    }
+
+    /**
+     * Look up the suggestion for a game history.
+     *
+     * @param history guesses and feedbacks so far, each {@code {guess, feedback}}
+     * @return long[] where [0]=guess, [1]=rank, [2]=scoring secrets length, as
+     *         {@link MastermindSession#suggestGuessWithDetails()} returns; or null if
+     *         the history leaves the tree
+     */
+    public long[] lookup(List<int[]> history) {
+        int node = 0;
+        for (int[] entry : history) {
+            if (entry[0] != guess[node]) return null;
+
+            int next = -1;
+            for (int e = childStart[node]; e < childStart[node] + childCount[node]; e++) {
+                if (edgeFeedback[e] == entry[1]) next = edgeChild[e];
+            }
+            if (next < 0) return null;
+            node = next;
+        }
+        return new long[] { guess[node], rank[node], secretsLength[node] };
+    }
+
+    /** @return number of colors of the game */
+    public int getC() { return c; }
+
+    /** @return number of digit positions of the game */
+    public int getD() { return d; }
+
+    /** @return number of nodes, i.e. of distinct histories with a suggestion */
+    public int size() { return guess.length; }
+
+    /**
+     * Write the tree in its binary format.
+     *
+     * @param out stream to write to (not closed)
+     */
+    public void write(OutputStream out) throws IOException {
+        DataOutputStream data = new DataOutputStream(new BufferedOutputStream(out));
+        data.writeInt(MAGIC);
+        data.writeInt(VERSION);
+        data.writeByte(c);
+        data.writeByte(d);
+        data.writeInt(size());
+        writeNode(data, 0);
+        data.flush();
+    }
+
+    private void writeNode(DataOutputStream data, int node) throws IOException {
+        data.writeInt(guess[node]);
+        data.writeLong(rank[node]);
+        data.writeInt(secretsLength[node]);
+        data.writeByte(childCount[node]);
+        for (int e = childStart[node]; e < childStart[node] + childCount[node]; e++) {
+            data.writeByte(edgeFeedback[e]);
+            writeNode(data, edgeChild[e]);
+        }
+    }
+
+    /**
+     * Read a tree written by {@link #write}.
+     *
+     * @param in stream to read from (not closed)
+     * @return the tree
+     * @throws IOException if the stream is not a strategy tree of this version
+     */
+    public static StrategyTree read(InputStream in) throws IOException {
+        DataInputStream data = new DataInputStream(new BufferedInputStream(in));
+        if (data.readInt() != MAGIC) throw new IOException("Not a strategy tree.");
+        int version = data.readInt();
+        if (version != VERSION) throw new IOException("Unsupported strategy tree version: " + version);
+
+        int        c     = data.readByte();
+        int        d     = data.readByte();
+        NodeReader nodes = new NodeReader(data, data.readInt());
+        nodes.readNode();
+        if (nodes.nodes != nodes.expected) throw new IOException("Strategy tree has fewer nodes than declared.");
+        return nodes.toTree(c, d);
+    }
+
+    /**
+     * Build the strategy tree of a game and write it to a file.
+     *
+     * <p>Usage: {@code StrategyTree CxD output}, e.g. {@code StrategyTree 6x4 strategy-6x4.bin}.
+     */
+    public static void main(String[] args) throws IOException {
+        String[]     game = args[0].split("x");
+        long         t    = System.nanoTime();
+        StrategyTree tree = build(Integer.parseInt(game[0]), Integer.parseInt(game[1]));
+        try (OutputStream out = Files.newOutputStream(Path.of(args[1]))) {
+            tree.write(out);
+        }
+        System.out.printf("%s: %d nodes written to %s (%.1fs)%n", args[0], tree.size(), args[1],
+                          (System.nanoTime() - t) / 1e9);
+    }
+
+    /** Node arrays filled in preorder, growing as needed. */
+    private abstract static class Nodes {
+        int[]  guess         = new int[64];
+        long[] rank          = new long[64];
+        int[]  secretsLength = new int[64];
+        int[]  childStart    = new int[64];
+        int[]  childCount    = new int[64];
+        byte[] edgeFeedback  = new byte[64];
+        int[]  edgeChild     = new int[64];
+        int    nodes;
+        int    edges;
+
+        int newNode(long[] details) {
+            if (nodes == guess.length) {
+                guess = Arrays.copyOf(guess, nodes * 2);
+                rank = Arrays.copyOf(rank, nodes * 2);
+                secretsLength = Arrays.copyOf(secretsLength, nodes * 2);
+                childStart = Arrays.copyOf(childStart, nodes * 2);
+                childCount = Arrays.copyOf(childCount, nodes * 2);
+            }
+            guess[nodes] = (int) details[0];
+            rank[nodes] = details[1];
+            secretsLength[nodes] = (int) details[2];
+            return nodes++;
+        }
+
+        /** Reserve the edges of a node, whose children are added afterwards. */
+        void reserveEdges(int node, int count) {
+            while (edges + count > edgeChild.length) {
+                edgeFeedback = Arrays.copyOf(edgeFeedback, edgeChild.length * 2);
+                edgeChild = Arrays.copyOf(edgeChild, edgeChild.length * 2);
+            }
+            childStart[node] = edges;
+            childCount[node] = count;
+            edges += count;
+        }
+
+        StrategyTree toTree(int c, int d) {
+            return new StrategyTree(c, d, Arrays.copyOf(guess, nodes), Arrays.copyOf(rank, nodes),
+                                    Arrays.copyOf(secretsLength, nodes), Arrays.copyOf(childStart, nodes),
+                                    Arrays.copyOf(childCount, nodes), Arrays.copyOf(edgeFeedback, edges),
+                                    Arrays.copyOf(edgeChild, edges));
+        }
+    }
+
+    /** Builds the nodes by replaying each history in a fresh session. */
+    private static final class NodeBuilder extends Nodes {
+        private final int   c;
+        private final int   d;
+        private final int[] validFeedback;
+        private final int[] feedbackFreq = new int[100];
+
+        NodeBuilder(int c, int d) {
+            this.c = c;
+            this.d = d;
+            this.validFeedback = Feedback.enumerateFeedback(d);
+        }
+
+        int addNode(List<int[]> history) {
+            MastermindSession session = new MastermindSession(c, d);
+            for (int[] entry : history) session.recordGuess(entry[0], entry[1]);
+            int node     = newNode(session.suggestGuessWithDetails());
+            int guessInd = guess[node];
+
+            // One child per feedback that leaves secrets, except the winning one
+            int[] colorFreq = new int[c];
+            for (int secretInd : session.getSolutionSpaceSecrets()) {
+                feedbackFreq[Feedback.getFeedback(guessInd, secretInd, c, d, colorFreq)]++;
+            }
+            int[] feedbacks = new int[validFeedback.length];
+            int   count     = 0;
+            for (int feedback : validFeedback) {
+                if (feedbackFreq[feedback] > 0 && feedback != d * 10) feedbacks[count++] = feedback;
+                feedbackFreq[feedback] = 0;
+            }
+
+            reserveEdges(node, count);
+            for (int i = 0; i < count; i++) {
+                List<int[]> next = new ArrayList<>(history);
+                next.add(new int[] { guessInd, feedbacks[i] });
+                int edge  = childStart[node] + i;
+                int child = addNode(next);  // may grow the edge arrays, so assign after
+                edgeFeedback[edge] = (byte) feedbacks[i];
+                edgeChild[edge] = child;
+            }
+            return node;
+        }
+
+        StrategyTree toTree() { return toTree(c, d); }
+    }
+
+    /** Reads the nodes of a written tree, in preorder. */
+    private static final class NodeReader extends Nodes {
+        private final DataInputStream data;
+        private final int             expected;
+
+        NodeReader(DataInputStream data, int expected) {
+            this.data = data;
+            this.expected = expected;
+        }
+
+        int readNode() throws IOException {
+            if (nodes == expected) throw new IOException("Strategy tree has more nodes than declared.");
+            int node  = newNode(new long[] { data.readInt(), data.readLong(), data.readInt() });
+            int count = data.readUnsignedByte();
+            reserveEdges(node, count);
+            for (int i = 0; i < count; i++) {
+                int  edge     = childStart[node] + i;
+                byte feedback = data.readByte();
+                int  child    = readNode();  // may grow the edge arrays, so assign after
+                edgeFeedback[edge] = feedback;
+                edgeChild[edge] = child;
+            }
+            return node;
+        }
+    }
+}
@@ -1,5 +1,8 @@
 package org.mastermind.codes;
 
+import java.util.Arrays;
+import java.util.stream.IntStream;
+
 /**
  * Canonical forms are one representative code per symmetry equivalence class,
  * used to reduce the first-guess search space.
@@ -10,6 +13,14 @@ package org.mastermind.codes;
  * classes are exactly the integer partitions of d into at most c parts — the
  * multiset of color frequencies, or "bucket." For c=9, d=9 this gives just 30
  * canonical forms, down from 387,420,489 total codes.
+ *
+ * <p>Later in the game, part of the symmetry survives the guesses made so far.
+ * Colors that no past guess used are still interchangeable, and positions that
+ * held identical digits in every past guess can still be permuted among
+ * themselves. Each past guess is unchanged by these relabelings, so the
+ * remaining secrets are mapped onto themselves and equivalent guesses have the
+ * same expected size. {@link #enumerateCanonicalGuesses} returns one guess per
+ * equivalence class under this reduced symmetry.
  */
 public final class CanonicalCode {
     /**
@@ -87,4 +98,208 @@ public final class CanonicalCode {
         }
         return ind;
     }
+
+    /**
+     * Find the colors that no past guess used. These colors are interchangeable:
+     * relabeling them among themselves leaves every past guess, and so the
+     * solution space, unchanged.
+     *
+     * @param c           number of colors (<= 9)
+     * @param d           number of digits (<= 9)
+     * @param pastGuesses indices of the guesses made so far (0-based, base-c encoding)
+     * @return unused colors (0-based), in increasing order
+     */
+    public static int[] unusedColors(int c, int d, int[] pastGuesses) {
+        boolean[] used = new boolean[c];
+        for (int guess : pastGuesses) {
+            for (int p = 0; p < d; p++) {
+                used[guess % c] = true;
+                guess /= c;
+            }
+        }
+        return IntStream.range(0, c).filter(color -> !used[color]).toArray();
+    }
+
+    /**
+     * Count the guesses returned by {@link #enumerateCanonicalGuesses}, stopping
+     * early once the count exceeds {@code limit}.
+     *
+     * @param c           number of colors (<= 9)
+     * @param d           number of digits (<= 9)
+     * @param pastGuesses indices of the guesses made so far (0-based, base-c encoding)
+     * @param limit       stop counting above this value
+     * @return number of canonical guesses, or a value greater than {@code limit}
+     */
+    public static long countCanonicalGuesses(int c, int d, int[] pastGuesses, long limit) {
+        HistorySymmetry symmetry = new HistorySymmetry(c, d, pastGuesses, null, limit);
+        symmetry.generate();
+        return symmetry.count;
+    }
+
+    /**
+     * Enumerate one guess per equivalence class under the symmetry left by the
+     * past guesses: permutations of the colors no past guess used, combined with
+     * permutations of positions that held the same digit in every past guess.
+     *
+     * <p>A code is identified within its class by the multiset of digits in each
+     * position class (order within a class does not matter) up to relabeling the
+     * unused colors. The representative gives the unused colors non-increasing
+     * count profiles across position classes (in label order) and writes the
+     * digits of each position class in non-decreasing order of position. With no
+     * past guesses this reduces to {@link #enumerateCanonicalForms}'s partitions.
+     *
+     * @param c           number of colors (<= 9)
+     * @param d           number of digits (<= 9)
+     * @param pastGuesses indices of the guesses made so far (0-based, base-c encoding)
+     * @return array of representative guess indices (0-based, base-c encoding)
+     */
+    public static int[] enumerateCanonicalGuesses(int c, int d, int[] pastGuesses) {
+        HistorySymmetry symmetry = new HistorySymmetry(c, d, pastGuesses, new int[64], Integer.MAX_VALUE);
+        symmetry.generate();
+        if (symmetry.count > Integer.MAX_VALUE) {
+            throw new IllegalStateException("Too many canonical guesses: " + symmetry.count);
+        }
+        return Arrays.copyOf(symmetry.results, (int) symmetry.count);
+    }
+
+    /**
+     * Number of relabelings in the symmetry left by the past guesses: permutations
+     * of the unused colors times permutations within each position class. No class
+     * holds more than this many codes, so {@code c^d} divided by it is a lower bound
+     * on {@link #countCanonicalGuesses}, found without enumerating anything.
+     *
+     * @param c           number of colors (<= 9)
+     * @param d           number of digits (<= 9)
+     * @param pastGuesses indices of the guesses made so far (0-based, base-c encoding)
+     * @return order of the symmetry group, 1 if no symmetry is left
+     */
+    public static long symmetryOrder(int c, int d, int[] pastGuesses) {
+        HistorySymmetry symmetry = new HistorySymmetry(c, d, pastGuesses, null, 0);
+        long            order    = factorial(unusedColors(c, d, pastGuesses).length);
+        for (int[] positions : symmetry.classes) order *= factorial(positions.length);
+        return order;
+    }
+
+    private static long factorial(int n) {
+        long f = 1;
+        for (int i = 2; i <= n; i++) f *= i;
+        return f;
+    }
+
+    /**
+     * Depth-first generator of the canonical guesses, one position class at a time
+     * and one color at a time within a class, choosing how many digits of the
+     * class take that color.
+     */
+    private static final class HistorySymmetry {
+        private final int     c;
+        private final int[][] classes;    // positions of each class, ascending
+        private final int[]   prevFree;   // previous unused color in label order, -1 if none or color is used
+        private final int[]   pow;        // pow[p] = c^p
+        private final int[][] counts;     // counts[k][color] = digits of class k with this color
+        private       int[]   results;    // null when only counting, grown as codes are found
+        private final long    limit;
+        private       long    count;
+
+        HistorySymmetry(int c, int d, int[] pastGuesses, int[] results, long limit) {
+            this.c = c;
+            this.results = results;
+            this.limit = limit;
+
+            this.pow = new int[d];
+            pow[0] = 1;
+            for (int p = 1; p < d; p++) pow[p] = pow[p - 1] * c;
+
+            // Unused colors, each linked to the previous unused one
+            int[] free = unusedColors(c, d, pastGuesses);
+            this.prevFree = new int[c];
+            Arrays.fill(prevFree, -1);
+            for (int i = 1; i < free.length; i++) prevFree[free[i]] = free[i - 1];
+
+            // Positions with the same digit in every past guess share a class
+            int[] classOf    = new int[d];
+            int[] classSizes = new int[d];
+            int   numClasses = 0;
+            for (int p = 0; p < d; p++) {
+                classOf[p] = -1;
+                for (int q = 0; q < p && classOf[p] < 0; q++) {
+                    if (sameDigits(pastGuesses, p, q)) classOf[p] = classOf[q];
+                }
+                if (classOf[p] < 0) classOf[p] = numClasses++;
+                classSizes[classOf[p]]++;
+            }
+            this.classes = new int[numClasses][];
+            for (int k = 0; k < numClasses; k++) classes[k] = new int[classSizes[k]];
+            int[] filled = new int[numClasses];
+            for (int p = 0; p < d; p++) classes[classOf[p]][filled[classOf[p]]++] = p;
+
+            this.counts = new int[numClasses][c];
+        }
+
+        private boolean sameDigits(int[] pastGuesses, int p, int q) {
+            for (int guess : pastGuesses) {
+                if (guess / pow[p] % c != guess / pow[q] % c) return false;
+            }
+            return true;
+        }
+
+        void generate() {
+            // Initially every unused color is tied with the previous one
+            long tied = 0;
+            for (int color = 0; color < c; color++) {
+                if (prevFree[color] >= 0) tied |= 1L << color;
+            }
+            generate(0, 0, classes[0].length, tied);
+        }
+
+        /**
+         * @param k         current position class
+         * @param color     current color within the class
+         * @param remaining digits of the class not yet assigned a color
+         * @param tied      bit f set if unused color f has had the same counts as the
+         *                  previous unused color in every class so far
+         */
+        private void generate(int k, int color, int remaining, long tied) {
+            if (count > limit) return;
+
+            // The profile of an unused color may not exceed the previous one's while they are tied
+            int[] classCounts = counts[k];
+            int   max         = remaining;
+            if ((tied >>> color & 1) != 0) max = Math.min(max, classCounts[prevFree[color]]);
+            int min = color == c - 1 ? remaining : 0;
+
+            for (int n = min; n <= max; n++) {
+                classCounts[color] = n;
+                if (color < c - 1) {
+                    generate(k, color + 1, remaining - n, tied);
+                    continue;
+                }
+
+                // Class complete: untie colors whose counts differ in this class
+                long nextTied = tied;
+                for (int f = 0; f < c; f++) {
+                    if ((tied >>> f & 1) != 0 && classCounts[f] != classCounts[prevFree[f]]) nextTied &= ~(1L << f);
+                }
+                if (k + 1 < classes.length) generate(k + 1, 0, classes[k + 1].length, nextTied);
+                else emit();
+            }
+            classCounts[color] = 0;
+        }
+
+        /** Record the code whose classes hold the current counts, digits ascending within each class. */
+        private void emit() {
+            if (results != null && count < limit) {
+                if (count == results.length) results = Arrays.copyOf(results, (int) Math.min(2 * count, limit));
+                int ind = 0;
+                for (int k = 0; k < classes.length; k++) {
+                    int i = 0;
+                    for (int color = 0; color < c; color++) {
+                        for (int n = 0; n < counts[k][color]; n++) ind += color * pow[classes[k][i++]];
+                    }
+                }
+                results[(int) count] = ind;
+            }
+            count++;
+        }
+    }
 }
@@ -0,0 +1,70 @@
+package org.mastermind.codes;
+
+/**
+ * Converts between code indices (see {@link ConvertCode}) and the packed
+ * encoding used by the branch-free feedback kernel.
+ * <p>
+ * Encoding: each digit (0..c-1) is stored in a 4-bit nibble of a long,
+ * position 0 (the least significant base-c digit of the index) in the
+ * lowest nibble. A packed code reads like the code int written in hex,
+ * minus one on every digit.
+ * <p>
+ * The color counts of a code use the same layout: the number of
+ * occurrences of color k is stored in nibble k. Since d <= 9, no count
+ * overflows its nibble, and counts of disjoint digit groups can be added.
+ * <p>
+ * Examples (c=6, d=4):
+ * index 0    → code 1111 → packed 0x0000, colors 0x000004
+ * index 1    → code 1112 → packed 0x0001, colors 0x000013
+ * index 1295 → code 6666 → packed 0x5555, colors 0x400000
+ */
+public final class PackedCode {
+
+    /**
+     * Convert a 0-based index to its packed digits.
+     *
+     * @param c     number of colors
+     * @param d     number of digits
+     * @param index the 0-based index
+     * @return digits of the code, 4 bits per position
+     */
+    public static long fromIndex(int c, int d, int index) {
+        long packed = 0;
+        for (int pos = 0; pos < d; pos++) {
+            packed |= (long) (index % c) << (4 * pos);
+            index /= c;
+        }
+        return packed;
+    }
+
+    /**
+     * Convert packed digits back to the 0-based index.
+     *
+     * @param c      number of colors
+     * @param d      number of digits
+     * @param packed digits of the code, 4 bits per position
+     * @return the 0-based index of this code
+     */
+    public static int toIndex(int c, int d, long packed) {
+        int index = 0;
+        for (int pos = d - 1; pos >= 0; pos--) {
+            index = index * c + (int) ((packed >>> (4 * pos)) & 0xF);
+        }
+        return index;
+    }
+
+    /**
+     * Count the occurrences of each color in a packed code.
+     *
+     * @param d      number of digits
+     * @param packed digits of the code, 4 bits per position
+     * @return number of occurrences of each color, 4 bits per color
+     */
+    public static long colorCounts(int d, long packed) {
+        long colors = 0;
+        for (int pos = 0; pos < d; pos++) {
+            colors += 1L << (4 * ((packed >>> (4 * pos)) & 0xF));
+        }
+        return colors;
+    }
+}
@@ -0,0 +1,173 @@
+package org.mastermind.compute;
+
+import org.mastermind.codes.PackedCode;
+
+/**
+ * Pre-decoded view of every code index of a (c, d) game, built once and
+ * shared by all callers of {@link #of(int, int)}.
+ *
+ * <p>{@link Feedback#getFeedback} re-derives every digit of both codes with
+ * {@code % c} and {@code / c} on each call. This table stores each code in the
+ * encoding of {@link PackedCode} (packed digits plus color counts), so that a
+ * feedback is computed from four longs by {@link Feedback#getFeedbackPacked},
+ * without any division or branch.
+ *
+ * <p>Materializing both longs for every one of the c^d codes would take
+ * 6 GB for 9×9, so the table is split in two levels: an index is
+ * {@code high * lowSize + low}, where {@code low} covers the least
+ * significant digits and {@code high} the rest. Each half fits in a few
+ * hundred KB, the packed digits of a code are the two halves concatenated
+ * and its color counts are the two halves added (no nibble can exceed 9).
+ * The split itself uses a precomputed reciprocal instead of a division.
+ */
+public final class CodeTable {
+    /** Suggested buffer length for {@link #getFeedbackRange} callers. */
+    public static final int RANGE_CHUNK = 4096;
+
+    /** Maximum number of entries in the low half (16 bytes each). */
+    private static final int           LOW_TABLE_LIMIT = 1 << 16;
+    private static final CodeTable[][] CACHE           = new CodeTable[10][10];
+
+    private final int    d;
+    private final int    lowSize;      // c^lowDigits
+    private final int    highShift;    // 4 * lowDigits, offset of the high digits in a packed code
+    private final long   reciprocal;   // ceil(2^divShift / lowSize)
+    private final int    divShift;     // 32 + ceil(log2(lowSize))
+    private final long[] low;          // [2 * i] = packed digits, [2 * i + 1] = color counts
+    private final long[] high;         // same layout for the high digits
+
+    private CodeTable(int c, int d) {
+        this.d = d;
+
+        // Give the low half as many digits as the size limit allows
+        int lowDigits = 0;
+        int lowSize   = 1;
+        while (lowDigits < d && (long) lowSize * c <= LOW_TABLE_LIMIT) {
+            lowSize *= c;
+            lowDigits++;
+        }
+        this.lowSize = lowSize;
+        this.highShift = 4 * lowDigits;
+        this.divShift = 32 + (32 - Integer.numberOfLeadingZeros(lowSize - 1));
+        this.reciprocal = ((1L << divShift) + lowSize - 1) / lowSize;
+
+        this.low = buildHalf(c, lowDigits, 0);
+        this.high = buildHalf(c, d - lowDigits, highShift);
+    }
+
+    /**
+     * Get the shared table for a game, building it on first use.
+     *
+     * @param c number of colors (<= 9)
+     * @param d number of digits (<= 9)
+     * @return the code table for (c, d)
+     */
+    public static CodeTable of(int c, int d) {
+        CodeTable table = CACHE[c][d];
+        if (table == null) {
+            synchronized (CACHE) {
+                table = CACHE[c][d];
+                if (table == null) {
+                    table = new CodeTable(c, d);
+                    CACHE[c][d] = table;
+                }
+            }
+        }
+        return table;
+    }
+
+    /** Decode every index of a {@code digits}-digit half into packed digits and color counts. */
+    private static long[] buildHalf(int c, int digits, int shift) {
+        int    size  = (int) Math.pow(c, digits);
+        long[] table = new long[2 * size];
+
+        for (int i = 0; i < size; i++) {
+            long packed = PackedCode.fromIndex(c, digits, i);
+            table[2 * i] = packed << shift;
+            table[2 * i + 1] = PackedCode.colorCounts(digits, packed);
+        }
+
+        return table;
+    }
+
+    /**
+     * @param ind code index (0-based, base-c encoding)
+     * @return digits of the code, 4 bits per position, position 0 in the lowest nibble
+     */
+    public long packed(int ind) {
+        int hi = (int) ((ind * reciprocal) >>> divShift);
+        int lo = ind - hi * lowSize;
+        return low[2 * lo] | high[2 * hi];
+    }
+
+    /**
+     * @param ind code index (0-based, base-c encoding)
+     * @return number of occurrences of each color, 4 bits per color, color 0 in the lowest nibble
+     */
+    public long colors(int ind) {
+        int hi = (int) ((ind * reciprocal) >>> divShift);
+        int lo = ind - hi * lowSize;
+        return low[2 * lo + 1] + high[2 * hi + 1];
+    }
+
+    /**
+     * Calculate the Mastermind feedback for a guess and a secret.
+     * Same result as {@link Feedback#getFeedback}, without integer division.
+     *
+     * @param guessInd  index of the guess code (0-based, base-c encoding)
+     * @param secretInd index of the secret code (0-based, base-c encoding)
+     * @return Feedback value (black * 10 + white)
+     */
+    public int getFeedback(int guessInd, int secretInd) {
+        return getFeedback(packed(guessInd), colors(guessInd), secretInd);
+    }
+
+    /**
+     * Calculate the feedback of a pre-decoded guess against a secret. Hot loops
+     * decode the guess once with {@link #packed} and {@link #colors} and then call
+     * this for every secret.
+     *
+     * @param guessPacked packed digits of the guess
+     * @param guessColors color counts of the guess
+     * @param secretInd   index of the secret code (0-based, base-c encoding)
+     * @return Feedback value (black * 10 + white)
+     */
+    public int getFeedback(long guessPacked, long guessColors, int secretInd) {
+        int hi = (int) ((secretInd * reciprocal) >>> divShift);
+        int lo = secretInd - hi * lowSize;
+        return Feedback.getFeedbackPacked(guessPacked, guessColors,
+                                          low[2 * lo] | high[2 * hi], low[2 * lo + 1] + high[2 * hi + 1], d);
+    }
+
+    /**
+     * Calculate the feedback of a pre-decoded guess against every secret in the
+     * contiguous range {@code [from, to)}. Sequential indices walk the low half of
+     * the table in order and only switch high entries once every {@code lowSize}
+     * indices, so the range needs no index split per secret.
+     *
+     * @param guessPacked packed digits of the guess
+     * @param guessColors color counts of the guess
+     * @param from        first secret index (inclusive)
+     * @param to          last secret index (exclusive)
+     * @param feedbacks   output buffer of length at least {@code to - from};
+     *                    {@code feedbacks[i - from]} receives the feedback of secret {@code i}
+     */
+    public void getFeedbackRange(long guessPacked, long guessColors, int from, int to, int[] feedbacks) {
+        int hi = (int) ((from * reciprocal) >>> divShift);
+        int lo = from - hi * lowSize;
+        int j  = 0;
+
+        while (j < to - from) {
+            // All secrets sharing the current high entry
+            long highPacked = high[2 * hi];
+            long highColors = high[2 * hi + 1];
+            int  end        = Math.min(to - from, j + lowSize - lo);
+            for (; j < end; j++, lo++) {
+                feedbacks[j] = Feedback.getFeedbackPacked(guessPacked, guessColors, low[2 * lo] | highPacked,
+                                                          low[2 * lo + 1] + highColors, d);
+            }
+            lo = 0;
+            hi++;
+        }
+    }
+}
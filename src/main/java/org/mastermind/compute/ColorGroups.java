@@ -0,0 +1,133 @@
+package org.mastermind.compute;
+
+import java.util.Arrays;
+import java.util.HashMap;
+import java.util.Map;
+
+/**
+ * A list of secrets grouped by color multiset, so that the color part of a
+ * feedback is computed once per group instead of once per secret.
+ *
+ * <p>Blacks + whites is the overlap of the color multisets of the guess and the
+ * secret, which does not depend on positions. Every secret of a group shares it,
+ * so scoring a guess is a two-stage test: the overlap of each group first, then
+ * only the blacks of each secret inside it. A group with no color in common with
+ * the guess needs no second stage at all: all of its secrets give no peg and are
+ * counted at once. Games with many digits (d = 7 to 9) have far fewer multisets
+ * than secrets, so most of the work moves from the secrets to the groups.
+ *
+ * <p>The secrets of a BestGuess search are the same for every candidate guess, so
+ * the grouping cost is paid once per search (see {@link SecretLanes} for the other
+ * pre-decoded form). Instances are immutable and can be shared between threads.
+ */
+public final class ColorGroups {
+    private final CodeTable table;
+    private final int       d;
+    private final int       size;
+    private final long[]    groupColors;  // [g] = color counts shared by the secrets of group g
+    private final int[]     groupStart;   // [g] = first secret of group g, [groups] = size
+    private final long[]    packed;       // packed digits of the secrets, group by group
+
+    /**
+     * Group a list of secrets by color multiset.
+     *
+     * @param secretsInd list of secret indices (0-based, base-c encoding)
+     * @param c          number of colors (<= 9)
+     * @param d          number of digits (<= 9)
+     */
+    public ColorGroups(int[] secretsInd, int c, int d) {
+        this.table = CodeTable.of(c, d);
+        this.d = d;
+        this.size = secretsInd.length;
+
+        // Number the multisets in order of first appearance, counting their secrets
+        Map<Long, Integer> groupOf = new HashMap<>();
+        int[]              group   = new int[size];
+        int[]              counts  = new int[Math.min(size, 16)];
+        for (int j = 0; j < size; j++) {
+            int id = groupOf.computeIfAbsent(table.colors(secretsInd[j]), colors -> groupOf.size());
+            if (id == counts.length) counts = Arrays.copyOf(counts, id * 2);
+            counts[id]++;
+            group[j] = id;
+        }
+
+        int groups = groupOf.size();
+        this.groupColors = new long[groups];
+        this.groupStart = new int[groups + 1];
+        for (Map.Entry<Long, Integer> entry : groupOf.entrySet()) groupColors[entry.getValue()] = entry.getKey();
+        for (int g = 0; g < groups; g++) groupStart[g + 1] = groupStart[g] + counts[g];
+
+        // Place the secrets, in their original order within each group
+        this.packed = new long[size];
+        int[] next = Arrays.copyOf(groupStart, groups);
+        for (int j = 0; j < size; j++) packed[next[group[j]]++] = table.packed(secretsInd[j]);
+    }
+
+    /**
+     * Count the color multisets of a game, the most groups any list of its secrets can have.
+     *
+     * @param c number of colors (<= 9)
+     * @param d number of digits (<= 9)
+     * @return number of multisets of d digits over c colors, (c + d - 1) choose d
+     */
+    public static long countMultisets(int c, int d) {
+        long count = 1;
+        for (int i = 1; i <= d; i++) count = count * (c - 1 + i) / i;
+        return count;
+    }
+
+    /** @return number of secrets */
+    public int size() { return size; }
+
+    /** @return number of distinct color multisets among the secrets */
+    public int groups() { return groupColors.length; }
+
+    /**
+     * Add the feedback of a guess against every secret to a frequency table.
+     *
+     * @param guessInd     index of the guess code (0-based, base-c encoding)
+     * @param feedbackFreq int array of length 100, incremented at each feedback value
+     */
+    public void countFeedback(int guessInd, int[] feedbackFreq) {
+        countFeedback(guessInd, feedbackFreq, Long.MAX_VALUE);
+    }
+
+    /**
+     * Add the feedback of a guess against the secrets to a frequency table,
+     * stopping after the first group where the rank can no longer stay within
+     * {@code bound}. The rank is tracked as in
+     * {@link SecretLanes#countFeedback(int, int[], long)}.
+     *
+     * @param guessInd     index of the guess code (0-based, base-c encoding)
+     * @param feedbackFreq int array of length 100, incremented at each feedback value
+     * @param bound        stop once the rank is known to exceed this value
+     * @return the rank if it is at most {@code bound}, otherwise a lower bound of it greater than {@code bound}
+     */
+    public long countFeedback(int guessInd, int[] feedbackFreq, long bound) {
+        long guessPacked = table.packed(guessInd);
+        long guessColors = table.colors(guessInd);
+        long rank        = size;
+
+        for (int g = 0; g < groupColors.length && rank <= bound; g++) {
+            // Stage one: blacks + whites of the whole group
+            int overlap = Feedback.getColorOverlap(guessColors, groupColors[g]);
+            int from    = groupStart[g];
+            int to      = groupStart[g + 1];
+
+            // No color in common: no black either, so the whole group gives feedback 0
+            if (overlap == 0) {
+                long n = to - from;
+                rank += n * (2L * feedbackFreq[0] + n - 1);
+                feedbackFreq[0] += (int) n;
+                continue;
+            }
+
+            // Stage two: the blacks of each secret (black * 10 + white = black * 9 + overlap)
+            for (int j = from; j < to; j++) {
+                rank += 2L * feedbackFreq[Feedback.getBlacks(guessPacked, packed[j], d) * 9 + overlap]++;
+            }
+        }
+
+        return rank;
+    }
+}
@@ -0,0 +1,94 @@
+package org.mastermind.compute;
+
+import java.util.BitSet;
+
+/**
+ * Enumeration of the codes that give a guess a given feedback, without testing
+ * every code.
+ *
+ * <p>The codes are built one position at a time, from the most significant
+ * digit down, so they come out in increasing index order. Along the way the
+ * blacks and the color overlap (blacks + whites) of the partial code with the
+ * guess are tracked, and a branch is cut as soon as the remaining positions can
+ * no longer reach the feedback: too many blacks or too much overlap already,
+ * or not enough positions left (or guess colors left unmatched) to reach them.
+ * The work is therefore proportional to the number of consistent codes rather
+ * than to c^d, which is what the first filter of a large game needs
+ * (see {@link SolutionSpace#filterSolution}).
+ */
+public final class ConsistentCodes {
+
+    /**
+     * Set the bit of every code whose feedback with the guess is {@code feedback}.
+     *
+     * @param guessInd index of the guess code (0-based, base-c encoding)
+     * @param feedback feedback value (black * 10 + white)
+     * @param c        number of colors (<= 9)
+     * @param d        number of digits (<= 9)
+     * @param out      BitSet receiving the code indices (other bits are left as they are)
+     * @return number of codes found
+     */
+    public static int enumerate(int guessInd, int feedback, int c, int d, BitSet out) {
+        Generator generator = new Generator(guessInd, feedback / 10, feedback / 10 + feedback % 10, c, d, out);
+        if (generator.overlap <= d) generator.visit(d - 1, 0, 0, 0, d);
+        return generator.count;
+    }
+
+    /** Depth-first walk over the digits, most significant position first. */
+    private static final class Generator {
+        private final int    c;
+        private final int    black;        // blacks of the feedback
+        private final int    overlap;      // blacks + whites of the feedback
+        private final int[]  guessDigits;  // [p] = digit of the guess at position p
+        private final int[]  guessCounts;  // [k] = occurrences of color k in the guess
+        private final int[]  codeCounts;   // [k] = occurrences of color k in the partial code
+        private final int[]  weight;       // [p] = c^p
+        private final BitSet out;
+        private       int    count;
+
+        Generator(int guessInd, int black, int overlap, int c, int d, BitSet out) {
+            this.c = c;
+            this.black = black;
+            this.overlap = overlap;
+            this.guessDigits = new int[d];
+            this.guessCounts = new int[c];
+            this.codeCounts = new int[c];
+            this.weight = new int[d];
+            this.out = out;
+
+            int tmp = guessInd;
+            for (int p = 0; p < d; p++) {
+                guessDigits[p] = tmp % c;
+                tmp /= c;
+                guessCounts[guessDigits[p]]++;
+                weight[p] = p == 0 ? 1 : weight[p - 1] * c;
+            }
+        }
+
+        /**
+         * @param pos       position to fill next; the code is complete below 0
+         * @param index     index of the digits filled so far
+         * @param blacks    blacks of the digits filled so far
+         * @param common    color overlap of the digits filled so far
+         * @param unmatched guess colors not yet matched by the code, i.e. how much the overlap can still grow
+         */
+        void visit(int pos, int index, int blacks, int common, int unmatched) {
+            int left = pos + 1;  // each position adds at most one black and one to the overlap
+            if (blacks > black || blacks + left < black) return;
+            if (common > overlap || common + Math.min(left, unmatched) < overlap) return;
+            if (pos < 0) {
+                out.set(index);
+                count++;
+                return;
+            }
+
+            for (int k = 0; k < c; k++) {
+                int matched = codeCounts[k] < guessCounts[k] ? 1 : 0;
+                codeCounts[k]++;
+                visit(pos - 1, index + k * weight[pos], guessDigits[pos] == k ? blacks + 1 : blacks,
+                      common + matched, unmatched - matched);
+                codeCounts[k]--;
+            }
+        }
+    }
+}
@@ -39,14 +39,226 @@ public final class ExpectedSize {
      */
     public long calcExpectedRank(int guessInd, int[] secretsInd, int c, int d, int[] feedbackFreq) {
 
-        // Calculate feedback for each secret
-        int[] colorFreqCounter = new int[c];
+        // Decode the guess once, then calculate feedback for each secret
+        CodeTable table       = CodeTable.of(c, d);
+        long      guessPacked = table.packed(guessInd);
+        long      guessColors = table.colors(guessInd);
         for (int secretInd : secretsInd) {
-            int feedback = Feedback.getFeedback(guessInd, secretInd, c, d, colorFreqCounter);
-            feedbackFreq[feedback]++;
+            feedbackFreq[table.getFeedback(guessPacked, guessColors, secretInd)]++;
         }
 
-        // Find the sum of square
+        return sumSquares(feedbackFreq);
+    }
+
+    /**
+     * Variant of {@link #calcExpectedRank(int, int[], int, int, int[])} that reads
+     * feedbacks from a precomputed {@link FeedbackMatrix} instead of computing them.
+     *
+     * @param guessInd     index of the guess code (0-based, base-c encoding)
+     * @param secretsInd   list of secret indices (0-based, base-c encoding)
+     * @param matrix       feedback matrix of the game
+     * @param feedbackFreq int array of 0 with length 100
+     * @return Sum of number of remaining solution for each secret
+     */
+    public long calcExpectedRank(int guessInd, int[] secretsInd, FeedbackMatrix matrix, int[] feedbackFreq) {
+        for (int secretInd : secretsInd) {
+            feedbackFreq[matrix.getFeedback(guessInd, secretInd)]++;
+        }
+
+        return sumSquares(feedbackFreq);
+    }
+
+    /**
+     * Variant of {@link #calcExpectedRank(int, int[], int, int, int[])} that scores the
+     * guess against secrets pre-decoded into {@link SecretLanes}, many secrets per
+     * instruction.
+     *
+     * @param guessInd     index of the guess code (0-based, base-c encoding)
+     * @param lanes        secrets decoded into lanes
+     * @param feedbackFreq int array of 0 with length 100
+     * @return Sum of number of remaining solution for each secret
+     */
+    public long calcExpectedRank(int guessInd, SecretLanes lanes, int[] feedbackFreq) {
+        lanes.countFeedback(guessInd, feedbackFreq);
+        return sumSquares(feedbackFreq);
+    }
+
+    /**
+     * Variant of {@link #calcExpectedRank(int, int[], int, int, int[])} that scores the
+     * guess against secrets grouped by color multiset in {@link ColorGroups}, computing
+     * blacks + whites once per group.
+     *
+     * @param guessInd     index of the guess code (0-based, base-c encoding)
+     * @param groups       secrets grouped by color multiset
+     * @param feedbackFreq int array of 0 with length 100
+     * @return Sum of number of remaining solution for each secret
+     */
+    public long calcExpectedRank(int guessInd, ColorGroups groups, int[] feedbackFreq) {
+        groups.countFeedback(guessInd, feedbackFreq);
+        return sumSquares(feedbackFreq);
+    }
+
+    /**
+     * Variant of {@link #calcExpectedRank(int, int[], int, int, int[])} for weighted
+     * secrets, where each entry stands for {@code weights[i]} secrets sharing its
+     * feedback (see {@link SolutionSpace#getWeightedSecrets}).
+     *
+     * @param guessInd     index of the guess code (0-based, base-c encoding)
+     * @param secretsInd   list of representative secret indices (0-based, base-c encoding)
+     * @param weights      number of secrets represented by each entry of {@code secretsInd}
+     * @param c            number of colors (<= 9)
+     * @param d            number of digits (<= 9)
+     * @param feedbackFreq int array of 0 with length 100
+     * @return Sum of number of remaining solution for each secret
+     */
+    public long calcExpectedRank(int guessInd, int[] secretsInd, int[] weights, int c, int d, int[] feedbackFreq) {
+        CodeTable table       = CodeTable.of(c, d);
+        long      guessPacked = table.packed(guessInd);
+        long      guessColors = table.colors(guessInd);
+        for (int i = 0; i < secretsInd.length; i++) {
+            feedbackFreq[table.getFeedback(guessPacked, guessColors, secretsInd[i])] += weights[i];
+        }
+
+        return sumSquares(feedbackFreq);
+    }
+
+    /**
+     * Variant of {@link #calcExpectedRank(int, int[], int, int, int[])} that gives up
+     * on the guess once its rank is known to exceed {@code bound}. Used by searches
+     * that only need to know whether a guess beats the best one found so far.
+     *
+     * <p>The rank is tracked as the number of secrets plus {@code 2 * freq} for every
+     * secret added to a bucket already holding {@code freq} secrets (since
+     * {@code (f + 1)^2 - f^2 = 2f + 1}). Every secret not yet counted adds at least 1,
+     * so the running value is a lower bound of the rank at every step and equals
+     * it once all secrets are counted.
+     *
+     * @param guessInd     index of the guess code (0-based, base-c encoding)
+     * @param secretsInd   list of secret indices (0-based, base-c encoding)
+     * @param c            number of colors (<= 9)
+     * @param d            number of digits (<= 9)
+     * @param bound        give up once the rank is known to exceed this value
+     * @param feedbackFreq int array of 0 with length 100
+     * @return the rank if it is at most {@code bound}, otherwise a lower bound of it greater than {@code bound}
+     */
+    public long calcExpectedRankBounded(int guessInd, int[] secretsInd, int c, int d, long bound,
+                                        int[] feedbackFreq) {
+        CodeTable table       = CodeTable.of(c, d);
+        long      guessPacked = table.packed(guessInd);
+        long      guessColors = table.colors(guessInd);
+        long      rank        = secretsInd.length;
+
+        for (int secretInd : secretsInd) {
+            rank += 2L * feedbackFreq[table.getFeedback(guessPacked, guessColors, secretInd)]++;
+            if (rank > bound) break;
+        }
+
+        clear(feedbackFreq);
+        return rank;
+    }
+
+    /**
+     * Variant of {@link #calcExpectedRankBounded(int, int[], int, int, long, int[])} for
+     * weighted secrets. Adding {@code w} secrets to a bucket of {@code f} raises the
+     * sum of squares by {@code 2fw + w^2}, tracked as {@code w} (counted upfront in the
+     * total weight) plus {@code 2fw + w^2 - w >= 0}.
+     *
+     * @param guessInd     index of the guess code (0-based, base-c encoding)
+     * @param secretsInd   list of representative secret indices (0-based, base-c encoding)
+     * @param weights      number of secrets represented by each entry of {@code secretsInd}
+     * @param totalWeight  sum of {@code weights}
+     * @param c            number of colors (<= 9)
+     * @param d            number of digits (<= 9)
+     * @param bound        give up once the rank is known to exceed this value
+     * @param feedbackFreq int array of 0 with length 100
+     * @return the rank if it is at most {@code bound}, otherwise a lower bound of it greater than {@code bound}
+     */
+    public long calcExpectedRankBounded(int guessInd, int[] secretsInd, int[] weights, long totalWeight, int c,
+                                        int d, long bound, int[] feedbackFreq) {
+        CodeTable table       = CodeTable.of(c, d);
+        long      guessPacked = table.packed(guessInd);
+        long      guessColors = table.colors(guessInd);
+        long      rank        = totalWeight;
+
+        for (int i = 0; i < secretsInd.length; i++) {
+            int  feedback = table.getFeedback(guessPacked, guessColors, secretsInd[i]);
+            long w        = weights[i];
+            rank += (2L * feedbackFreq[feedback] + w - 1) * w;
+            feedbackFreq[feedback] += (int) w;
+            if (rank > bound) break;
+        }
+
+        clear(feedbackFreq);
+        return rank;
+    }
+
+    /**
+     * Variant of {@link #calcExpectedRankBounded(int, int[], int, int, long, int[])} that
+     * reads feedbacks from a precomputed {@link FeedbackMatrix}.
+     *
+     * @param guessInd     index of the guess code (0-based, base-c encoding)
+     * @param secretsInd   list of secret indices (0-based, base-c encoding)
+     * @param matrix       feedback matrix of the game
+     * @param bound        give up once the rank is known to exceed this value
+     * @param feedbackFreq int array of 0 with length 100
+     * @return the rank if it is at most {@code bound}, otherwise a lower bound of it greater than {@code bound}
+     */
+    public long calcExpectedRankBounded(int guessInd, int[] secretsInd, FeedbackMatrix matrix, long bound,
+                                        int[] feedbackFreq) {
+        long rank = secretsInd.length;
+
+        for (int secretInd : secretsInd) {
+            rank += 2L * feedbackFreq[matrix.getFeedback(guessInd, secretInd)]++;
+            if (rank > bound) break;
+        }
+
+        clear(feedbackFreq);
+        return rank;
+    }
+
+    /**
+     * Variant of {@link #calcExpectedRankBounded(int, int[], int, int, long, int[])} that
+     * scores the guess against secrets pre-decoded into {@link SecretLanes}. The bound
+     * is checked once per block of secrets.
+     *
+     * @param guessInd     index of the guess code (0-based, base-c encoding)
+     * @param lanes        secrets decoded into lanes
+     * @param bound        give up once the rank is known to exceed this value
+     * @param feedbackFreq int array of 0 with length 100
+     * @return the rank if it is at most {@code bound}, otherwise a lower bound of it greater than {@code bound}
+     */
+    public long calcExpectedRankBounded(int guessInd, SecretLanes lanes, long bound, int[] feedbackFreq) {
+        long rank = lanes.countFeedback(guessInd, feedbackFreq, bound);
+        clear(feedbackFreq);
+        return rank;
+    }
+
+    /**
+     * Variant of {@link #calcExpectedRankBounded(int, int[], int, int, long, int[])} that
+     * scores the guess against secrets grouped in {@link ColorGroups}. The bound is
+     * checked once per group.
+     *
+     * @param guessInd     index of the guess code (0-based, base-c encoding)
+     * @param groups       secrets grouped by color multiset
+     * @param bound        give up once the rank is known to exceed this value
+     * @param feedbackFreq int array of 0 with length 100
+     * @return the rank if it is at most {@code bound}, otherwise a lower bound of it greater than {@code bound}
+     */
+    public long calcExpectedRankBounded(int guessInd, ColorGroups groups, long bound, int[] feedbackFreq) {
+        long rank = groups.countFeedback(guessInd, feedbackFreq, bound);
+        clear(feedbackFreq);
+        return rank;
+    }
+
+    /** Reset {@code feedbackFreq} for reuse. */
+    private void clear(int[] feedbackFreq) {
+        for (int feedback : validFeedback) {
+            feedbackFreq[feedback] = 0;
+        }
+    }
+
+    /** Sum the squared feedback frequencies and reset {@code feedbackFreq} for reuse. */
+    private long sumSquares(int[] feedbackFreq) {
         long sum = 0;
         long freq;
         for (int feedback : validFeedback) {
@@ -96,9 +308,10 @@ public final class ExpectedSize {
     }
 
     /**
-     * Incremental variant of {@link #calcExpectedRank} for the full secret space (0..c^d-1).
+     * Variant of {@link #calcExpectedRank} for the full secret space (0..c^d-1).
      * Instead of an arbitrary secrets array, iterates all indices sequentially and uses
-     * {@link FeedbackIncremental} to avoid recomputing digit decompositions from scratch.
+     * {@link CodeTable#getFeedbackRange} to compute feedbacks a chunk at a time
+     * without decoding any index.
      *
      * @param guessInd     index of the guess code (0-based, base-c encoding)
      * @param c            number of colors (<= 9)
@@ -108,36 +321,21 @@ public final class ExpectedSize {
      * @return Sum of squared feedback frequencies (same semantics as {@link #calcExpectedRank})
      */
     public long calcExpectedRankFirst(int guessInd, int c, int d, int total, int[] feedbackFreq) {
-        // Set up incremental feedback state
-        FeedbackIncremental.State init             = FeedbackIncremental.setupIncremental(guessInd, 0, c, d);
-        int[]                     guessDigits      = init.guessDigits();
-        int[]                     secretDigits     = init.secretDigits();
-        int[]                     colorFreqCounter = init.colorFreqCounter();
-        int                       black            = init.black();
-        int                       colorFreqTotal   = init.colorFreqTotal();
-
-        // Handle secret index 0 (setup already computed its feedback)
-        feedbackFreq[black * 9 + d - (colorFreqTotal >>> 1)]++;
-
-        // Iterate remaining secrets incrementally, updating secretDigits and feedback state in place
-        int[] result = new int[3];
-        for (int secretInd = 1; secretInd < total; secretInd++) {
-            FeedbackIncremental.getFeedbackIncremental(guessDigits, secretDigits, black, colorFreqCounter,
-                                                       colorFreqTotal, c, d, result);
-            black = result[1];
-            colorFreqTotal = result[2];
-            feedbackFreq[result[0]]++;
-        }
+        CodeTable table       = CodeTable.of(c, d);
+        long      guessPacked = table.packed(guessInd);
+        long      guessColors = table.colors(guessInd);
+        int[]     feedbacks   = new int[CodeTable.RANGE_CHUNK];
 
-        // Sum squared frequencies and reset feedbackFreq for reuse
-        long sum = 0;
-        long freq;
-        for (int feedback : validFeedback) {
-            freq = feedbackFreq[feedback];
-            sum += freq * freq;
-            feedbackFreq[feedback] = 0;
+        // Iterate all secrets in chunks of consecutive indices
+        for (int from = 0; from < total; from += CodeTable.RANGE_CHUNK) {
+            int to = Math.min(total, from + CodeTable.RANGE_CHUNK);
+            table.getFeedbackRange(guessPacked, guessColors, from, to, feedbacks);
+            for (int j = 0; j < to - from; j++) {
+                feedbackFreq[feedbacks[j]]++;
+            }
         }
 
-        return sum;
+        // Sum squared frequencies and reset feedbackFreq for reuse
+        return sumSquares(feedbackFreq);
     }
 }
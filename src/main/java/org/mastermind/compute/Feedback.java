@@ -1,5 +1,7 @@
 package org.mastermind.compute;
 
+import java.util.BitSet;
+
 /**
  * Feedback is a crucial part of Mastermind. After each guess being
  * made, a feedback is provided to give clues as to how close the
@@ -12,6 +14,10 @@ package org.mastermind.compute;
  * represent the black counts, and the second represents the white.
  */
 public final class Feedback {
+    private static final long NIBBLE_LOW_BITS = 0x1_1111_1111L; // lowest bit of nibbles 0..8
+    private static final long EVEN_NIBBLES    = 0x0F_0F0F_0F0FL; // nibbles 0, 2, 4, 6, 8
+    private static final long BYTE_GUARDS     = 0x10_1010_1010L; // bit 4 of bytes 0..4
+    private static final long BYTE_ONES       = 0x01_0101_0101L; // bit 0 of bytes 0..4
 
     /**
      * Calculate the Mastermind feedback for a guess and a secret.
@@ -68,6 +74,152 @@ public final class Feedback {
         return black * 9 + d - (colorFreqTotal >>> 1);
     }
 
+    /**
+     * Branch-free feedback for codes in the packed encoding of
+     * {@link org.mastermind.codes.PackedCode}.
+     *
+     * <p>Blacks are the zero nibbles of {@code guessPacked ^ secretPacked}: folding
+     * each nibble onto its lowest bit and counting the set bits gives the number
+     * of mismatched positions. Blacks plus whites is the overlap of the two color
+     * multisets, {@code sum(min(guessCount, secretCount))}, computed on all colors
+     * at once by spreading the count nibbles into bytes, where a guarded
+     * subtraction tells which operand is smaller.
+     *
+     * @param guessPacked  digits of the guess, 4 bits per position
+     * @param guessColors  color counts of the guess, 4 bits per color
+     * @param secretPacked digits of the secret, 4 bits per position
+     * @param secretColors color counts of the secret, 4 bits per color
+     * @param d            number of digits (<= 9)
+     * @return Feedback value (black * 10 + white)
+     */
+    public static int getFeedbackPacked(long guessPacked, long guessColors, long secretPacked, long secretColors,
+                                        int d) {
+        // black * 10 + white = black * 10 + (total - black)
+        return getBlacks(guessPacked, secretPacked, d) * 9 + getColorOverlap(guessColors, secretColors);
+    }
+
+    /**
+     * Number of blacks (right color in the right position) of two codes in the
+     * packed encoding, the positional half of {@link #getFeedbackPacked}.
+     *
+     * @param guessPacked  digits of the guess, 4 bits per position
+     * @param secretPacked digits of the secret, 4 bits per position
+     * @param d            number of digits (<= 9)
+     * @return number of positions holding the same digit
+     */
+    public static int getBlacks(long guessPacked, long secretPacked, int d) {
+        // Fold every nibble of the difference onto its lowest bit
+        long diff = guessPacked ^ secretPacked;
+        diff |= diff >>> 1;
+        diff |= diff >>> 2;
+        return d - Long.bitCount(diff & NIBBLE_LOW_BITS);
+    }
+
+    /**
+     * Number of blacks plus whites of two codes given their color counts, the half
+     * of {@link #getFeedbackPacked} that does not depend on positions.
+     *
+     * @param guessColors  color counts of the guess, 4 bits per color
+     * @param secretColors color counts of the secret, 4 bits per color
+     * @return overlap of the two color multisets, {@code sum(min(guessCount, secretCount))}
+     */
+    public static int getColorOverlap(long guessColors, long secretColors) {
+        // Even colors and odd colors, one count per byte
+        long common = minBytes(guessColors & EVEN_NIBBLES, secretColors & EVEN_NIBBLES)
+                + minBytes((guessColors >>> 4) & EVEN_NIBBLES, (secretColors >>> 4) & EVEN_NIBBLES);
+
+        // Sum the bytes into the top byte of the product (no byte can exceed d)
+        return (int) ((common * BYTE_ONES) >>> 32) & 0xFF;
+    }
+
+    /** Bytewise min of two longs whose five low bytes each hold a value in 0..9. */
+    private static long minBytes(long a, long b) {
+        // Bit 4 of each byte of (a | 16) - b stays set iff a >= b; no byte borrows from its neighbor
+        long aAtLeastB = (((a | BYTE_GUARDS) - b) & BYTE_GUARDS) >>> 4;
+        long mask      = aAtLeastB * 0xF;
+        return (b & mask) | (a & ~mask);
+    }
+
+    /**
+     * Calculate the feedback of one guess against a list of secrets in a single
+     * call. Nothing is allocated per call: the guess is decoded once through the
+     * shared {@link CodeTable} and results go into the caller's buffer, so the
+     * buffer can be reused across guesses (and filled in one JPype crossing from
+     * Python).
+     *
+     * @param guessInd   index of the guess code (0-based, base-c encoding)
+     * @param secretsInd list of secret indices (0-based, base-c encoding)
+     * @param c          number of colors (<= 9)
+     * @param d          number of digits (<= 9)
+     * @param feedbacks  output buffer of length at least {@code secretsInd.length};
+     *                   {@code feedbacks[i]} receives the feedback of {@code secretsInd[i]}
+     */
+    public static void getFeedbackBatch(int guessInd, int[] secretsInd, int c, int d, byte[] feedbacks) {
+        CodeTable table       = CodeTable.of(c, d);
+        long      guessPacked = table.packed(guessInd);
+        long      guessColors = table.colors(guessInd);
+
+        for (int i = 0; i < secretsInd.length; i++) {
+            feedbacks[i] = (byte) table.getFeedback(guessPacked, guessColors, secretsInd[i]);
+        }
+    }
+
+    /**
+     * Same as {@link #getFeedbackBatch(int, int[], int, int, byte[])}, writing into an int buffer.
+     */
+    public static void getFeedbackBatch(int guessInd, int[] secretsInd, int c, int d, int[] feedbacks) {
+        CodeTable table       = CodeTable.of(c, d);
+        long      guessPacked = table.packed(guessInd);
+        long      guessColors = table.colors(guessInd);
+
+        for (int i = 0; i < secretsInd.length; i++) {
+            feedbacks[i] = table.getFeedback(guessPacked, guessColors, secretsInd[i]);
+        }
+    }
+
+    /**
+     * Calculate the feedback of one guess against every secret whose bit is set
+     * in {@code [from, to)} of a BitSet (such as {@link SolutionSpace#getRemaining()}).
+     * Results are written in increasing secret order.
+     *
+     * @param guessInd  index of the guess code (0-based, base-c encoding)
+     * @param secrets   set of secret indices
+     * @param from      first secret index (inclusive)
+     * @param to        last secret index (exclusive)
+     * @param c         number of colors (<= 9)
+     * @param d         number of digits (<= 9)
+     * @param feedbacks output buffer, large enough for every set bit in the range
+     * @return number of feedbacks written
+     */
+    public static int getFeedbackBatch(int guessInd, BitSet secrets, int from, int to, int c, int d,
+                                       byte[] feedbacks) {
+        CodeTable table       = CodeTable.of(c, d);
+        long      guessPacked = table.packed(guessInd);
+        long      guessColors = table.colors(guessInd);
+        int       n           = 0;
+
+        for (int i = secrets.nextSetBit(from); i >= 0 && i < to; i = secrets.nextSetBit(i + 1)) {
+            feedbacks[n++] = (byte) table.getFeedback(guessPacked, guessColors, i);
+        }
+        return n;
+    }
+
+    /**
+     * Same as {@link #getFeedbackBatch(int, BitSet, int, int, int, int, byte[])}, writing into an int buffer.
+     */
+    public static int getFeedbackBatch(int guessInd, BitSet secrets, int from, int to, int c, int d,
+                                       int[] feedbacks) {
+        CodeTable table       = CodeTable.of(c, d);
+        long      guessPacked = table.packed(guessInd);
+        long      guessColors = table.colors(guessInd);
+        int       n           = 0;
+
+        for (int i = secrets.nextSetBit(from); i >= 0 && i < to; i = secrets.nextSetBit(i + 1)) {
+            feedbacks[n++] = table.getFeedback(guessPacked, guessColors, i);
+        }
+        return n;
+    }
+
     /**
      * @param d number of digits in the Mastermind game
      * @return Number of possible feedback values in the game
@@ -4,6 +4,10 @@ package org.mastermind.compute;
  * Incremental feedback computation for sequential secret iteration.
  * Extracted from {@link Feedback} to keep that class focused on the
  * stateless per-call computation.
+ *
+ * <p>The solver's sequential scans now use {@link CodeTable#getFeedbackRange},
+ * which needs no per-digit branches; this digit-array variant remains for
+ * callers that already hold decoded digits.
  */
 public final class FeedbackIncremental {
 
@@ -0,0 +1,94 @@
+package org.mastermind.compute;
+
+import java.util.LinkedHashMap;
+import java.util.Map;
+import java.util.stream.IntStream;
+
+/**
+ * Precomputed feedback for every (guess, secret) pair of a small game.
+ *
+ * <p>When c^d is small (6×4 = 1296, 8×4 = 4096), the whole c^d × c^d table
+ * fits in a few MB, and every game of that size asks for the same feedbacks.
+ * Building the table once turns {@link ExpectedSize#calcExpectedRank} and
+ * {@link SolutionSpace#filterSolution} into plain byte lookups.
+ *
+ * <p>Matrices are built in parallel on the {@link SolverPool} on first use
+ * and kept in a small LRU cache keyed by (c, d). Games above
+ * {@link #MAX_CODES} codes get no matrix and callers fall back to
+ * {@link CodeTable}.
+ */
+public final class FeedbackMatrix {
+    /** Largest c^d for which a matrix is built (4096² bytes = 16 MB). */
+    static final int MAX_CODES = 4096;
+
+    /** Number of matrices kept in memory at once. */
+    private static final int CACHE_SIZE = 4;
+
+    private static final Map<Integer, FeedbackMatrix> CACHE = new LinkedHashMap<>(CACHE_SIZE, 0.75f, true) {
+        @Override
+        protected boolean removeEldestEntry(Map.Entry<Integer, FeedbackMatrix> eldest) {
+            return size() > CACHE_SIZE;
+        }
+    };
+
+    private static volatile boolean enabled = true;
+
+    private final int    total;     // c^d
+    private final byte[] feedback;  // [guessInd * total + secretInd] = black * 10 + white
+
+    private FeedbackMatrix(int c, int d, int total) {
+        this.total = total;
+        this.feedback = new byte[total * total];
+
+        // A parallel stream started from a pool task runs on that pool
+        CodeTable table = CodeTable.of(c, d);
+        SolverPool.get().submit(() -> IntStream.range(0, total).parallel().forEach(guessInd -> {
+            long guessPacked = table.packed(guessInd);
+            long guessColors = table.colors(guessInd);
+            int  row         = guessInd * total;
+            for (int secretInd = 0; secretInd < total; secretInd++) {
+                feedback[row + secretInd] = (byte) table.getFeedback(guessPacked, guessColors, secretInd);
+            }
+        })).join();
+    }
+
+    /**
+     * Get the shared matrix for a game, building it on first use.
+     *
+     * @param c number of colors (<= 9)
+     * @param d number of digits (<= 9)
+     * @return the feedback matrix, or {@code null} if the game is too large or matrices are disabled
+     */
+    public static FeedbackMatrix of(int c, int d) {
+        int total = (int) Math.pow(c, d);
+        if (!enabled || total > MAX_CODES) return null;
+
+        synchronized (CACHE) {
+            return CACHE.computeIfAbsent(c * 10 + d, key -> new FeedbackMatrix(c, d, total));
+        }
+    }
+
+    /**
+     * Enable or disable the use of feedback matrices (enabled by default).
+     * Disabling also drops the cached matrices.
+     *
+     * @param enable {@code true} to let {@link #of} build and return matrices
+     */
+    public static void setEnabled(boolean enable) {
+        enabled = enable;
+        if (!enable) {
+            synchronized (CACHE) {
+                CACHE.clear();
+            }
+        }
+    }
+
+    /**
+     * @param guessInd  index of the guess code (0-based, base-c encoding)
+     * @param secretInd index of the secret code (0-based, base-c encoding)
+     * @return Feedback value (black * 10 + white)
+     */
+    public int getFeedback(int guessInd, int secretInd) {
+        return feedback[guessInd * total + secretInd];
+    }
+}
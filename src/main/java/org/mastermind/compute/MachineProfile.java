@@ -0,0 +1,204 @@
+package org.mastermind.compute;
+
+import java.io.IOException;
+import java.io.InputStream;
+import java.io.OutputStream;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.util.Properties;
+import java.util.stream.IntStream;
+
+/**
+ * Measured feedback throughput of this machine, and the thresholds derived from it.
+ *
+ * <p>The solver sizes its work by how fast the machine computes feedbacks: the
+ * guess search is sized to a target latency, and work is only split over the
+ * {@link SolverPool} when it is large enough to pay for it. Instead of constants
+ * tuned on one machine, {@link #current()} runs a short microbenchmark (about a
+ * third of a second) on first use and stores the result in a profile file, which
+ * later runs read back. Sessions call it when they are created, so the benchmark
+ * runs before the first search rather than inside it. The profile is measured again when the pool's parallelism
+ * no longer matches it (see {@link SolverPool#setParallelism(int)}), or on request
+ * with {@link #recalibrate()}.
+ *
+ * <p>The profile file is {@code ~/.mastermind/profile.properties} unless the
+ * {@code mastermind.profile} system property gives another path. Setting that
+ * property to {@code reference} skips the benchmark and uses {@link #REFERENCE},
+ * the values the thresholds had before calibration existed; the Maven and pytest
+ * test runs set it, so tests neither calibrate nor write the profile file.
+ *
+ * @param cores                       parallelism of the pool during the benchmark, 0 if not measured
+ * @param evaluationsPerSecondPerCore feedbacks computed per second by one thread
+ * @param evaluationsPerSecond        feedbacks computed per second by the whole pool
+ * @param parallelSearchThreshold     guesses × secrets above which a search runs on the pool
+ * @param parallelFilterThreshold     solution space size above which a filter runs on the pool
+ */
+public record MachineProfile(int cores, double evaluationsPerSecondPerCore, double evaluationsPerSecond,
+                             long parallelSearchThreshold, int parallelFilterThreshold) {
+
+    /** The machine the solver was first tuned on (about 130 M evaluations per second). */
+    public static final MachineProfile REFERENCE = new MachineProfile(0, 60e6, 130e6, 3_000_000, 16384);
+
+    private static final int    VERSION        = 1;
+    /** Single-threaded time above which a search is worth running on the pool. */
+    private static final double SEARCH_SPLIT_S = 0.05;
+    /** Single-threaded time above which a filter is worth running on the pool. */
+    private static final double FILTER_SPLIT_S = 0.000_25;
+    private static final long   WARMUP_NANOS   = 50_000_000L;
+    private static final long   MEASURE_NANOS  = 150_000_000L;
+    /** Game whose codes the benchmark computes feedbacks for. */
+    private static final int    BENCH_C        = 8;
+    private static final int    BENCH_D        = 6;
+
+    private static volatile MachineProfile current;
+
+    /**
+     * Get the profile of this machine, reading the profile file or calibrating on
+     * first use.
+     *
+     * @return the profile in use
+     */
+    public static MachineProfile current() {
+        MachineProfile profile = current;
+        if (profile != null) return profile;
+
+        synchronized (MachineProfile.class) {
+            if (current == null) current = loadOrCalibrate();
+            return current;
+        }
+    }
+
+    /**
+     * Run the benchmark again and store the result in the profile file.
+     *
+     * @return the new profile, now in use
+     */
+    public static synchronized MachineProfile recalibrate() {
+        MachineProfile profile = calibrate();
+        save(profile, profilePath());
+        current = profile;
+        return profile;
+    }
+
+    /**
+     * Use the given profile instead of the measured one, e.g. to reproduce the
+     * behavior of another machine.
+     *
+     * @param profile profile to use from now on, or null to read or measure it again
+     */
+    public static void setCurrent(MachineProfile profile) { current = profile; }
+
+    /**
+     * @param latencyMillis time a search may take, in milliseconds
+     * @return guesses × secrets the whole pool evaluates in that time
+     */
+    public long searchBudget(long latencyMillis) {
+        return (long) (evaluationsPerSecond * latencyMillis / 1000);
+    }
+
+    /**
+     * Measure the feedback throughput of one thread and of the whole pool.
+     *
+     * @return a profile derived from the measurements
+     */
+    public static MachineProfile calibrate() {
+        CodeTable table = CodeTable.of(BENCH_C, BENCH_D);
+        int       total = (int) Math.pow(BENCH_C, BENCH_D);
+        int       cores = SolverPool.getParallelism();
+
+        countFor(table, total, WARMUP_NANOS);
+        double perCore = countFor(table, total, MEASURE_NANOS) * 1e9 / MEASURE_NANOS;
+
+        // One loop per worker, all running at once
+        long all = SolverPool.get().submit(() -> IntStream.range(0, cores).parallel()
+                .mapToLong(worker -> countFor(table, total, MEASURE_NANOS)).sum()).join();
+        double perMachine = Math.max(perCore, all * 1e9 / MEASURE_NANOS);
+
+        return new MachineProfile(cores, perCore, perMachine, (long) (perCore * SEARCH_SPLIT_S),
+                                  Math.max(1024, (int) (perCore * FILTER_SPLIT_S)));
+    }
+
+    /** Compute feedbacks of a few guesses against every code for about {@code nanos}, returning how many. */
+    private static long countFor(CodeTable table, int total, long nanos) {
+        long count = 0;
+        int  sink  = 0;
+        long end   = System.nanoTime() + nanos;
+        for (int guessInd = 0; System.nanoTime() < end; guessInd = (guessInd + 7919) % total) {
+            long guessPacked = table.packed(guessInd);
+            long guessColors = table.colors(guessInd);
+            for (int secretInd = 0; secretInd < total; secretInd += 16) {
+                sink += table.getFeedback(guessPacked, guessColors, secretInd);
+            }
+            count += (total + 15) / 16;
+        }
+        return sink == -1 ? 0 : count;  // keep the feedbacks from being optimized away
+    }
+
+    /** Read the profile file if it matches this machine, otherwise measure and save a new profile. */
+    private static MachineProfile loadOrCalibrate() {
+        if ("reference".equals(System.getProperty("mastermind.profile"))) return REFERENCE;
+
+        Path           path    = profilePath();
+        MachineProfile profile = load(path);
+        if (profile != null && profile.cores == SolverPool.getParallelism()) return profile;
+
+        profile = calibrate();
+        save(profile, path);
+        return profile;
+    }
+
+    private static Path profilePath() {
+        String path = System.getProperty("mastermind.profile");
+        if (path != null && !path.equals("reference")) return Path.of(path);
+        return Path.of(System.getProperty("user.home"), ".mastermind", "profile.properties");
+    }
+
+    /**
+     * Read a profile file.
+     *
+     * @param path profile file
+     * @return the profile, or null if the file is missing, unreadable or of another version
+     */
+    static MachineProfile load(Path path) {
+        if (!Files.isRegularFile(path)) return null;
+
+        Properties properties = new Properties();
+        try (InputStream in = Files.newInputStream(path)) {
+            properties.load(in);
+            if (Integer.parseInt(properties.getProperty("version", "0")) != VERSION) return null;
+            return new MachineProfile(Integer.parseInt(properties.getProperty("cores")),
+                                      Double.parseDouble(properties.getProperty("evaluationsPerSecondPerCore")),
+                                      Double.parseDouble(properties.getProperty("evaluationsPerSecond")),
+                                      Long.parseLong(properties.getProperty("parallelSearchThreshold")),
+                                      Integer.parseInt(properties.getProperty("parallelFilterThreshold")));
+        } catch (IOException | RuntimeException e) {
+            return null;  // measured again and overwritten
+        }
+    }
+
+    /**
+     * Write a profile file. A profile that cannot be saved (e.g. read-only home
+     * directory) is still used, and measured again by the next run.
+     *
+     * @param profile profile to write
+     * @param path    profile file
+     */
+    static void save(MachineProfile profile, Path path) {
+        Properties properties = new Properties();
+        properties.setProperty("version", Integer.toString(VERSION));
+        properties.setProperty("cores", Integer.toString(profile.cores));
+        properties.setProperty("evaluationsPerSecondPerCore", Double.toString(profile.evaluationsPerSecondPerCore));
+        properties.setProperty("evaluationsPerSecond", Double.toString(profile.evaluationsPerSecond));
+        properties.setProperty("parallelSearchThreshold", Long.toString(profile.parallelSearchThreshold));
+        properties.setProperty("parallelFilterThreshold", Integer.toString(profile.parallelFilterThreshold));
+
+        try {
+            if (path.getParent() != null) Files.createDirectories(path.getParent());
+            try (OutputStream out = Files.newOutputStream(path)) {
+                properties.store(out, "Mastermind machine profile, written by MachineProfile.calibrate()");
+            }
+        } catch (IOException e) {
+            // Keep using the measured profile for this run
+        }
+    }
+}
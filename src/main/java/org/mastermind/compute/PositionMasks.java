@@ -0,0 +1,123 @@
+package org.mastermind.compute;
+
+import java.util.BitSet;
+import java.util.LinkedHashMap;
+import java.util.Map;
+import java.util.stream.IntStream;
+
+/**
+ * Bitmap index of the codes of a game by color and position: mask (p, k) has
+ * the bit of every code with color k at position p.
+ *
+ * <p>Two common feedbacks are plain set algebra on such masks. A feedback with
+ * no black rules out, at every position, the color the guess has there; a
+ * feedback with no peg at all also rules out every color of the guess at every
+ * position, and then is exactly the codes left. {@link #prune} applies them to a
+ * {@link SolutionSpace} BitSet with word-wise {@code andNot}, 64 codes per
+ * operation, before any code has its feedback computed.
+ *
+ * <p>A mask is a run of c^p set bits every c^(p+1) bits, so it is built with
+ * range sets. Indexes are built in parallel on the {@link SolverPool} on first
+ * use and kept in a small LRU cache keyed by (c, d), so every session of a game
+ * shares them. The index takes c·d·c^d bits; games above {@link #MAX_BYTES} get
+ * no index and are only filtered code by code.
+ */
+public final class PositionMasks {
+    /** Largest index built, in bytes (9×7: 63 masks of 4.8 M bits = 38 MB). */
+    static final long MAX_BYTES = 64L << 20;
+
+    /** Number of indexes kept in memory at once. */
+    private static final int CACHE_SIZE = 2;
+
+    private static final Map<Integer, PositionMasks> CACHE = new LinkedHashMap<>(CACHE_SIZE, 0.75f, true) {
+        @Override
+        protected boolean removeEldestEntry(Map.Entry<Integer, PositionMasks> eldest) {
+            return size() > CACHE_SIZE;
+        }
+    };
+
+    private static volatile boolean enabled = true;
+
+    private final int      c;
+    private final int      d;
+    private final BitSet[] masks;  // [p * c + k] = codes with color k at position p
+
+    private PositionMasks(int c, int d, int total) {
+        this.c = c;
+        this.d = d;
+        this.masks = new BitSet[c * d];
+
+        // A parallel stream started from a pool task runs on that pool
+        SolverPool.get().submit(() -> IntStream.range(0, c * d).parallel().forEach(mask -> {
+            int    run    = (int) Math.pow(c, mask / c);  // c^p
+            int    period = run * c;
+            int    offset = run * (mask % c);
+            BitSet bits   = new BitSet(total);
+            for (int block = 0; block < total; block += period) bits.set(block + offset, block + offset + run);
+            masks[mask] = bits;
+        })).join();
+    }
+
+    /**
+     * Get the shared index for a game, building it on first use.
+     *
+     * @param c number of colors (<= 9)
+     * @param d number of digits (<= 9)
+     * @return the index, or {@code null} if the game is too large or indexes are disabled
+     */
+    public static PositionMasks of(int c, int d) {
+        int total = (int) Math.pow(c, d);
+        if (!enabled || (long) c * d * ((total + 63) >>> 6) * Long.BYTES > MAX_BYTES) return null;
+
+        synchronized (CACHE) {
+            return CACHE.computeIfAbsent(c * 10 + d, key -> new PositionMasks(c, d, total));
+        }
+    }
+
+    /**
+     * Enable or disable the use of position masks (enabled by default).
+     * Disabling also drops the cached indexes.
+     *
+     * @param enable {@code true} to let {@link #of} build and return indexes
+     */
+    public static void setEnabled(boolean enable) {
+        enabled = enable;
+        if (!enable) {
+            synchronized (CACHE) {
+                CACHE.clear();
+            }
+        }
+    }
+
+    /**
+     * Clear the codes that the masks rule out for a feedback: with no black, the
+     * guess's color at each position; with no peg, also every color of the guess
+     * anywhere. Feedbacks with blacks leave the codes untouched.
+     *
+     * @param codes    BitSet of c^d codes to clear in place
+     * @param guessInd index of the guess code (0-based, base-c encoding)
+     * @param feedback feedback value (black * 10 + white)
+     * @return {@code true} if the codes left are exactly those consistent with the
+     *         feedback (no peg), {@code false} if they still need checking one by one
+     */
+    public boolean prune(BitSet codes, int guessInd, int feedback) {
+        if (feedback >= 10) return false;
+
+        int[] digits = new int[d];
+        for (int p = 0, tmp = guessInd; p < d; p++, tmp /= c) digits[p] = tmp % c;
+
+        if (feedback > 0) {
+            for (int p = 0; p < d; p++) codes.andNot(masks[p * c + digits[p]]);
+            return false;
+        }
+
+        // No peg: no color of the guess appears anywhere
+        boolean[] seen = new boolean[c];
+        for (int digit : digits) {
+            if (seen[digit]) continue;
+            seen[digit] = true;
+            for (int p = 0; p < d; p++) codes.andNot(masks[p * c + digit]);
+        }
+        return true;
+    }
+}
@@ -0,0 +1,168 @@
+package org.mastermind.compute;
+
+/**
+ * A list of secrets decoded once into structure-of-arrays form, so that a guess
+ * can be scored against many secrets per instruction.
+ *
+ * <p>{@link ExpectedSize#calcExpectedRank(int, int[], int, int, int[])} handles one
+ * secret at a time and its per-secret loops over digits and colors cannot be
+ * vectorized. Here every digit position and every color gets its own {@code int[]}
+ * lane with one entry per secret. Scoring a guess is then a handful of flat passes
+ * (one per position for blacks, one per guess color for the color overlap) made of
+ * branch-free int arithmetic, which HotSpot's C2 compiler turns into SIMD
+ * instructions (8 secrets per instruction with AVX2, 16 with AVX-512). Only the
+ * final histogram update is scalar.
+ *
+ * <p>The secrets of a BestGuess search are the same for every candidate guess, so
+ * the decoding cost is paid once per search. Instances are immutable and can be
+ * shared between threads.
+ */
+public final class SecretLanes {
+    /** Number of secrets scored per pass, sized so the per-pass buffers stay in L1. */
+    private static final int BLOCK = 1024;
+
+    private final int     c;
+    private final int     d;
+    private final int     size;
+    private final int[][] digits;  // [p][j] = digit at position p of secret j
+    private final int[][] counts;  // [k][j] = occurrences of color k in secret j
+
+    /**
+     * Decode a list of secrets into lanes.
+     *
+     * @param secretsInd list of secret indices (0-based, base-c encoding)
+     * @param c          number of colors (<= 9)
+     * @param d          number of digits (<= 9)
+     */
+    public SecretLanes(int[] secretsInd, int c, int d) {
+        this.c = c;
+        this.d = d;
+        this.size = secretsInd.length;
+        this.digits = new int[d][size];
+        this.counts = new int[c][size];
+
+        for (int j = 0; j < size; j++) {
+            int tmp = secretsInd[j];
+            for (int p = 0; p < d; p++) {
+                int digit = tmp % c;
+                tmp /= c;
+                digits[p][j] = digit;
+                counts[digit][j]++;
+            }
+        }
+    }
+
+    /** @return number of secrets in the lanes */
+    public int size() { return size; }
+
+    /**
+     * Add the feedback of a guess against every secret to a frequency table.
+     *
+     * @param guessInd     index of the guess code (0-based, base-c encoding)
+     * @param feedbackFreq int array of length 100, incremented at each feedback value
+     */
+    public void countFeedback(int guessInd, int[] feedbackFreq) {
+        countFeedback(guessInd, feedbackFreq, Long.MAX_VALUE);
+    }
+
+    /**
+     * Add the feedback of a guess against the secrets to a frequency table,
+     * stopping after the first block where the rank can no longer stay within
+     * {@code bound}.
+     *
+     * <p>The rank (sum of squared frequencies) is tracked as {@code size} plus
+     * {@code 2 * freq} for every secret added to a bucket of {@code freq}. Every
+     * secret still to come adds at least 1, so the running value never exceeds
+     * the final rank and equals it once all secrets are counted.
+     *
+     * @param guessInd     index of the guess code (0-based, base-c encoding)
+     * @param feedbackFreq int array of length 100, incremented at each feedback value
+     * @param bound        stop once the rank is known to exceed this value
+     * @return the rank if it is at most {@code bound}, otherwise a lower bound of it greater than {@code bound}
+     */
+    public long countFeedback(int guessInd, int[] feedbackFreq, long bound) {
+        int[] guessDigits = guessDigits(guessInd);
+        int[] guessCounts = guessCounts(guessDigits);
+        int[] black       = new int[BLOCK];
+        int[] common      = new int[BLOCK];
+        long  rank        = size;
+
+        for (int from = 0; from < size && rank <= bound; from += BLOCK) {
+            int len = Math.min(BLOCK, size - from);
+            scoreBlock(guessDigits, guessCounts, from, len, black, common);
+
+            // Scalar histogram update, clearing the buffers for the next block
+            for (int j = 0; j < len; j++) {
+                rank += 2L * feedbackFreq[black[j] * 9 + common[j]]++;
+                black[j] = 0;
+                common[j] = 0;
+            }
+        }
+
+        return rank;
+    }
+
+    /**
+     * Compute the feedback of a guess against every secret.
+     *
+     * @param guessInd  index of the guess code (0-based, base-c encoding)
+     * @param feedbacks output buffer of length at least {@link #size()}; {@code feedbacks[j]}
+     *                  receives the feedback (black*10 + white) of the j-th secret
+     */
+    public void getFeedbacks(int guessInd, byte[] feedbacks) {
+        int[] guessDigits = guessDigits(guessInd);
+        int[] guessCounts = guessCounts(guessDigits);
+        int[] black       = new int[BLOCK];
+        int[] common      = new int[BLOCK];
+
+        for (int from = 0; from < size; from += BLOCK) {
+            int len = Math.min(BLOCK, size - from);
+            scoreBlock(guessDigits, guessCounts, from, len, black, common);
+
+            // black*10 + (common - black), clearing the buffers for the next block
+            for (int j = 0; j < len; j++) {
+                feedbacks[from + j] = (byte) (black[j] * 9 + common[j]);
+                black[j] = 0;
+                common[j] = 0;
+            }
+        }
+    }
+
+    /** Add the blacks and the color overlap of the guess with secrets {@code [from, from + len)} to the buffers. */
+    private void scoreBlock(int[] guessDigits, int[] guessCounts, int from, int len, int[] black, int[] common) {
+        // Blacks: (x - 1) >>> 31 is 1 when x == 0 and 0 for any digit difference 1..15
+        for (int p = 0; p < d; p++) {
+            int[] lane  = digits[p];
+            int   digit = guessDigits[p];
+            for (int j = 0; j < len; j++) {
+                black[j] += ((lane[from + j] ^ digit) - 1) >>> 31;
+            }
+        }
+
+        // Blacks + whites: overlap of the color multisets, skipping colors absent from the guess
+        for (int k = 0; k < c; k++) {
+            int count = guessCounts[k];
+            if (count == 0) continue;
+            int[] lane = counts[k];
+            for (int j = 0; j < len; j++) {
+                common[j] += Math.min(count, lane[from + j]);
+            }
+        }
+    }
+
+    private int[] guessDigits(int guessInd) {
+        int[] guessDigits = new int[d];
+        int   tmp         = guessInd;
+        for (int p = 0; p < d; p++) {
+            guessDigits[p] = tmp % c;
+            tmp /= c;
+        }
+        return guessDigits;
+    }
+
+    private int[] guessCounts(int[] guessDigits) {
+        int[] guessCounts = new int[c];
+        for (int digit : guessDigits) guessCounts[digit]++;
+        return guessCounts;
+    }
+}
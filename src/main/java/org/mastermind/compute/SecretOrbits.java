@@ -0,0 +1,73 @@
+package org.mastermind.compute;
+
+import java.util.Map;
+import java.util.concurrent.ConcurrentHashMap;
+
+/**
+ * The remaining secrets of a turn, compressed for each guess into weighted
+ * representatives (see {@link SolutionSpace#getWeightedSecrets}).
+ *
+ * <p>Relabeling the colors that no past guess used maps the solution space onto
+ * itself, but only the relabelings that also leave the guess unchanged keep each
+ * secret's feedback. Those are the permutations of the unused colors that are
+ * absent from the guess, so the compression depends on the guess only through
+ * that set of colors. Each set is materialized once, on first use, and shared by
+ * every guess (and thread) that needs it. Canonical guesses use unused colors in
+ * label order, so in practice only a handful of sets are built per turn.
+ *
+ * <p>Instances are built for one suggestion and must not outlive a change to the
+ * solution space.
+ */
+public final class SecretOrbits {
+    private final SolutionSpace         solutionSpace;
+    private final int                   c;
+    private final int                   d;
+    private final int[]                 unusedColors;
+    private final Map<Integer, int[][]> weighted = new ConcurrentHashMap<>();
+
+    /**
+     * @param solutionSpace current solution space
+     * @param unusedColors  colors no past guess used (0-based), in increasing order
+     * @param c             number of colors (<= 9)
+     * @param d             number of digits (<= 9)
+     */
+    public SecretOrbits(SolutionSpace solutionSpace, int[] unusedColors, int c, int d) {
+        this.solutionSpace = solutionSpace;
+        this.c = c;
+        this.d = d;
+        this.unusedColors = unusedColors;
+    }
+
+    /** @return total number of secrets (the sum of the weights of any compression) */
+    public int size() { return solutionSpace.getSize(); }
+
+    /**
+     * Get the weighted secrets valid for a guess.
+     *
+     * @param guessInd index of the guess code (0-based, base-c encoding)
+     * @return int[][] where [0]=representative indices, [1]=orbit sizes, or null when
+     *         fewer than two unused colors are absent from the guess (no compression)
+     */
+    public int[][] forGuess(int guessInd) {
+        // Bit k set if color k appears in the guess
+        int present = 0;
+        for (int p = 0; p < d; p++) {
+            present |= 1 << (guessInd % c);
+            guessInd /= c;
+        }
+
+        int mask = 0;
+        for (int color : unusedColors) {
+            if ((present >>> color & 1) == 0) mask |= 1 << color;
+        }
+        if (Integer.bitCount(mask) < 2) return null;
+
+        return weighted.computeIfAbsent(mask, m -> solutionSpace.getWeightedSecrets(colorsOf(m)));
+    }
+
+    private static int[] colorsOf(int mask) {
+        int[] colors = new int[Integer.bitCount(mask)];
+        for (int i = 0; mask != 0; mask &= mask - 1) colors[i++] = Integer.numberOfTrailingZeros(mask);
+        return colors;
+    }
+}
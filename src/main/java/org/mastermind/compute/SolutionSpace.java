@@ -1,8 +1,20 @@
 package org.mastermind.compute;
 
+import org.mastermind.codes.SampledCode;
+
+import java.io.IOException;
+import java.nio.ByteOrder;
+import java.nio.MappedByteBuffer;
+import java.nio.channels.FileChannel;
+import java.nio.file.Path;
+import java.nio.file.StandardOpenOption;
+import java.util.ArrayList;
+import java.util.Arrays;
 import java.util.BitSet;
+import java.util.List;
 import java.util.concurrent.ForkJoinPool;
 import java.util.concurrent.Future;
+import java.util.concurrent.ThreadLocalRandom;
 
 /**
  * Solution space refer to the set of remaining valid secrets
@@ -10,74 +22,304 @@ import java.util.concurrent.Future;
  * secret is still a valid solution to the puzzle, allowing
  * progress tracking and calculating the best next move.
  *
- * <p>Internally, a BitSet of size c^d is used so that
+ * <p>Internally, the space starts as a BitSet of size c^d so that
  * {@link #filterSolution} clears bits in-place with
  * zero allocation. BitSet's nextSetBit iteration also skips eliminated
  * secrets in bulk (64 per word), making repeated filtering fast even
  * when the initial space is large (e.g., 9×9 = 387 M codes).
+ *
+ * <p>Once at most one code in {@value #SPARSE_RATIO} is left, an int per
+ * secret takes no more memory than the BitSet, so the space switches to a
+ * sorted array of the remaining indices and drops the BitSet (48 MB for 9×9).
+ * From then on filtering, {@link #getSecrets()}, {@link #getSample(int)} and
+ * memory use scale with the number of remaining secrets instead of c^d.
+ *
+ * <p>Each filter can also journal the state it started from, so that {@link #undo}
+ * restores the last turns without filtering again. The state before the first
+ * filter is the full space and costs nothing; a dense state costs a copy of the
+ * BitSet and a sparse one a copy of its array. The journal is off by default and
+ * only keeps that free first state; callers that undo opt in with a budget, and
+ * the oldest states are dropped once the journal exceeds it (see
+ * {@link #setJournalBudget(long)}).
+ *
+ * <p>A space can be saved to a file with {@link #save(Path)} and loaded back with
+ * {@link #load(Path)}, e.g. to share the state after a costly first filter of a
+ * large game between processes. The file is written and read through memory
+ * mappings ({@link FileChannel#map}): loading maps it read-only, so processes
+ * loading the same file read the same pages of the OS cache, and copies the
+ * words straight into the space's own BitSet, which later filters then change
+ * without touching the file. The BitSet is stored as little-endian 64-bit words
+ * after a {@value #FILE_HEADER_BYTES}-byte header, so bit i of the payload is
+ * code i; a sparse space stores its sorted indices as little-endian ints.
  */
 public final class SolutionSpace {
-    /** Minimum number of set bits before parallel filtering is used. */
-    private static final int          PARALLEL_THRESHOLD = 16384;
-    private static final ForkJoinPool POOL               = ForkJoinPool.commonPool();
+    /** Switch to the sorted array once {@code size * SPARSE_RATIO <= c^d} (bits per int). */
+    static final int SPARSE_RATIO = 32;
+    /** Size of the header of a saved space, a multiple of 8 so the words stay aligned. */
+    public static final int FILE_HEADER_BYTES = 24;
+
+    private static final int FILE_MAGIC   = 0x4D4D5353;  // "MMSS"
+    private static final int FILE_VERSION = 1;
 
     private final int     c;
     private final int     d;
     private final int     totalCodes;           // c^d
-    private final BitSet  remaining;            // bit i set  ⟺  index i is still a valid secret
+    private       BitSet  remaining;            // bit i set  ⟺  index i is still a valid secret; null when sparse
+    private       int[]   sparse;               // sorted valid indices in [0, size); null when dense
     private       int     size;                 // cached cardinality of remaining
     private       boolean isFirstFilter = true; // flag to use specialized function for first filter
 
+    private final List<State> journal       = new ArrayList<>();  // state before each of the last filters
+    private       long        journalBytes;
+    private       long        journalBudget;  // 0: only the free state before the first filter
+
     public SolutionSpace(int c, int d) {
         this.c = c;
         this.d = d;
         this.totalCodes = (int) Math.pow(c, d);
-        this.remaining = new BitSet(totalCodes);
-        remaining.set(0, totalCodes);
-        this.size = totalCodes;
+        reset();
+    }
+
+    /** Create a space in a given state, with an empty journal. */
+    private SolutionSpace(int c, int d, BitSet remaining, int[] sparse, int size, boolean first) {
+        this.c = c;
+        this.d = d;
+        this.totalCodes = (int) Math.pow(c, d);
+        this.remaining = remaining;
+        this.sparse = sparse;
+        this.size = size;
+        this.isFirstFilter = first;
     }
 
     /** Reset the solution space to all valid codes */
     public void reset() {
+        remaining = new BitSet(totalCodes);
         remaining.set(0, totalCodes);
+        sparse = null;
         size = totalCodes;
         isFirstFilter = true;
+        journal.clear();
+        journalBytes = 0;
+    }
+
+    /**
+     * Set how many bytes of past states are kept for {@link #undo}. Filters
+     * beyond the budget can no longer be undone from the journal.
+     *
+     * <p>Each journaled state is copied before its filter: c^d / 8 bytes while the
+     * space is dense (48 MB for 9×9), 4 bytes per secret once it is sparse. A
+     * budget below c^d / 8 keeps dense states out of the journal, so only the
+     * sparse turns of a large game are undone without filtering again.
+     *
+     * @param bytes journal budget in bytes (0, the default, keeps only the free state before the first filter)
+     */
+    public void setJournalBudget(long bytes) {
+        if (bytes < 0) throw new IllegalArgumentException("bytes must not be negative.");
+        journalBudget = bytes;
+        trimJournal();
+    }
+
+    /**
+     * Undo the last {@code n} filters by restoring the state journaled before them.
+     *
+     * @param n number of filters to undo
+     * @return {@code true} if restored; {@code false} if the journal does not reach
+     *         back {@code n} filters or that state was inside a batch of
+     *         {@link #filterSolutions}, in which case the space is unchanged
+     */
+    public boolean undo(int n) {
+        if (n < 0) throw new IllegalArgumentException("n must not be negative.");
+        if (n > journal.size()) return false;
+        if (n == 0) return true;
+
+        State state = journal.get(journal.size() - n);
+        if (state == null) return false;  // inside a batch of filterSolutions
+        for (int i = 0; i < n; i++) journalBytes -= bytes(journal.remove(journal.size() - 1));
+
+        remaining = state.dense;
+        sparse = state.sparse;
+        size = state.size;
+        isFirstFilter = state.first;
+        if (state.first) {
+            remaining = new BitSet(totalCodes);
+            remaining.set(0, totalCodes);
+        }
+        return true;
+    }
+
+    /** @return number of past filters the journal covers */
+    public int getJournalDepth() { return journal.size(); }
+
+    /** Journal the current state, before it is filtered. */
+    private void journalState() {
+        long bytes = isFirstFilter ? 0 : sparse != null ? 4L * size : remaining.size() / 8;
+        if (bytes > journalBudget) {
+            // Too large to keep; the turns before it could no longer be reached either
+            journal.clear();
+            journalBytes = 0;
+            return;
+        }
+
+        State state;
+        if (isFirstFilter) state = new State(null, null, size, true);
+        else if (sparse != null) state = new State(null, Arrays.copyOf(sparse, size), size, false);
+        else state = new State((BitSet) remaining.clone(), null, size, false);
+        journal.add(state);
+        journalBytes += state.bytes();
+        trimJournal();
+    }
+
+    /** Drop the oldest states until the journal fits its budget. */
+    private void trimJournal() {
+        while (journalBytes > journalBudget) journalBytes -= bytes(journal.remove(0));
     }
 
+    private static long bytes(State state) { return state == null ? 0 : state.bytes(); }
+
     /**
      * Filter the solution space according to the obtained feedback from a guess.
      * After this operation, only the secrets whose feedback with the input guess
      * matches the obtained feedback would be kept.
      *
-     * <p>For large solution spaces (cardinality &ge; {@code PARALLEL_THRESHOLD}),
+     * <p>For large solution spaces (cardinality &ge;
+     * {@link MachineProfile#parallelFilterThreshold()} of this machine),
      * work is split into word-aligned 64-index chunks and processed in parallel
-     * via the common ForkJoinPool. Each chunk owns a disjoint word range in the
+     * on the shared {@link SolverPool}. Each chunk owns a disjoint word range in the
      * BitSet, so concurrent {@code clear()} calls on non-overlapping words are safe.
      * For small spaces the single-threaded path is used to avoid FJP overhead.
      *
-     * <p>The first call uses an incremental path that avoids recomputing all digit
-     * comparisons from scratch for every secret index.
+     * <p>The first call does not test the codes at all: the codes consistent with
+     * the feedback are enumerated directly by {@link ConsistentCodes}, in time
+     * proportional to their number rather than to c^d.
+     *
+     * <p>Small games with a {@link FeedbackMatrix} read feedbacks from the matrix instead.
+     * Games with {@link PositionMasks} first clear, word by word, the codes that a
+     * feedback with no black rules out; a feedback with no peg needs nothing else.
+     *
+     * <p>Once the space is sparse, the sorted array is compacted in place instead,
+     * in parallel chunks of the array when it is large.
      *
      * @param guessInd         index of the guess code (0-based, base-c encoding)
      * @param obtainedFeedback feedback value (black * 10 + white)
      */
     public void filterSolution(int guessInd, int obtainedFeedback) {
+        filterSolutions(new int[] { guessInd }, new int[] { obtainedFeedback });
+    }
+
+    /**
+     * Filter the solution space by several guesses at once, keeping the secrets
+     * consistent with every feedback. Each secret is checked against the
+     * constraints in order and dropped at the first that fails, in a single pass
+     * over the space instead of one per guess; most secrets fail the first.
+     * Otherwise the same as {@link #filterSolution}.
+     *
+     * <p>The journal keeps the state before the whole batch only, so
+     * {@link #undo} can go back over all of its filters but not part of them.
+     *
+     * @param guessesInd indices of the guess codes (0-based, base-c encoding)
+     * @param feedbacks  feedback of each guess (black * 10 + white)
+     * @throws IllegalArgumentException if the arrays differ in length
+     */
+    public void filterSolutions(int[] guessesInd, int[] feedbacks) {
+        if (guessesInd.length != feedbacks.length)
+            throw new IllegalArgumentException("Every guess needs exactly one feedback.");
+        if (guessesInd.length == 0) return;
+
+        journalState();
+        for (int i = 1; i < guessesInd.length; i++) journal.add(null);  // states inside the batch are not kept
+
         // Read and update flag
         final boolean isFirst = isFirstFilter;
         if (isFirst) isFirstFilter = false;
 
+        if (isFirst) {
+            remaining.clear();
+            size = ConsistentCodes.enumerate(guessesInd[0], feedbacks[0], c, d, remaining);
+            guessesInd = Arrays.copyOfRange(guessesInd, 1, guessesInd.length);
+            feedbacks = Arrays.copyOfRange(feedbacks, 1, feedbacks.length);
+        }
+
+        if (sparse != null) {
+            filterSparse(guessesInd, feedbacks);
+        } else {
+            if (guessesInd.length > 0) filterDense(guessesInd, feedbacks);
+            switchToSparse();
+        }
+    }
+
+    /**
+     * Filter the solution space by a guess whose feedback against every remaining
+     * secret is already known, e.g. from the search that suggested it. Only the
+     * known feedbacks are compared, none is computed.
+     *
+     * @param feedbacks        feedback of the guess against each remaining secret, in
+     *                         increasing secret order (as {@link #getSecrets()} lists them)
+     * @param obtainedFeedback feedback value (black * 10 + white)
+     * @throws IllegalArgumentException if there is not one feedback per remaining secret
+     */
+    public void filterPartition(byte[] feedbacks, int obtainedFeedback) {
+        if (feedbacks.length != size)
+            throw new IllegalArgumentException("Expected " + size + " feedbacks, got " + feedbacks.length + ".");
+
+        journalState();
+        isFirstFilter = false;
+
+        if (sparse != null) {
+            int kept = 0;
+            for (int j = 0; j < size; j++) if (feedbacks[j] == obtainedFeedback) sparse[kept++] = sparse[j];
+            size = kept;
+            if (size <= sparse.length / 2) sparse = Arrays.copyOf(sparse, size);  // release the memory
+        } else {
+            int j = 0;
+            for (int i = remaining.nextSetBit(0); i >= 0; i = remaining.nextSetBit(i + 1)) {
+                if (feedbacks[j++] != obtainedFeedback) {
+                    remaining.clear(i);
+                    size--;
+                }
+            }
+            switchToSparse();
+        }
+    }
+
+    /** Whether the space is stored as a sorted array rather than a BitSet. */
+    boolean isSparse() { return sparse != null; }
+
+    /** Replace the BitSet by a sorted array once few enough secrets remain. */
+    private void switchToSparse() {
+        if ((long) size * SPARSE_RATIO > totalCodes) return;
+
+        sparse = new int[size];
+        int j = 0;
+        for (int i = remaining.nextSetBit(0); i >= 0; i = remaining.nextSetBit(i + 1)) sparse[j++] = i;
+        remaining = null;
+    }
+
+    /** Filter the BitSet, on the pool when the space is large. */
+    private void filterDense(int[] guessesInd, int[] feedbacks) {
+        // Apply what the position masks can rule out word-wise, then check the rest code by code
+        int[][]     unresolved     = prune(guessesInd, feedbacks);
+        final int[] checkGuesses   = unresolved[0];
+        final int[] checkFeedbacks = unresolved[1];
+        if (checkGuesses.length == 0) return;
+
+        // When the game is small enough, look feedbacks up in the precomputed matrix
+        FeedbackMatrix matrix = FeedbackMatrix.of(c, d);
+        if (matrix != null) {
+            size -= filterRange(matrix, checkGuesses, checkFeedbacks);
+            return;
+        }
+
         // When size is small, go single-threaded
-        if (size < PARALLEL_THRESHOLD) {
-            size -= isFirst ?
-                    filterRangeFirst(guessInd, obtainedFeedback, 0, totalCodes) :
-                    filterRange(guessInd, obtainedFeedback, 0, totalCodes);
+        if (size < MachineProfile.current().parallelFilterThreshold()) {
+            size -= filterRange(checkGuesses, checkFeedbacks, 0, totalCodes);
             return;
         }
 
         // Split into word-aligned (multiple-of-64) chunks for safe concurrent access.
-        int parallelism  = POOL.getParallelism();
-        int words        = (totalCodes + 63) >>> 6;
-        int wordsPerTask = Math.max(1, (words + parallelism - 1) / parallelism);
+        ForkJoinPool pool         = SolverPool.get();
+        int          parallelism  = pool.getParallelism();
+        int          words        = (totalCodes + 63) >>> 6;
+        int          wordsPerTask = Math.max(1, (words + parallelism - 1) / parallelism);
 
         // Multi-threaded route
         @SuppressWarnings("unchecked")
@@ -88,18 +330,13 @@ public final class SolutionSpace {
             final int from = fromIndex;
             final int to   = fromIndex + wordsPerTask * 64;
 
-            // Submit the task with the appropriate function
-            futures[taskCount++] = isFirst ?
-                    POOL.submit(() -> filterRangeFirst(guessInd, obtainedFeedback, from, to)) :
-                    POOL.submit(() -> filterRange(guessInd, obtainedFeedback, from, to));
+            futures[taskCount++] = pool.submit(() -> filterRange(checkGuesses, checkFeedbacks, from, to));
 
             fromIndex = to;
         }
 
         // Handle the last chunk in main thread
-        int removed = isFirst ?
-                filterRangeFirst(guessInd, obtainedFeedback, fromIndex, totalCodes) :
-                filterRange(guessInd, obtainedFeedback, fromIndex, totalCodes);
+        int removed = filterRange(checkGuesses, checkFeedbacks, fromIndex, totalCodes);
 
         // Sum up the removed count from other threads
         for (int i = 0; i < taskCount; i++) {
@@ -110,6 +347,30 @@ public final class SolutionSpace {
         size -= removed;
     }
 
+    /**
+     * Clear the codes that {@link PositionMasks} rule out for feedbacks without a
+     * black, and recount the space if any was applied.
+     *
+     * @return int[][] where [0]=guesses, [1]=feedbacks of the guesses still to check code by code
+     */
+    private int[][] prune(int[] guessesInd, int[] feedbacks) {
+        PositionMasks masks = PositionMasks.of(c, d);  // null for large games
+        if (masks == null) return new int[][] { guessesInd, feedbacks };
+
+        int[]   leftGuesses   = new int[guessesInd.length];
+        int[]   leftFeedbacks = new int[feedbacks.length];
+        int     left          = 0;
+        boolean pruned        = false;
+        for (int i = 0; i < guessesInd.length; i++) {
+            pruned |= feedbacks[i] < 10;
+            if (masks.prune(remaining, guessesInd[i], feedbacks[i])) continue;  // exact, nothing left to check
+            leftGuesses[left] = guessesInd[i];
+            leftFeedbacks[left++] = feedbacks[i];
+        }
+        if (pruned) size = remaining.cardinality();
+        return new int[][] { Arrays.copyOf(leftGuesses, left), Arrays.copyOf(leftFeedbacks, left) };
+    }
+
     /**
      * Single-threaded filter over indices {@code [from, to)}.
      * Safe to call from multiple threads as long as the index ranges are word-aligned
@@ -117,13 +378,15 @@ public final class SolutionSpace {
      *
      * @return number of bits cleared
      */
-    private int filterRange(int guessInd, int obtainedFeedback, int from, int to) {
-        int[] colorFreqCounter = new int[c];
-        int   removed          = 0;
+    private int filterRange(int[] guessesInd, int[] feedbacks, int from, int to) {
+        CodeTable table   = CodeTable.of(c, d);
+        long[]    packed  = packed(table, guessesInd);
+        long[]    colors  = colors(table, guessesInd);
+        int       removed = 0;
 
-        // Call getFeedback for each secret
+        // Calculate feedback for each secret
         for (int i = remaining.nextSetBit(from); i >= 0 && i < to; i = remaining.nextSetBit(i + 1)) {
-            if (Feedback.getFeedback(guessInd, i, c, d, colorFreqCounter) != obtainedFeedback) {
+            if (!matches(table, packed, colors, feedbacks, i)) {
                 remaining.clear(i);
                 removed++;
             }
@@ -132,45 +395,111 @@ public final class SolutionSpace {
     }
 
     /**
-     * Incremental single-threaded filter over a contiguous {@code [from, to)} range
-     * (used only for the first filter when all bits are set). Iterates every index
-     * with a plain for-loop and computes feedback incrementally via
-     * {@link FeedbackIncremental#getFeedbackIncremental}.
+     * Single-threaded filter over all indices using a precomputed feedback matrix.
      *
      * @return number of bits cleared
      */
-    private int filterRangeFirst(int guessInd, int obtainedFeedback, int from, int to) {
-        FeedbackIncremental.State init             = FeedbackIncremental.setupIncremental(guessInd, from, c, d);
-        int[]                     guessDigits      = init.guessDigits();
-        int[]                     secretDigits     = init.secretDigits();
-        int[]                     colorFreqCounter = init.colorFreqCounter();
-        int                       black            = init.black();
-        int                       colorFreqTotal   = init.colorFreqTotal();
-        int                       feedback0        = black * 9 + d - (colorFreqTotal >>> 1);
-
-        // Handle the first secret in chunk
+    private int filterRange(FeedbackMatrix matrix, int[] guessesInd, int[] feedbacks) {
         int removed = 0;
-        if (feedback0 != obtainedFeedback) {
-            remaining.clear(from);
-            removed++;
-        }
-
-        // Handle the remaining secrets
-        int[] result = new int[3];
-        for (int i = from + 1; i < to; i++) {
-            FeedbackIncremental.getFeedbackIncremental(guessDigits, secretDigits, black, colorFreqCounter,
-                                                       colorFreqTotal, c, d, result);
-            black = result[1];
-            colorFreqTotal = result[2];
-            if (result[0] != obtainedFeedback) {
+        for (int i = remaining.nextSetBit(0); i >= 0; i = remaining.nextSetBit(i + 1)) {
+            if (!matches(matrix, guessesInd, feedbacks, i)) {
                 remaining.clear(i);
                 removed++;
             }
         }
-
         return removed;
     }
 
+    /**
+     * Filter the sorted array, compacting it in place. Large arrays are split into
+     * chunks compacted in parallel on the {@link SolverPool}, each to the start of
+     * its own range, then moved next to each other.
+     */
+    private void filterSparse(int[] guessesInd, int[] feedbacks) {
+        int kept;
+        if (size < MachineProfile.current().parallelFilterThreshold()) {
+            kept = compactRange(guessesInd, feedbacks, 0, size);
+        } else {
+            ForkJoinPool pool        = SolverPool.get();
+            int          parallelism = pool.getParallelism();
+            int          perTask     = (size + parallelism - 1) / parallelism;
+            int          taskCount   = (size + perTask - 1) / perTask;
+
+            @SuppressWarnings("unchecked")
+            Future<Integer>[] futures = new Future[taskCount];
+            for (int t = 1; t < taskCount; t++) {
+                final int from = t * perTask;
+                final int to   = Math.min(size, from + perTask);
+                futures[t] = pool.submit(() -> compactRange(guessesInd, feedbacks, from, to));
+            }
+
+            // Handle the first chunk in main thread, which is already in place
+            kept = compactRange(guessesInd, feedbacks, 0, Math.min(size, perTask));
+            for (int t = 1; t < taskCount; t++) {
+                int count;
+                try { count = futures[t].get(); } catch (Exception e) { throw new RuntimeException(e); }
+                System.arraycopy(sparse, t * perTask, sparse, kept, count);
+                kept += count;
+            }
+        }
+
+        size = kept;
+        if (size <= sparse.length / 2) sparse = Arrays.copyOf(sparse, size);  // release the memory
+    }
+
+    /**
+     * Keep the secrets of {@code sparse[from, to)} consistent with every feedback,
+     * moving them to the start of the range in order.
+     *
+     * @return number of secrets kept
+     */
+    private int compactRange(int[] guessesInd, int[] feedbacks, int from, int to) {
+        int            kept   = from;
+        FeedbackMatrix matrix = FeedbackMatrix.of(c, d);
+        if (matrix != null) {
+            for (int i = from; i < to; i++) {
+                if (matches(matrix, guessesInd, feedbacks, sparse[i])) sparse[kept++] = sparse[i];
+            }
+            return kept - from;
+        }
+
+        CodeTable table  = CodeTable.of(c, d);
+        long[]    packed = packed(table, guessesInd);
+        long[]    colors = colors(table, guessesInd);
+        for (int i = from; i < to; i++) {
+            if (matches(table, packed, colors, feedbacks, sparse[i])) sparse[kept++] = sparse[i];
+        }
+        return kept - from;
+    }
+
+    /** Whether the secret gives each guess its feedback. */
+    private static boolean matches(CodeTable table, long[] packed, long[] colors, int[] feedbacks, int secretInd) {
+        for (int g = 0; g < feedbacks.length; g++) {
+            if (table.getFeedback(packed[g], colors[g], secretInd) != feedbacks[g]) return false;
+        }
+        return true;
+    }
+
+    /** Whether the secret gives each guess its feedback, read from the matrix. */
+    private static boolean matches(FeedbackMatrix matrix, int[] guessesInd, int[] feedbacks, int secretInd) {
+        for (int g = 0; g < feedbacks.length; g++) {
+            if (matrix.getFeedback(guessesInd[g], secretInd) != feedbacks[g]) return false;
+        }
+        return true;
+    }
+
+    private static long[] packed(CodeTable table, int[] guessesInd) {
+        long[] packed = new long[guessesInd.length];
+        for (int g = 0; g < packed.length; g++) packed[g] = table.packed(guessesInd[g]);
+        return packed;
+    }
+
+    private static long[] colors(CodeTable table, int[] guessesInd) {
+        long[] colors = new long[guessesInd.length];
+        for (int g = 0; g < colors.length; g++) colors[g] = table.colors(guessesInd[g]);
+        return colors;
+    }
+
     /**
      * Materialize the remaining valid secrets as an int array of indices.
      * Called once per turn suggestion, not per filter.
@@ -178,6 +507,8 @@ public final class SolutionSpace {
      * @return int array of indices of currently valid secrets
      */
     public int[] getSecrets() {
+        if (sparse != null) return Arrays.copyOf(sparse, size);
+
         int[] secretsInd = new int[size];
         int   j          = 0;
         for (int i = remaining.nextSetBit(0); i >= 0; i = remaining.nextSetBit(i + 1)) {
@@ -186,9 +517,214 @@ public final class SolutionSpace {
         return secretsInd;
     }
 
+    /**
+     * Materialize the remaining valid secrets compressed under relabelings of a set
+     * of interchangeable colors, as one representative per orbit plus the orbit size.
+     *
+     * <p>The colors must be unused by every past guess, so the solution space is
+     * closed under any permutation of them. If they are also absent from a guess,
+     * every secret of an orbit gives that guess the same feedback, and
+     * {@link ExpectedSize#calcExpectedRank(int, int[], int[], int, int, int[])} gives
+     * the same rank on the weighted representatives as on {@link #getSecrets()}.
+     *
+     * <p>The representative of an orbit is the secret whose interchangeable colors
+     * first appear (scanning from position 0) in increasing order. An orbit whose
+     * secrets use {@code m} of the {@code k} colors has {@code k! / (k - m)!} secrets.
+     *
+     * @param colors interchangeable colors (0-based), in increasing order
+     * @return int[][] where [0]=representative indices, [1]=orbit sizes
+     */
+    public int[][] getWeightedSecrets(int[] colors) {
+        // Rank of each interchangeable color, -1 for the others
+        int[] rank = new int[c];
+        Arrays.fill(rank, -1);
+        for (int i = 0; i < colors.length; i++) rank[colors[i]] = i;
+
+        // Orbit size by number of interchangeable colors used: k * (k - 1) * ... * (k - m + 1)
+        int[] orbitSize = new int[colors.length + 1];
+        orbitSize[0] = 1;
+        for (int m = 1; m <= colors.length; m++) orbitSize[m] = orbitSize[m - 1] * (colors.length - m + 1);
+
+        int[] secretsInd = new int[size];
+        int[] weights    = new int[size];
+        int   j          = 0;
+        for (int i : getSecrets()) {
+            // Count the interchangeable colors seen, rejecting any that appears out of order
+            int seen = 0;
+            int tmp  = i;
+            for (int p = 0; p < d && seen >= 0; p++) {
+                int r = rank[tmp % c];
+                tmp /= c;
+                if (r == seen) seen++;
+                else if (r > seen) seen = -1;
+            }
+            if (seen < 0) continue;
+
+            secretsInd[j] = i;
+            weights[j++] = orbitSize[seen];
+        }
+        return new int[][] { Arrays.copyOf(secretsInd, j), Arrays.copyOf(weights, j) };
+    }
+
     /** @return size of the current solution space (or valid secrets) */
     public int getSize() { return size; }
 
-    /** @return the underlying BitSet of remaining valid secret indices */
-    public BitSet getRemaining() { return remaining; }
+    /**
+     * @param secretInd index of a code (0-based, base-c encoding)
+     * @return whether the code is still a valid secret
+     */
+    public boolean contains(int secretInd) {
+        if (sparse != null) return Arrays.binarySearch(sparse, 0, size, secretInd) >= 0;
+        return remaining.get(secretInd);
+    }
+
+    /**
+     * Draw a random sample of the remaining valid secrets, with replacement.
+     *
+     * @param sampleSize size of the sample
+     * @return A random sample of valid secret indices
+     */
+    public int[] getSample(int sampleSize) {
+        if (sparse == null) return SampledCode.getValidSample(remaining, size, c, d, sampleSize);
+
+        int[] sample = new int[sampleSize];
+        for (int i = 0; i < sampleSize; i++) sample[i] = sparse[ThreadLocalRandom.current().nextInt(size)];
+        return sample;
+    }
+
+    /**
+     * Get the remaining valid secrets as a BitSet. Once the space is sparse this
+     * builds a new BitSet of c^d bits, so prefer {@link #contains}, {@link #getSecrets()}
+     * or {@link #getSample} where they do.
+     *
+     * @return BitSet of remaining valid secret indices (the underlying one while dense)
+     */
+    public BitSet getRemaining() {
+        if (sparse == null) return remaining;
+
+        BitSet bits = new BitSet(totalCodes);
+        for (int i = 0; i < size; i++) bits.set(sparse[i]);
+        return bits;
+    }
+
+    /**
+     * Save the space to a file, replacing it if it exists. The undo journal is not saved.
+     *
+     * @param path file to write
+     * @throws IOException if the file cannot be written
+     */
+    public void save(Path path) throws IOException {
+        try (FileChannel channel = FileChannel.open(path, StandardOpenOption.CREATE, StandardOpenOption.READ,
+                                                    StandardOpenOption.WRITE, StandardOpenOption.TRUNCATE_EXISTING)) {
+            write(channel, 0);
+        }
+    }
+
+    /**
+     * Write the space into a file at a given position, through a memory mapping.
+     *
+     * @param channel  channel opened for reading and writing
+     * @param position offset in the file, preferably a multiple of 8
+     * @return number of bytes written
+     * @throws IOException if the file cannot be written
+     */
+    public long write(FileChannel channel, long position) throws IOException {
+        long[] words  = sparse == null ? remaining.toLongArray() : null;
+        int    length = sparse == null ? words.length : size;  // payload length in words or ints
+        long   bytes  = FILE_HEADER_BYTES + (sparse == null ? 8L * length : 4L * length);
+
+        MappedByteBuffer buffer = channel.map(FileChannel.MapMode.READ_WRITE, position, bytes);
+        buffer.order(ByteOrder.LITTLE_ENDIAN);
+        buffer.putInt(FILE_MAGIC).putInt(FILE_VERSION);
+        buffer.put((byte) c).put((byte) d).put((byte) (isFirstFilter ? 1 : 0)).put((byte) (sparse != null ? 1 : 0));
+        buffer.putInt(size).putInt(length).putInt(0);
+        if (sparse == null) buffer.asLongBuffer().put(words);
+        else buffer.asIntBuffer().put(sparse, 0, size);
+        buffer.force();
+        return bytes;
+    }
+
+    /**
+     * Load a space saved by {@link #save(Path)}. Its journal starts empty.
+     *
+     * @param path file to read
+     * @return the space
+     * @throws IOException if the file cannot be read or is not a saved space of this version
+     */
+    public static SolutionSpace load(Path path) throws IOException {
+        try (FileChannel channel = FileChannel.open(path, StandardOpenOption.READ)) {
+            return read(channel, 0);
+        }
+    }
+
+    /**
+     * Read a space written by {@link #write} at a given position of a file, through
+     * a read-only memory mapping. Its journal starts empty.
+     *
+     * @param channel  channel opened for reading
+     * @param position offset of the space in the file
+     * @return the space
+     * @throws IOException if the file cannot be read or is not a saved space of this version
+     */
+    public static SolutionSpace read(FileChannel channel, long position) throws IOException {
+        if (channel.size() - position < FILE_HEADER_BYTES) throw new IOException("Not a saved solution space.");
+        MappedByteBuffer header = channel.map(FileChannel.MapMode.READ_ONLY, position, FILE_HEADER_BYTES);
+        header.order(ByteOrder.LITTLE_ENDIAN);
+        if (header.getInt() != FILE_MAGIC) throw new IOException("Not a saved solution space.");
+        int version = header.getInt();
+        if (version != FILE_VERSION) throw new IOException("Unsupported solution space version: " + version);
+
+        int     c      = header.get();
+        int     d      = header.get();
+        boolean first  = header.get() != 0;
+        boolean sparse = header.get() != 0;
+        int     size   = header.getInt();
+        int     length = header.getInt();
+        if (c < 1 || c > 9 || d < 1 || d > 9) throw new IOException("Invalid game size c=" + c + ", d=" + d + ".");
+
+        int  total = (int) Math.pow(c, d);
+        long bytes = sparse ? 4L * length : 8L * length;
+        if (size < 0 || size > total || length < 0 || (sparse && length != size)
+                || channel.size() - position - FILE_HEADER_BYTES < bytes)
+            throw new IOException("Saved solution space is truncated or corrupt.");
+
+        // A single bulk copy out of the mapping, so the file itself is never written to
+        MappedByteBuffer payload = channel.map(FileChannel.MapMode.READ_ONLY, position + FILE_HEADER_BYTES, bytes);
+        payload.order(ByteOrder.LITTLE_ENDIAN);
+        if (sparse) {
+            int[] secretsInd = new int[size];
+            payload.asIntBuffer().get(secretsInd);
+            for (int i = 0; i < size; i++) {
+                if (secretsInd[i] < (i == 0 ? 0 : secretsInd[i - 1] + 1) || secretsInd[i] >= total)
+                    throw new IOException("Saved solution space is truncated or corrupt.");
+            }
+            return new SolutionSpace(c, d, null, secretsInd, size, first);
+        }
+
+        BitSet remaining = BitSet.valueOf(payload.asLongBuffer());
+        if (remaining.length() > total || remaining.cardinality() != size)
+            throw new IOException("Saved solution space is truncated or corrupt.");
+        return new SolutionSpace(c, d, remaining, null, size, first);
+    }
+
+    /** @return number of colors of the game */
+    public int getC() { return c; }
+
+    /** @return number of digits of the game */
+    public int getD() { return d; }
+
+    /**
+     * State of the space before a filter.
+     *
+     * @param dense  copy of the BitSet, or null
+     * @param sparse copy of the sorted array, or null
+     * @param size   number of valid secrets
+     * @param first  whether it is the full space before the first filter
+     */
+    private record State(BitSet dense, int[] sparse, int size, boolean first) {
+        long bytes() {
+            if (dense != null) return dense.size() / 8;
+            return sparse != null ? 4L * sparse.length : 0;
+        }
+    }
 }
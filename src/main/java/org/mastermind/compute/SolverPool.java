@@ -0,0 +1,51 @@
+package org.mastermind.compute;
+
+import java.util.concurrent.ForkJoinPool;
+
+/**
+ * The thread pool shared by every parallel path of the solver: the guess search
+ * of {@code BestGuess}, {@link SolutionSpace#filterSolution} and the build of
+ * {@link FeedbackMatrix}.
+ *
+ * <p>Running everything on one work-stealing pool keeps the solver from
+ * competing with itself for cores, and several sessions in one JVM share the
+ * same workers instead of each bringing its own. The pool is separate from the
+ * common ForkJoinPool so that the host application's parallel streams do not
+ * slow the solver down, nor the other way around.
+ *
+ * <p>The parallelism defaults to the number of available processors and can be
+ * set with the {@code mastermind.parallelism} system property or
+ * {@link #setParallelism(int)}. Worker threads are daemon threads.
+ */
+public final class SolverPool {
+    private static volatile ForkJoinPool pool = newPool(
+            Integer.getInteger("mastermind.parallelism", Runtime.getRuntime().availableProcessors()));
+
+    /** @return the shared solver pool */
+    public static ForkJoinPool get() { return pool; }
+
+    /** @return number of worker threads of the shared solver pool */
+    public static int getParallelism() { return pool.getParallelism(); }
+
+    /**
+     * Replace the shared pool with one of the given parallelism. Tasks already
+     * running finish on the old pool, which is then shut down. Meant to be called
+     * between searches, e.g. at startup. The {@link MachineProfile} in use is
+     * dropped, to be read or measured again for the new parallelism.
+     *
+     * @param parallelism number of worker threads (>= 1)
+     */
+    public static synchronized void setParallelism(int parallelism) {
+        if (parallelism < 1) throw new IllegalArgumentException("parallelism must be at least 1.");
+        if (parallelism == pool.getParallelism()) return;
+
+        ForkJoinPool old = pool;
+        pool = newPool(parallelism);
+        old.shutdown();
+        MachineProfile.setCurrent(null);
+    }
+
+    private static ForkJoinPool newPool(int parallelism) {
+        return new ForkJoinPool(parallelism, ForkJoinPool.defaultForkJoinWorkerThreadFactory, null, false);
+    }
+}
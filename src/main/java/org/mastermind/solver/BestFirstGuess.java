@@ -8,7 +8,8 @@ import org.mastermind.compute.ExpectedSize;
  * Provides the best first guess for any supported Mastermind configuration.
  * <p>
  * Use {@link #of(int, int)} at runtime. Run {@link BestFirstGuessCalculator#main(String[])} once to
- * regenerate the hardcoded values after algorithm changes.
+ * regenerate the hardcoded values after algorithm changes; it writes the guess and rank of every game
+ * to a results file.
  */
 public final class BestFirstGuess {
 
@@ -32,7 +33,7 @@ public final class BestFirstGuess {
             return new long[] { 1, rank };
         }
 
-        // To regenerate this table, run BestFirstGuessCalculator.main()
+        // To regenerate this table, run BestFirstGuessCalculator.main() and copy its results file here
         return switch (c) {
             case 2 -> switch (d) {
                 case 2 -> new long[] { 11, 6L };
@@ -3,11 +3,41 @@ package org.mastermind.solver;
 import org.mastermind.codes.CanonicalCode;
 import org.mastermind.codes.ConvertCode;
 import org.mastermind.codes.SampledCode;
+import org.mastermind.compute.CodeTable;
 import org.mastermind.compute.ExpectedSize;
+import org.mastermind.compute.SolverPool;
+
+import java.io.BufferedWriter;
+import java.io.DataInputStream;
+import java.io.DataOutputStream;
+import java.io.IOException;
+import java.io.InputStream;
+import java.io.OutputStream;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.nio.file.StandardCopyOption;
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.List;
+import java.util.concurrent.ForkJoinTask;
+import java.util.stream.IntStream;
 
 /**
  * Offline calculator for regenerating the hardcoded table in {@link BestFirstGuess}.
- * Not used at runtime — run main() once after algorithm changes to recompute values.
+ * Not used at runtime — run main() after algorithm changes to recompute values.
+ *
+ * <p>Usage: {@code BestFirstGuessCalculator [checkpointDir] [output]}, by default
+ * {@code first-guess-checkpoints} and {@code best-first-guess.tsv}.
+ *
+ * <p>Every (c, d) cell runs concurrently on the shared {@link SolverPool}, and the
+ * canonical candidates of a cell are scored in parallel within each trial. Each
+ * cell saves its state (budget, completed trials and partial score sums, then its
+ * winner and true rank) to its own checkpoint file every {@value #CHECKPOINT_TRIALS}
+ * trials, so an interrupted run resumes where it stopped when started again with
+ * the same checkpoint directory. Finished cells are only read back.
+ *
+ * <p>The results are written as tab-separated values, one line per cell, with
+ * columns {@code c d guess rank avgScore confidence totalEvals full}.
  */
 final class BestFirstGuessCalculator {
 
@@ -16,109 +46,138 @@ final class BestFirstGuessCalculator {
     private static final long   TARGET_EVALS         = 13_000_000L;
     private static final double CONFIDENCE_THRESHOLD = 99.0;
     private static final int    BUDGET_MULTIPLIER    = 2;
+    /** Number of trials between two checkpoints of a cell. */
+    private static final int    CHECKPOINT_TRIALS    = 10;
 
-    public static void main(String[] args) {
-        int[] feedbackFreq = new int[100];
+    public static void main(String[] args) throws IOException {
+        Path checkpointDir = Path.of(args.length > 0 ? args[0] : "first-guess-checkpoints");
+        Path output        = Path.of(args.length > 1 ? args[1] : "best-first-guess.tsv");
+        Files.createDirectories(checkpointDir);
 
         // c=1 and d=1 are trivial, calibrate c in [2,9] x d in [2,9]
-        int      total    = 8 * 8;
-        String[] lines    = new String[total];
-        int[][]  bestCode = new int[10][10];
-        int      li       = 0;
-
-        String header = String.format("%-6s  %-12s  %10s  %10s  %12s",
-                                      "Game", "BestGuess", "AvgScore", "Confidence", "TotalEvals");
-        System.out.println(header);
-        System.out.println("-".repeat(60));
-
+        List<ForkJoinTask<CellState>> cells = new ArrayList<>();
         for (int c = 2; c <= 9; c++) {
             for (int d = 2; d <= 9; d++) {
-                ExpectedSize expectedSize = new ExpectedSize(d);
-                int[]        canonical    = CanonicalCode.enumerateCanonicalForms(c, d);
-                int          totalCodes   = (int) Math.pow(c, d);
-
-                long   budget = TARGET_EVALS;
-                Result result;
-                do {
-                    result = evaluate(canonical, c, d, totalCodes, budget, feedbackFreq, expectedSize);
-                    if (result.confidence < CONFIDENCE_THRESHOLD) {
-                        budget *= BUDGET_MULTIPLIER;
-                        System.out.printf("  [%dx%d] confidence %.2f%% too low, retrying with budget %d%n",
-                                          c, d, result.confidence, budget);
-                    }
-                } while (result.confidence < CONFIDENCE_THRESHOLD);
-
-                int code = ConvertCode.toCode(c, d, canonical[result.bestIdx]);
-                bestCode[c][d] = code;
-                lines[li] = String.format("%-6s  %-12d  %10.4f  %9.2f%%  %12d%s",
-                                          c + "x" + d, code,
-                                          result.avgScore, result.confidence,
-                                          result.totalEvals,
-                                          result.fullEval ? " (full)" : "");
-                System.out.println(lines[li]);
-                li++;
+                Path checkpoint = checkpointDir.resolve(c + "x" + d + ".ckpt");
+                int  cc         = c;
+                int  dd         = d;
+                cells.add(SolverPool.get().submit(() -> solveCell(cc, dd, checkpoint)));
             }
         }
 
-        // Clean summary
-        System.out.printf("%n%s%n", header);
-        System.out.println("-".repeat(60));
-        for (String line : lines) System.out.println(line);
+        String header = String.format("%-6s  %-12s  %10s  %10s  %12s  %s",
+                                      "Game", "BestGuess", "AvgScore", "Confidence", "TotalEvals", "TrueRank");
+        try (BufferedWriter out = Files.newBufferedWriter(output)) {
+            out.write("c\td\tguess\trank\tavgScore\tconfidence\ttotalEvals\tfull");
+            out.newLine();
 
-        // Phase 2: full evaluation to get true rank for each best guess
-        System.out.printf("%n%-6s  %-12s  %s%n", "Game", "BestGuess", "TrueRank");
-        System.out.println("-".repeat(35));
-        long[][] trueRank = new long[10][10];
-        for (int c = 2; c <= 9; c++) {
-            for (int d = 2; d <= 9; d++) {
-                ExpectedSize expectedSize = new ExpectedSize(d);
-                int          totalCodes   = (int) Math.pow(c, d);
-                int          codeIndex    = ConvertCode.toIndex(c, d, bestCode[c][d]);
-                trueRank[c][d] = expectedSize.calcExpectedRankFirst(codeIndex, c, d, totalCodes, feedbackFreq);
-                System.out.printf("%-6s  %-12d  %d%n", c + "x" + d, bestCode[c][d], trueRank[c][d]);
+            System.out.printf("%n%s%n", header);
+            System.out.println("-".repeat(80));
+            for (ForkJoinTask<CellState> task : cells) {
+                CellState cell = task.join();
+                out.write(String.format("%d\t%d\t%d\t%d\t%.6f\t%.4f\t%d\t%b", cell.c, cell.d, cell.bestCode,
+                                        cell.trueRank, cell.avgScore, cell.confidence, cell.totalEvals,
+                                        cell.fullEval));
+                out.newLine();
+                System.out.printf("%-6s  %-12d  %10.4f  %9.2f%%  %12d  %d%s%n", cell.c + "x" + cell.d,
+                                  cell.bestCode, cell.avgScore, cell.confidence, cell.totalEvals, cell.trueRank,
+                                  cell.fullEval ? " (full)" : "");
             }
         }
+        System.out.println("Results written to " + output);
+    }
 
-        // Print switch snippet
-        System.out.println("\n// --- copy below into of(int c, int d) ---");
-        for (int c = 2; c <= 9; c++) {
-            System.out.printf("            case %d -> switch (d) {%n", c);
-            for (int d = 2; d <= 9; d++) {
-                System.out.printf("                case %d -> new long[]{%d, %dL};%n", d, bestCode[c][d],
-                                  trueRank[c][d]);
+    /**
+     * Find the best first guess of one game and its true rank, resuming from and
+     * saving to the cell's checkpoint.
+     */
+    static CellState solveCell(int c, int d, Path checkpoint) throws IOException {
+        ExpectedSize expectedSize = new ExpectedSize(d);
+        int[]        canonical    = CanonicalCode.enumerateCanonicalForms(c, d);
+        int          totalCodes   = (int) Math.pow(c, d);
+        CellState    state        = CellState.load(checkpoint, c, d, canonical.length);
+
+        // Phase 1: sample until the best candidate is ahead with enough confidence
+        while (state.phase == CellState.SAMPLING) {
+            int trials = evaluateTrials(canonical, c, d, totalCodes, state, expectedSize);
+            if (trials < trialCount(state, canonical.length, totalCodes)) {
+                state.save(checkpoint);
+                continue;
             }
-            System.out.printf(
-                    "                default -> throw new IllegalArgumentException(\"Unsupported game size: c=\" + c " +
-                            "+ \", d=\" + d);%n");
-            System.out.printf("            };%n");
+
+            Result result = summarize(state, canonical.length, totalCodes);
+            if (result.confidence < CONFIDENCE_THRESHOLD) {
+                state.restart(state.budget * BUDGET_MULTIPLIER);
+                System.out.printf("  [%dx%d] confidence %.2f%% too low, retrying with budget %d%n",
+                                  c, d, result.confidence, state.budget);
+            } else {
+                state.bestCode = ConvertCode.toCode(c, d, canonical[result.bestIdx]);
+                state.avgScore = result.avgScore;
+                state.confidence = result.confidence;
+                state.totalEvals = result.totalEvals;
+                state.fullEval = result.fullEval;
+                state.phase = CellState.RANKING;
+            }
+            state.save(checkpoint);
+        }
+
+        // Phase 2: full evaluation to get the true rank of the best guess
+        if (state.phase == CellState.RANKING) {
+            state.trueRank = fullRank(ConvertCode.toIndex(c, d, state.bestCode), c, d, totalCodes);
+            state.phase = CellState.DONE;
+            state.save(checkpoint);
+            System.out.printf("  [%dx%d] best %d, true rank %d%n", c, d, state.bestCode, state.trueRank);
         }
-        System.out.println("// --- copy above ---");
+        return state;
+    }
+
+    /** Number of trials a cell runs at its current budget. */
+    private static int trialCount(CellState state, int n, int totalCodes) {
+        return sampleSize(state.budget, n) >= totalCodes ? 1 : TRIALS;
     }
 
-    static Result evaluate(
-            int[] canonical, int c, int d, int totalCodes,
-            long budget, int[] feedbackFreq, ExpectedSize expectedSize
-    ) {
+    private static int sampleSize(long budget, int n) {
+        return Math.max(1, (int) (budget / TRIALS / n));
+    }
+
+    /**
+     * Run up to {@value #CHECKPOINT_TRIALS} more trials, adding each candidate's
+     * score to the sums of the state, with the candidates scored in parallel.
+     *
+     * @return number of trials completed so far at the current budget
+     */
+    private static int evaluateTrials(int[] canonical, int c, int d, int totalCodes, CellState state,
+                                      ExpectedSize expectedSize) {
         int     n          = canonical.length;
-        int     sampleSize = Math.max(1, (int) (budget / TRIALS / n));
+        int     sampleSize = sampleSize(state.budget, n);
         boolean fullEval   = sampleSize >= totalCodes;
         int     normSize   = fullEval ? totalCodes : sampleSize;
-        int     trials     = fullEval ? 1 : TRIALS;
+        int     trials     = trialCount(state, n, totalCodes);
+        int     until      = Math.min(trials, state.trialsDone + CHECKPOINT_TRIALS);
 
-        double[] sumScore  = new double[n];
-        double[] sumScore2 = new double[n];
+        for (; state.trialsDone < until; state.trialsDone++) {
+            int[]  s     = fullEval ? null : SampledCode.getSample(c, d, sampleSize);
+            long[] ranks = new long[n];
+            IntStream.range(0, n).parallel().forEach(i -> ranks[i] = fullEval
+                    ? expectedSize.calcExpectedRankFirst(canonical[i], c, d, totalCodes, new int[100])
+                    : expectedSize.calcExpectedRank(canonical[i], s, c, d, new int[100]));
 
-        for (int t = 0; t < trials; t++) {
-            int[] s = fullEval ? null : SampledCode.getSample(c, d, sampleSize);
             for (int i = 0; i < n; i++) {
-                long rank = fullEval
-                        ? expectedSize.calcExpectedRankFirst(canonical[i], c, d, totalCodes, feedbackFreq)
-                        : expectedSize.calcExpectedRank(canonical[i], s, c, d, feedbackFreq);
-                double score = rank / (double) normSize;
-                sumScore[i] += score;
-                sumScore2[i] += score * score;
+                double score = ranks[i] / (double) normSize;
+                state.sumScore[i] += score;
+                state.sumScore2[i] += score * score;
             }
         }
+        return state.trialsDone;
+    }
+
+    /** Pick the best candidate of the completed trials and its confidence against the runner-up. */
+    private static Result summarize(CellState state, int n, int totalCodes) {
+        double[] sumScore  = state.sumScore;
+        double[] sumScore2 = state.sumScore2;
+        int      trials    = state.trialsDone;
+        int      normSize  = Math.min(totalCodes, sampleSize(state.budget, n));
+        boolean  fullEval  = sampleSize(state.budget, n) >= totalCodes;
 
         int bestIdx = 0, secondIdx = -1;
         for (int i = 1; i < n; i++) {
@@ -130,37 +189,130 @@ final class BestFirstGuessCalculator {
             }
         }
 
-        double confidence;
-        if (fullEval || secondIdx == -1) {
-            confidence = 100.0;
-        } else {
-            double avg1   = sumScore[bestIdx] / trials;
-            double avg2   = sumScore[secondIdx] / trials;
-            double var1   = (sumScore2[bestIdx] / trials) - avg1 * avg1;
-            double var2   = (sumScore2[secondIdx] / trials) - avg2 * avg2;
-            double stdErr = Math.sqrt((var1 + var2) / trials);
-            double z      = (avg2 - avg1) / stdErr;
-            confidence = 100.0 * normalCDF(z);
-        }
+        double confidence = fullEval || secondIdx == -1 ? 100.0 : ScoreStatistics.confidenceLower(
+                sumScore[bestIdx], sumScore2[bestIdx], sumScore[secondIdx], sumScore2[secondIdx], trials);
 
         return new Result(bestIdx, sumScore[bestIdx] / trials, confidence,
                           (long) n * normSize * trials, fullEval);
     }
 
-    /** Approximation of the standard normal CDF using Horner's method (Abramowitz & Stegun 26.2.17). */
-    private static double normalCDF(double z) {
-        if (z < 0) return 1.0 - normalCDF(-z);
-        double t = 1.0 / (1.0 + 0.2316419 * z);
-        double poly = t * (0.319381530
-                                   + t * (-0.356563782
-                                                  + t * (1.781477937
-                                                                 + t * (-1.821255978
-                                                                                + t * 1.330274429))));
-        double pdf = Math.exp(-0.5 * z * z) / Math.sqrt(2 * Math.PI);
-        return 1.0 - pdf * poly;
+    /**
+     * Rank of a guess against every code, with the codes split into chunks counted
+     * in parallel. Same value as {@link ExpectedSize#calcExpectedRankFirst}.
+     */
+    static long fullRank(int guessInd, int c, int d, int totalCodes) {
+        CodeTable table       = CodeTable.of(c, d);
+        long      guessPacked = table.packed(guessInd);
+        long      guessColors = table.colors(guessInd);
+        int       chunks      = (totalCodes + CodeTable.RANGE_CHUNK - 1) / CodeTable.RANGE_CHUNK;
+
+        long[] freq = IntStream.range(0, chunks).parallel().mapToObj(chunk -> {
+            int    from      = chunk * CodeTable.RANGE_CHUNK;
+            int    to        = Math.min(totalCodes, from + CodeTable.RANGE_CHUNK);
+            int[]  feedbacks = new int[CodeTable.RANGE_CHUNK];
+            long[] counts    = new long[100];
+            table.getFeedbackRange(guessPacked, guessColors, from, to, feedbacks);
+            for (int j = 0; j < to - from; j++) counts[feedbacks[j]]++;
+            return counts;
+        }).reduce(new long[100], (a, b) -> {
+            long[] sum = new long[100];
+            for (int f = 0; f < 100; f++) sum[f] = a[f] + b[f];
+            return sum;
+        });
+
+        long rank = 0;
+        for (long f : freq) rank += f * f;
+        return rank;
     }
 
     record Result(int bestIdx, double avgScore, double confidence,
                   long totalEvals, boolean fullEval
     ) { }
+
+    /** Progress of one (c, d) cell, saved to and restored from its checkpoint file. */
+    static final class CellState {
+        static final int SAMPLING = 0;
+        static final int RANKING  = 1;
+        static final int DONE     = 2;
+
+        private static final int VERSION = 1;
+
+        final int      c;
+        final int      d;
+        final double[] sumScore;
+        final double[] sumScore2;
+        int            phase  = SAMPLING;
+        long           budget = TARGET_EVALS;
+        int            trialsDone;
+        int            bestCode;
+        double         avgScore;
+        double         confidence;
+        long           totalEvals;
+        boolean        fullEval;
+        long           trueRank;
+
+        CellState(int c, int d, int n) {
+            this.c = c;
+            this.d = d;
+            this.sumScore = new double[n];
+            this.sumScore2 = new double[n];
+        }
+
+        /** Drop the trials so far and start again with another budget. */
+        void restart(long newBudget) {
+            budget = newBudget;
+            trialsDone = 0;
+            Arrays.fill(sumScore, 0);
+            Arrays.fill(sumScore2, 0);
+        }
+
+        /** Read the checkpoint of a cell, or start afresh if there is none. */
+        static CellState load(Path checkpoint, int c, int d, int n) throws IOException {
+            CellState state = new CellState(c, d, n);
+            if (!Files.exists(checkpoint)) return state;
+
+            try (InputStream in = Files.newInputStream(checkpoint)) {
+                DataInputStream data = new DataInputStream(in);
+                if (data.readInt() != VERSION || data.readInt() != c || data.readInt() != d || data.readInt() != n)
+                    throw new IOException("Checkpoint " + checkpoint + " does not belong to this run.");
+                state.phase = data.readInt();
+                state.budget = data.readLong();
+                state.trialsDone = data.readInt();
+                for (int i = 0; i < n; i++) state.sumScore[i] = data.readDouble();
+                for (int i = 0; i < n; i++) state.sumScore2[i] = data.readDouble();
+                state.bestCode = data.readInt();
+                state.avgScore = data.readDouble();
+                state.confidence = data.readDouble();
+                state.totalEvals = data.readLong();
+                state.fullEval = data.readBoolean();
+                state.trueRank = data.readLong();
+            }
+            return state;
+        }
+
+        /** Write the checkpoint to a temporary file, then move it in place so a crash never leaves half of one. */
+        void save(Path checkpoint) throws IOException {
+            Path tmp = checkpoint.resolveSibling(checkpoint.getFileName() + ".tmp");
+            try (OutputStream out = Files.newOutputStream(tmp)) {
+                DataOutputStream data = new DataOutputStream(out);
+                data.writeInt(VERSION);
+                data.writeInt(c);
+                data.writeInt(d);
+                data.writeInt(sumScore.length);
+                data.writeInt(phase);
+                data.writeLong(budget);
+                data.writeInt(trialsDone);
+                for (double s : sumScore) data.writeDouble(s);
+                for (double s : sumScore2) data.writeDouble(s);
+                data.writeInt(bestCode);
+                data.writeDouble(avgScore);
+                data.writeDouble(confidence);
+                data.writeLong(totalEvals);
+                data.writeBoolean(fullEval);
+                data.writeLong(trueRank);
+                data.flush();
+            }
+            Files.move(tmp, checkpoint, StandardCopyOption.REPLACE_EXISTING, StandardCopyOption.ATOMIC_MOVE);
+        }
+    }
 }
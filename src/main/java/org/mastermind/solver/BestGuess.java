@@ -1,35 +1,80 @@
 package org.mastermind.solver;
 
+import org.mastermind.compute.ColorGroups;
 import org.mastermind.compute.ExpectedSize;
+import org.mastermind.compute.Feedback;
+import org.mastermind.compute.FeedbackMatrix;
+import org.mastermind.compute.MachineProfile;
+import org.mastermind.compute.SecretOrbits;
+import org.mastermind.compute.SolverPool;
+import org.mastermind.compute.SecretLanes;
 
-import java.util.ArrayList;
-import java.util.List;
-import java.util.concurrent.ExecutionException;
-import java.util.concurrent.ExecutorService;
-import java.util.concurrent.Executors;
-import java.util.concurrent.Future;
+import java.util.concurrent.RecursiveTask;
+import java.util.concurrent.atomic.AtomicLong;
 
 /**
  * Finds the best guess for Mastermind by searching through the space of all
  * candidate guesses and secrets to find the guess that minimizes the average
  * number of remaining solutions. Due to the nature of Mastermind, the search
- * space can be large. To optimize performance, one thread per available CPU is
- * created. Multi-threading is used when the search space exceeds a threshold,
- * which is a heuristic for when the algorithm would otherwise take longer than
- * 50 milliseconds to run.
+ * space can be large. To optimize performance, the search runs on the shared
+ * {@link SolverPool} when the search space exceeds a threshold, which is a
+ * heuristic for when the algorithm would otherwise take longer than 50
+ * milliseconds to run on this machine (see {@link MachineProfile}).
+ *
+ * <p>The parallel search is a tree of fork/join tasks over ranges of guesses.
+ * Ranges are always split down to a few dozen tasks per worker, and further
+ * only while workers run out of queued tasks, so idle workers can steal work
+ * from slow ones until the very end.
+ *
+ * <p>The feedback kernel used to score each guess can be chosen with
+ * {@link #setKernel(Kernel)}.
+ *
+ * <p>By default a guess is abandoned as soon as a lower bound of its rank exceeds
+ * the best rank found so far (see {@link ExpectedSize#calcExpectedRankBounded}).
+ * The best rank is shared by all threads through an {@link AtomicLong}, so every
+ * chunk is cut off by the best guess found in any chunk. A guess is only abandoned
+ * when it is strictly worse than an existing one, so the result, including which
+ * guess wins a tie, is the same as with full scoring.
+ *
+ * <p>When the secrets are the whole solution space, a {@link SecretOrbits} can be
+ * passed to score each guess against weighted secret representatives instead.
+ *
+ * <p>A {@link SearchControl} bounds the search by a deadline or lets another
+ * thread cancel it; the best guess scored until then is returned. The search
+ * reports its progress to the same control.
+ *
+ * <p>A guess already ranked against the same secrets, e.g. by
+ * {@link RetainedCandidates}, can be passed as an incumbent to bound the search
+ * before its first guess is scored.
  */
 public final class BestGuess {
-    private static final int             THREAD_COUNT       = Runtime.getRuntime().availableProcessors();
-    private static final ExecutorService POOL;
-    private static final long            PARALLEL_THRESHOLD = 3_000_000;
-
-    static {
-        POOL = Executors.newFixedThreadPool(THREAD_COUNT, r -> {
-            Thread t = new Thread(r);
-            t.setDaemon(true);
-            return t;
-        });
-    }
+    /** Minimum number of secrets before {@link Kernel#AUTO} pays for decoding them into lanes. */
+    private static final int  LANES_MIN_SECRETS  = 256;
+    /** Minimum secrets per possible color multiset before {@link Kernel#AUTO} groups them (measured). */
+    private static final int  GROUPS_MIN_RATIO   = 8;
+    /** Work (guesses × secrets) below which a task is never split. */
+    private static final long MIN_TASK_WORK      = 1 << 18;
+    /** Number of tasks per worker the search is always split into. */
+    private static final int  TASKS_PER_WORKER   = 32;
+    /** Number of guesses a worker scores between two progress reports. */
+    private static final int  PROGRESS_BATCH     = 64;
+
+    private static volatile Kernel  kernel     = Kernel.AUTO;
+    private static volatile boolean earlyAbort = true;
+
+    /**
+     * Select the feedback kernel used to score guesses.
+     *
+     * @param k kernel to use from now on
+     */
+    public static void setKernel(Kernel k) { kernel = k; }
+
+    /**
+     * Enable or disable abandoning guesses that can no longer beat the best one.
+     *
+     * @param enabled whether to score guesses against a shared bound (default true)
+     */
+    public static void setEarlyAbort(boolean enabled) { earlyAbort = enabled; }
 
     /**
      * Find the guess that will minimize the expected size of the solution space
@@ -42,83 +87,251 @@ public final class BestGuess {
      * @return long[] where [0]=best guess index, [1]=its rank (sum of squared partition sizes)
      */
     public static long[] findBestGuess(int[] guessesInd, int[] secretsInd, int c, int d) {
+        return findBestGuess(guessesInd, secretsInd, null, c, d, null);
+    }
+
+    /**
+     * Find the guess that will minimize the expected size of the solution space
+     * after guessing, scoring each guess against the weighted secrets of
+     * {@code orbits} whenever they compress the secrets for that guess.
+     *
+     * @param guessesInd all candidate guess indices (0-based, base-c encoding)
+     * @param secretsInd all remaining secret indices (0-based, base-c encoding)
+     * @param orbits     weighted view of the same secrets, or null
+     * @param c          number of colors (<= 9)
+     * @param d          number of digits
+     * @param control    deadline and cancellation of the search, or null to search all guesses
+     * @return long[] where [0]=best guess index, [1]=its rank (sum of squared partition sizes)
+     */
+    public static long[] findBestGuess(int[] guessesInd, int[] secretsInd, SecretOrbits orbits, int c, int d,
+                                       SearchControl control) {
+        return findBestGuess(guessesInd, secretsInd, orbits, c, d, control, null);
+    }
+
+    /**
+     * Find the guess that will minimize the expected size of the solution space
+     * after guessing, starting from a guess whose rank against the same secrets is
+     * already known (see {@link RetainedCandidates}).
+     *
+     * <p>The incumbent's rank bounds the search from the first guess. A candidate
+     * that ties or beats it is found exactly as without an incumbent; the incumbent
+     * itself is returned only when no candidate is as good, or when the search is
+     * stopped before any candidate reaches its rank.
+     *
+     * @param guessesInd all candidate guess indices (0-based, base-c encoding)
+     * @param secretsInd all remaining secret indices (0-based, base-c encoding)
+     * @param orbits     weighted view of the same secrets, or null
+     * @param c          number of colors (<= 9)
+     * @param d          number of digits
+     * @param control    deadline and cancellation of the search, or null to search all guesses
+     * @param incumbent  {guess index, rank against secretsInd}, or null
+     * @return long[] where [0]=best guess index, [1]=its rank (sum of squared partition sizes)
+     */
+    public static long[] findBestGuess(int[] guessesInd, int[] secretsInd, SecretOrbits orbits, int c, int d,
+                                       SearchControl control, long[] incumbent) {
+
+        ColorGroups groups     = prepareGroups(secretsInd, c, d);
+        SecretLanes lanes      = groups == null ? prepareLanes(secretsInd, c, d) : null;
+        AtomicLong  sharedBest = new AtomicLong(incumbent == null ? Long.MAX_VALUE : incumbent[1]);
+        if (incumbent != null && control != null) control.offerBest((int) incumbent[0], incumbent[1]);
 
         // Determine whether multi-threading is needed
-        if ((long) guessesInd.length * secretsInd.length < PARALLEL_THRESHOLD) {
-            return findBestGuessAlgorithm(guessesInd, secretsInd, c, d, 0, guessesInd.length);
+        long[] result;
+        if ((long) guessesInd.length * secretsInd.length < MachineProfile.current().parallelSearchThreshold()) {
+            result = findBestGuessAlgorithm(guessesInd, secretsInd, lanes, groups, orbits, control, c, d, 0,
+                                            guessesInd.length, sharedBest);
+        } else {
+            // Call the parallelized version of the algorithm
+            result = findBestGuessParallel(guessesInd, secretsInd, lanes, groups, orbits, control, c, d, sharedBest);
         }
 
-        // Call the parallelized version of the algorithm
-        return findBestGuessParallel(guessesInd, secretsInd, c, d);
+        // Candidates cut off by the incumbent only carry a lower bound of their rank
+        if (incumbent != null && (result[0] < 0 || result[1] > incumbent[1])) result = incumbent.clone();
+
+        if (control != null && control.keepsBestFeedbacks() && result[0] >= 0)
+            control.setBestFeedbacks(feedbacks((int) result[0], secretsInd, lanes, c, d));
+        return result;
+    }
+
+    /** Feedback of the guess against each secret, reading the already decoded lanes if any. */
+    private static byte[] feedbacks(int guessInd, int[] secretsInd, SecretLanes lanes, int c, int d) {
+        byte[]         feedbacks = new byte[secretsInd.length];
+        FeedbackMatrix matrix    = FeedbackMatrix.of(c, d);  // null for large games
+        if (lanes != null) {
+            lanes.getFeedbacks(guessInd, feedbacks);
+        } else if (matrix != null) {
+            for (int i = 0; i < secretsInd.length; i++) {
+                feedbacks[i] = (byte) matrix.getFeedback(guessInd, secretsInd[i]);
+            }
+        } else {
+            Feedback.getFeedbackBatch(guessInd, secretsInd, c, d, feedbacks);
+        }
+        return feedbacks;
     }
 
     // Provide a way to force specific algorithm choice for benchmarking
     public static long[] findBestGuess(int[] guessesInd, int[] secretsInd, int c, int d, boolean parallel) {
-        if (!parallel) return findBestGuessAlgorithm(guessesInd, secretsInd, c, d, 0, guessesInd.length);
-        return findBestGuessParallel(guessesInd, secretsInd, c, d);
+        ColorGroups groups = prepareGroups(secretsInd, c, d);
+        SecretLanes lanes  = groups == null ? prepareLanes(secretsInd, c, d) : null;
+        if (!parallel) return findBestGuessAlgorithm(guessesInd, secretsInd, lanes, groups, null, null, c, d, 0,
+                                                     guessesInd.length, new AtomicLong(Long.MAX_VALUE));
+        return findBestGuessParallel(guessesInd, secretsInd, lanes, groups, null, null, c, d,
+                                     new AtomicLong(Long.MAX_VALUE));
     }
 
-    private static long[] findBestGuessParallel(int[] guessesInd, int[] secretsInd, int c, int d) {
-
-        // Calculate the chunk size with ceil(guessesInd.length / THREAD_COUNT)
-        int chunkSize     = (guessesInd.length + THREAD_COUNT - 1) / THREAD_COUNT;
-        int actualThreads = (guessesInd.length + chunkSize - 1) / chunkSize;
-
-        // Initialize futures list (holder for pending thread outputs)
-        List<Future<long[]>> futures = new ArrayList<>(actualThreads);
+    /** Decode the secrets into lanes if the selected kernel uses them, otherwise return null. */
+    private static SecretLanes prepareLanes(int[] secretsInd, int c, int d) {
+        boolean useLanes = switch (kernel) {
+            case SCALAR, GROUPS -> false;
+            case LANES -> true;
+            case AUTO -> secretsInd.length >= LANES_MIN_SECRETS && FeedbackMatrix.of(c, d) == null;
+        };
+        return useLanes ? new SecretLanes(secretsInd, c, d) : null;
+    }
 
-        // Submit work to each threads
-        for (int t = 0; t < actualThreads; t++) {
-            final int from = t * chunkSize;
-            final int to   = Math.min(from + chunkSize, guessesInd.length);
-            futures.add(t, POOL.submit(() -> findBestGuessAlgorithm(guessesInd, secretsInd, c, d, from, to)));
-        }
+    /**
+     * Group the secrets by color multiset if the selected kernel uses them, otherwise return null.
+     * AUTO groups them when they are many times the possible multisets, so the groups hold many
+     * secrets each; with fewer, grouping costs more than it saves over lanes.
+     */
+    private static ColorGroups prepareGroups(int[] secretsInd, int c, int d) {
+        boolean useGroups = switch (kernel) {
+            case SCALAR, LANES -> false;
+            case GROUPS -> true;
+            case AUTO -> FeedbackMatrix.of(c, d) == null
+                         && secretsInd.length >= GROUPS_MIN_RATIO * ColorGroups.countMultisets(c, d);
+        };
+        return useGroups ? new ColorGroups(secretsInd, c, d) : null;
+    }
 
-        // Find best guess from returned result
-        int  bestGuessInd = -1;
-        long bestScore    = Long.MAX_VALUE;
+    private static long[] findBestGuessParallel(int[] guessesInd, int[] secretsInd, SecretLanes lanes,
+                                                ColorGroups groups, SecretOrbits orbits, SearchControl control,
+                                                int c, int d, AtomicLong sharedBest) {
 
-        for (Future<long[]> future : futures) {
-            try {
-                // Read the result
-                long[] result = future.get();
-
-                // Update best guess if found better score
-                if (result[1] < bestScore) {
-                    bestGuessInd = (int) result[0];
-                    bestScore = result[1];
-                }
-
-            } catch (InterruptedException e) {
-                Thread.currentThread().interrupt();
-                throw new RuntimeException("Interrupted while waiting for thread result", e);
-            } catch (ExecutionException e) {
-                throw new RuntimeException("Exception in worker thread", e.getCause());
-            }
-        }
+        // Always split down to this much work per task, so every worker gets many tasks
+        long totalWork  = (long) guessesInd.length * Math.max(1, secretsInd.length);
+        long coarseWork = totalWork / ((long) SolverPool.getParallelism() * TASKS_PER_WORKER);
 
-        return new long[] { bestGuessInd, bestScore };
+        SearchTask root = new SearchTask(guessesInd, secretsInd, lanes, groups, orbits, control, c, d, 0,
+                                         guessesInd.length, sharedBest, coarseWork);
+        return SolverPool.get().invoke(root);
     }
 
-    private static long[] findBestGuessAlgorithm(int[] guessesInd, int[] secretsInd, int c, int d, int start, int end) {
-        ExpectedSize expectedSizeObj = new ExpectedSize(d);
-        int[]        feedbackFreq    = new int[100];
+    private static long[] findBestGuessAlgorithm(int[] guessesInd, int[] secretsInd, SecretLanes lanes,
+                                                 ColorGroups groups, SecretOrbits orbits, SearchControl control,
+                                                 int c, int d, int start, int end, AtomicLong sharedBest) {
+        ExpectedSize   expectedSizeObj = new ExpectedSize(d);
+        FeedbackMatrix matrix          = lanes == null && groups == null ? FeedbackMatrix.of(c, d) : null;
+        int[]          feedbackFreq    = new int[100];
+        boolean        bounded         = earlyAbort;
 
         int  bestGuessInd = -1;
         long bestScore    = Long.MAX_VALUE;
+        int  evaluated    = 0;  // guesses scored and not yet reported to control
 
         for (int i = start; i < end; i++) {
-            // Compute rank
-            int  guessInd = guessesInd[i];
-            long score    = expectedSizeObj.calcExpectedRank(guessInd, secretsInd, c, d, feedbackFreq);
+            // Stop when told to, once any thread has scored a guess
+            if (control != null && control.shouldStop() && sharedBest.get() != Long.MAX_VALUE) break;
+
+            // Compute rank, giving up once it exceeds the best rank of any thread
+            int     guessInd = guessesInd[i];
+            long    bound    = bounded ? Math.min(bestScore, sharedBest.get()) : Long.MAX_VALUE;
+            int[][] weighted = orbits == null ? null : orbits.forGuess(guessInd);  // null if no compression
+            long    score;
+            if (weighted != null) score = expectedSizeObj.calcExpectedRankBounded(
+                    guessInd, weighted[0], weighted[1], orbits.size(), c, d, bound, feedbackFreq);
+            else if (lanes != null) score = expectedSizeObj.calcExpectedRankBounded(guessInd, lanes, bound, feedbackFreq);
+            else if (groups != null) score = expectedSizeObj.calcExpectedRankBounded(guessInd, groups, bound,
+                                                                                      feedbackFreq);
+            else if (matrix != null) score = expectedSizeObj.calcExpectedRankBounded(guessInd, secretsInd, matrix, bound,
+                                                                                      feedbackFreq);
+            else score = expectedSizeObj.calcExpectedRankBounded(guessInd, secretsInd, c, d, bound, feedbackFreq);
 
-            // Update result if found a smaller rank
+            // Update result if found a smaller rank, and publish it to the other threads
             if (score < bestScore) {
                 bestScore = score;
                 bestGuessInd = guessInd;
+                long previous = sharedBest.getAndAccumulate(score, Math::min);
+                if (control != null && score < previous) control.offerBest(guessInd, score);
+            }
+
+            // Report progress in batches
+            if (control != null && ++evaluated == PROGRESS_BATCH) {
+                control.addEvaluations(evaluated);
+                evaluated = 0;
             }
         }
+        if (control != null) control.addEvaluations(evaluated);
 
         return new long[] { bestGuessInd, bestScore };
     }
+
+    /** Search over the guesses {@code [from, to)}, splitting the range in halves. */
+    private static final class SearchTask extends RecursiveTask<long[]> {
+        private final int[]         guessesInd;
+        private final int[]         secretsInd;
+        private final SecretLanes   lanes;
+        private final ColorGroups   groups;
+        private final SecretOrbits  orbits;
+        private final SearchControl control;
+        private final int           c;
+        private final int           d;
+        private final int           from;
+        private final int           to;
+        private final AtomicLong    sharedBest;
+        private final long          coarseWork;
+
+        SearchTask(int[] guessesInd, int[] secretsInd, SecretLanes lanes, ColorGroups groups, SecretOrbits orbits,
+                   SearchControl control, int c, int d, int from, int to, AtomicLong sharedBest, long coarseWork) {
+            this.guessesInd = guessesInd;
+            this.secretsInd = secretsInd;
+            this.lanes = lanes;
+            this.groups = groups;
+            this.orbits = orbits;
+            this.control = control;
+            this.c = c;
+            this.d = d;
+            this.from = from;
+            this.to = to;
+            this.sharedBest = sharedBest;
+            this.coarseWork = coarseWork;
+        }
+
+        @Override
+        protected long[] compute() {
+            // Split large ranges, and smaller ones only while other workers may run dry
+            long work = (long) (to - from) * Math.max(1, secretsInd.length);
+            if (to - from > 1 && work > MIN_TASK_WORK && (work > coarseWork || getSurplusQueuedTaskCount() < 2)) {
+                int        mid   = (from + to) >>> 1;
+                SearchTask left  = new SearchTask(guessesInd, secretsInd, lanes, groups, orbits, control, c, d, from,
+                                                  mid, sharedBest, coarseWork);
+                SearchTask right = new SearchTask(guessesInd, secretsInd, lanes, groups, orbits, control, c, d, mid,
+                                                  to, sharedBest, coarseWork);
+                left.fork();
+                long[] rightResult = right.compute();
+                long[] leftResult  = left.join();
+
+                // On a tie, keep the guess that comes first
+                return rightResult[1] < leftResult[1] ? rightResult : leftResult;
+            }
+
+            return findBestGuessAlgorithm(guessesInd, secretsInd, lanes, groups, orbits, control, c, d, from,
+                                          to, sharedBest);
+        }
+    }
+
+    /** Feedback kernels available to score a guess against the secrets. */
+    public enum Kernel {
+        /**
+         * Without a feedback matrix: groups when the secrets far outnumber the color
+         * multisets, otherwise lanes for large secret lists. Scalar otherwise.
+         */
+        AUTO,
+        /** One secret at a time, through the game's FeedbackMatrix or CodeTable. */
+        SCALAR,
+        /** Many secrets per instruction, through {@link SecretLanes}. */
+        LANES,
+        /** Secrets grouped by color multiset, blacks + whites once per group, through {@link ColorGroups}. */
+        GROUPS
+    }
 }
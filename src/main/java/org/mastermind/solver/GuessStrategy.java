@@ -1,9 +1,15 @@
 package org.mastermind.solver;
 
-import org.mastermind.codes.AllValidCode;
+import org.mastermind.codes.CanonicalCode;
 import org.mastermind.codes.SampledCode;
+import org.mastermind.compute.ExpectedSize;
 import org.mastermind.compute.Feedback;
+import org.mastermind.compute.MachineProfile;
 import org.mastermind.compute.SolutionSpace;
+import org.mastermind.compute.SolverPool;
+
+import java.util.Arrays;
+import java.util.stream.IntStream;
 
 /**
  * Selects which arrays to pass as guesses and secrets to BestGuess for each turn.
@@ -17,12 +23,51 @@ import org.mastermind.compute.SolutionSpace;
  * <p>Edit this class to change strategy behavior. {@link #select} delegates to
  * {@code selectSearchSpace}, which cascades through size-reduction levels.
  *
- * <p>Threshold: {@code guesses.length × secrets.length} above which the
- * parallel BestGuess search exceeds ~1 second on the target machine.
+ * <p>Threshold: {@code guesses.length × secrets.length} the parallel BestGuess
+ * search evaluates within the target latency (1 second by default, see
+ * {@link #setTargetLatency(long)}), from the throughput this machine measured
+ * for its {@link MachineProfile}.
+ *
+ * <p>When every code fits as a guess, only one guess per symmetry class left by
+ * the past guesses is passed on (see {@link CanonicalCode#enumerateCanonicalGuesses}).
+ * All guesses of a class have the same expected size, and early in large games
+ * the classes are far fewer than the codes, so full guess sets fit sooner.
+ *
+ * <p>With {@link #setAdaptiveSampling(boolean)}, the sampled tiers race their
+ * candidate guesses before the search: every candidate is scored on a few small
+ * secret samples, those clearly worse than the leader are dropped (and at least
+ * half of them each round), and the samples double for the survivors until one
+ * is left or the tier's sample size is reached. BestGuess then only scores the
+ * survivors against a fresh sample of the tier's size.
  */
 public final class GuessStrategy {
 
-    private static final long THRESHOLD = 130_000_000L;
+    /** Secrets per trial in the first racing round. */
+    private static final int    RACE_FIRST_TRIAL = 32;
+    /** Trials per racing round, over which each candidate's score variance is measured. */
+    private static final int    RACE_TRIALS      = 8;
+    /** Confidence (%) that the leader is better above which a candidate is dropped. */
+    private static final double RACE_CONFIDENCE  = 99.0;
+
+    private static volatile boolean adaptive      = false;
+    private static volatile long    targetLatency = 1000;  // milliseconds
+
+    /**
+     * Enable or disable racing the candidates of the sampled tiers.
+     *
+     * @param enabled whether to narrow sampled guesses by racing them (default false)
+     */
+    public static void setAdaptiveSampling(boolean enabled) { adaptive = enabled; }
+
+    /**
+     * Set the time the search chosen by {@link #select} should take on this machine.
+     *
+     * @param millis target latency of a search, in milliseconds (default 1000)
+     */
+    public static void setTargetLatency(long millis) {
+        if (millis < 1) throw new IllegalArgumentException("Target latency must be at least 1 ms.");
+        targetLatency = millis;
+    }
 
     /**
      * Select the guesses and secrets arrays for the current turn.
@@ -33,18 +78,58 @@ public final class GuessStrategy {
      * @return int[][] where [0]=guesses, [1]=secrets
      */
     public static int[][] select(int c, int d, SolutionSpace solutionSpace) {
-        return selectSearchSpace(c, d, solutionSpace.getSize(), solutionSpace);
+        return select(c, d, solutionSpace, new int[0]);
+    }
+
+    /**
+     * Select the guesses and secrets arrays for the current turn, reducing the
+     * guesses by the symmetry left by the past guesses.
+     *
+     * @param c             number of colors
+     * @param d             number of digits
+     * @param solutionSpace current solution space
+     * @param pastGuesses   indices of the guesses made so far (0-based, base-c encoding)
+     * @return int[][] where [0]=guesses, [1]=secrets
+     */
+    public static int[][] select(int c, int d, SolutionSpace solutionSpace, int[] pastGuesses) {
+        return select(c, d, solutionSpace, pastGuesses, null);
+    }
+
+    /**
+     * Select the guesses and secrets arrays for the current turn, and report the
+     * chosen tier and array sizes to the search's progress. Once the control's
+     * deadline has passed or it is cancelled, the cheapest sampled tier is chosen
+     * and racing stops, so choosing the search space stays within the deadline too.
+     *
+     * @param c             number of colors
+     * @param d             number of digits
+     * @param solutionSpace current solution space
+     * @param pastGuesses   indices of the guesses made so far (0-based, base-c encoding)
+     * @param control       control of the search about to run, or null
+     * @return int[][] where [0]=guesses, [1]=secrets
+     */
+    public static int[][] select(int c, int d, SolutionSpace solutionSpace, int[] pastGuesses,
+                                 SearchControl control) {
+        return selectSearchSpace(c, d, solutionSpace.getSize(), solutionSpace, pastGuesses, control);
     }
 
     /**
      * Cascades through progressively smaller guess and secret arrays until the
      * search space fits within the threshold.
      */
-    private static int[][] selectSearchSpace(int c, int d, int secretsSize, SolutionSpace solutionSpace) {
+    private static int[][] selectSearchSpace(int c, int d, int secretsSize, SolutionSpace solutionSpace,
+                                             int[] pastGuesses, SearchControl control) {
+
+        // Past the deadline, take the cheapest search space without counting or racing
+        if (stopped(control)) return cheapest(c, d, solutionSpace, control);
 
-        if (fits((int) Math.pow(c, d), secretsSize))
-            return pair(AllValidCode.generateAllCodes(c, d), solutionSpace.getSecrets());
-        if (fits(secretsSize, secretsSize)) return pair(solutionSpace.getSecrets(), solutionSpace.getSecrets());
+        // One guess per symmetry class
+        if (canonicalFits(c, d, pastGuesses, threshold() / Math.max(1, secretsSize)))
+            return pair(Tier.CANONICAL_GUESSES, control, CanonicalCode.enumerateCanonicalGuesses(c, d, pastGuesses),
+                        solutionSpace.getSecrets());
+        if (fits(secretsSize, secretsSize))
+            return pair(Tier.SECRETS_AS_GUESSES, control, solutionSpace.getSecrets(), solutionSpace.getSecrets());
+        if (stopped(control)) return cheapest(c, d, solutionSpace, control);
 
         // Sample secrets with progressively looser tolerances (smaller sample = faster search).
         // Tolerance controls how accurately the sample estimates expected partition sizes;
@@ -52,7 +137,9 @@ public final class GuessStrategy {
         // When tolerance 10X, sample size 0.1X
         for (double tolerance : new double[] { 0.001, 0.005, 0.01 }) {  // 10X, 5X, 1X
             if (fits(secretsSize, secretSampleSize(d, tolerance))) {
-                return pair(solutionSpace.getSecrets(), secretSample(c, d, tolerance, solutionSpace));
+                int[] guesses = solutionSpace.getSecrets();
+                if (adaptive) guesses = race(guesses, c, d, solutionSpace, secretSampleSize(d, tolerance), control);
+                return pair(Tier.SAMPLED_SECRETS, control, guesses, secretSample(d, tolerance, solutionSpace));
             }
         }
 
@@ -60,23 +147,116 @@ public final class GuessStrategy {
         // (higher percentile = smaller sample needed, since a random element more likely falls
         // within a larger top portion of the distribution).
         // When percentile 10X, sample size ~0.1X
-        int[] sSample = secretSample(c, d, 0.01, solutionSpace);
+        int[] sSample = secretSample(d, 0.01, solutionSpace);
         for (double percentile : new double[] { 0.001, 0.005, 0.01, 0.05 }) {   // 50X, 10X, 5X, 1X
             if (fits(secretsSize, guessSampleSize(percentile))) {
-                return pair(guessSample(c, d, percentile), sSample);
+                int[] gSample = guessSample(c, d, percentile);
+                if (adaptive) gSample = race(gSample, c, d, solutionSpace, sSample.length, control);
+                return pair(Tier.SAMPLED_GUESSES, control, gSample, sSample);
             }
         }
 
-        return pair(guessSample(c, d, 0.01), sSample);
+        return pair(Tier.SAMPLED_GUESSES, control, guessSample(c, d, 0.01), sSample);
+    }
+
+    /** The smallest guess sample against the smallest secret sample, for a search already out of time. */
+    private static int[][] cheapest(int c, int d, SolutionSpace solutionSpace, SearchControl control) {
+        return pair(Tier.SAMPLED_GUESSES, control, guessSample(c, d, 0.05), secretSample(d, 0.01, solutionSpace));
+    }
+
+    private static boolean stopped(SearchControl control) {
+        return control != null && control.shouldStop();
+    }
+
+    /**
+     * Whether the canonical guesses number at most {@code maxGuesses}. When every
+     * code fits this is settled at once, and {@code c^d} over the symmetry order
+     * is a lower bound on the count that rules the tier out in most late turns of
+     * large games; only the rest is counted, and only up to {@code maxGuesses}.
+     */
+    private static boolean canonicalFits(int c, int d, int[] pastGuesses, long maxGuesses) {
+        long allCodes = (long) Math.pow(c, d);
+        if (allCodes <= maxGuesses) return true;
+        if (allCodes / CanonicalCode.symmetryOrder(c, d, pastGuesses) > maxGuesses) return false;
+        return CanonicalCode.countCanonicalGuesses(c, d, pastGuesses, maxGuesses) <= maxGuesses;
+    }
+
+    /**
+     * Race candidate guesses on growing secret samples (successive halving with a
+     * confidence test), as described in the class documentation.
+     *
+     * @param guesses       candidate guess indices
+     * @param solutionSpace current solution space, from which the secrets are sampled
+     * @param maxSample     size of the sample the survivors will be searched against
+     * @param control       control of the search about to run, whose deadline ends the race early; or null
+     * @return the surviving candidates, in their original order
+     */
+    static int[] race(int[] guesses, int c, int d, SolutionSpace solutionSpace, int maxSample,
+                      SearchControl control) {
+        ExpectedSize expectedSize = new ExpectedSize(d);
+        int          limit        = Math.min(maxSample, solutionSpace.getSize());
+        int[]        survivors    = guesses;
+        for (int trial = RACE_FIRST_TRIAL; survivors.length > 1 && trial * RACE_TRIALS < limit; trial *= 2) {
+            if (stopped(control)) break;
+            survivors = raceRound(survivors, c, d, solutionSpace, trial, expectedSize);
+        }
+        return survivors;
+    }
+
+    /** Score the candidates over one round of trials and keep those that may still win. */
+    private static int[] raceRound(int[] candidates, int c, int d, SolutionSpace solutionSpace, int trialSize,
+                                   ExpectedSize expectedSize) {
+        int      n      = candidates.length;
+        double   norm   = (double) trialSize * trialSize;
+        double[] sum    = new double[n];
+        double[] sum2   = new double[n];
+        int[]    sample = solutionSpace.getSample(trialSize * RACE_TRIALS);
+
+        // Score = estimated fraction of the secrets left after the guess, one per trial
+        for (int t = 0; t < RACE_TRIALS; t++) {
+            int[] secrets = Arrays.copyOfRange(sample, t * trialSize, (t + 1) * trialSize);
+            SolverPool.get().submit(() -> IntStream.range(0, n).parallel().forEach(i -> {
+                double score = expectedSize.calcExpectedRank(candidates[i], secrets, c, d, new int[100]) / norm;
+                sum[i] += score;
+                sum2[i] += score * score;
+            })).join();
+        }
+
+        // Drop the candidates clearly worse than the leader, and at least the worse half
+        int leader = 0;
+        for (int i = 1; i < n; i++) if (sum[i] < sum[leader]) leader = i;
+        double[] sorted = sum.clone();
+        Arrays.sort(sorted);
+        double cutoff = sorted[(n - 1) / 2];
+
+        int[] kept   = new int[n];
+        int   count  = 0;
+        int   others = (n + 1) / 2 - 1;  // candidates kept besides the leader
+        for (int i = 0; i < n; i++) {
+            if (i != leader) {
+                if (others == 0 || sum[i] > cutoff) continue;
+                if (ScoreStatistics.confidenceLower(sum[leader], sum2[leader], sum[i], sum2[i],
+                                                    RACE_TRIALS) >= RACE_CONFIDENCE) continue;
+                others--;
+            }
+            kept[count++] = candidates[i];
+        }
+        return Arrays.copyOf(kept, count);
     }
 
     /** Returns true if the guesses and secrets arrays fit within the threshold. */
     private static boolean fits(int guessSpaceSize, int secretSpaceSize) {
-        return (long) guessSpaceSize * secretSpaceSize <= THRESHOLD;
+        return (long) guessSpaceSize * secretSpaceSize <= threshold();
+    }
+
+    /** Returns guesses × secrets that fit within the target latency. */
+    private static long threshold() {
+        return MachineProfile.current().searchBudget(targetLatency);
     }
 
-    /** Pack the input guesses and secrets into int[][] */
-    private static int[][] pair(int[] guesses, int[] secrets) {
+    /** Pack the input guesses and secrets into int[][], reporting the tier if a search is watching */
+    private static int[][] pair(Tier tier, SearchControl control, int[] guesses, int[] secrets) {
+        if (control != null) control.setSearchSpace(tier, guesses.length, secrets.length);
         return new int[][] { guesses, secrets };
     }
 
@@ -88,12 +268,28 @@ public final class GuessStrategy {
         return SampledCode.calcSampleSizeForGuesses(percentileThreshold, 0.999);
     }
 
-    private static int[] secretSample(int c, int d, double tolerance, SolutionSpace solutionSpace) {
-        return SampledCode.getValidSample(solutionSpace.getRemaining(), solutionSpace.getSize(), c, d,
-                                          secretSampleSize(d, tolerance));
+    private static int[] secretSample(int d, double tolerance, SolutionSpace solutionSpace) {
+        return solutionSpace.getSample(secretSampleSize(d, tolerance));
     }
 
     private static int[] guessSample(int c, int d, double percentileThreshold) {
         return SampledCode.getSample(c, d, guessSampleSize(percentileThreshold));
     }
+
+    /** Search space tiers, from the most to the least exhaustive. */
+    public enum Tier {
+        /** One guess per symmetry class against all remaining secrets. */
+        CANONICAL_GUESSES,
+        /** Remaining secrets as guesses, against all remaining secrets. */
+        SECRETS_AS_GUESSES,
+        /** Remaining secrets as guesses, against a sample of the secrets. */
+        SAMPLED_SECRETS,
+        /** A sample of all codes as guesses, against a sample of the secrets. */
+        SAMPLED_GUESSES;
+
+        /** @return {@code true} if the tier scores its guesses against every remaining secret */
+        public boolean scoresAllSecrets() {
+            return this == CANONICAL_GUESSES || this == SECRETS_AS_GUESSES;
+        }
+    }
 }
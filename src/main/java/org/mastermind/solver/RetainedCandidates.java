@@ -0,0 +1,151 @@
+package org.mastermind.solver;
+
+import org.mastermind.compute.CodeTable;
+import org.mastermind.compute.FeedbackMatrix;
+import org.mastermind.compute.SolutionSpace;
+
+import java.util.Arrays;
+
+/**
+ * Feedback histograms of a few strong guesses, kept up to date across turns.
+ *
+ * <p>The histogram of a guess counts, for each feedback, the secrets of the
+ * solution space that give it. Filtering the solution space only removes
+ * secrets, so after {@link SolutionSpace#filterSolution} the histogram changes
+ * by exactly the secrets that were eliminated. {@link #update} subtracts those,
+ * or counts the kept secrets from scratch when they are the fewer, so the
+ * retained guesses are re-ranked for the next turn for a fraction of the cost
+ * of scoring them again.
+ *
+ * <p>The best retained guess is then passed to {@link BestGuess} as an
+ * incumbent, whose exact rank cuts other guesses off from the first one.
+ *
+ * <p>The histograms always count the whole solution space, so the ranks are
+ * only comparable with a search that scores guesses against all remaining
+ * secrets.
+ */
+public final class RetainedCandidates {
+    private final int     c;
+    private final int     d;
+    private final int     capacity;
+    private       int[]   guesses    = new int[0];
+    private       int[][] histograms = new int[0][];
+    private       int[]   secrets    = new int[0];  // secrets counted by the histograms
+
+    /**
+     * @param c        number of colors (<= 9)
+     * @param d        number of digits (<= 9)
+     * @param capacity maximum number of guesses retained (0 retains nothing)
+     */
+    public RetainedCandidates(int c, int d, int capacity) {
+        if (capacity < 0) throw new IllegalArgumentException("capacity must not be negative.");
+        this.c = c;
+        this.d = d;
+        this.capacity = capacity;
+    }
+
+    /**
+     * Retain the last {@code capacity} distinct guesses of {@code guessesInd}.
+     * Histograms of guesses already retained are reused, the others are counted
+     * against {@code secretsInd}.
+     *
+     * @param guessesInd guess indices (0-based, base-c encoding), the most valuable last
+     * @param secretsInd all secrets of the current solution space, in increasing order
+     */
+    public void retain(int[] guessesInd, int[] secretsInd) {
+        int[]   newGuesses    = new int[Math.min(capacity, guessesInd.length)];
+        int[][] newHistograms = new int[newGuesses.length][];
+        int     count         = 0;
+        boolean sameSecrets   = Arrays.equals(secrets, secretsInd);
+
+        for (int i = guessesInd.length - 1; i >= 0 && count < newGuesses.length; i--) {
+            int guessInd = guessesInd[i];
+            if (indexOf(newGuesses, count, guessInd) >= 0) continue;
+
+            int   old       = sameSecrets ? indexOf(guesses, guesses.length, guessInd) : -1;
+            int[] histogram = old >= 0 ? histograms[old] : new int[100];
+            if (old < 0) count(guessInd, secretsInd, histogram, 1);
+
+            newGuesses[count] = guessInd;
+            newHistograms[count++] = histogram;
+        }
+
+        guesses = Arrays.copyOf(newGuesses, count);
+        histograms = Arrays.copyOf(newHistograms, count);
+        secrets = secretsInd;
+    }
+
+    /**
+     * Bring the histograms up to date with a solution space that was filtered
+     * since the last {@link #retain} or {@code update}.
+     *
+     * @param solutionSpace the filtered solution space
+     */
+    public void update(SolutionSpace solutionSpace) {
+        if (guesses.length == 0) return;
+
+        // Split the secrets counted so far into the kept and the eliminated ones
+        int[] kept    = new int[solutionSpace.getSize()];
+        int[] removed = new int[secrets.length - kept.length];
+        int   k       = 0;
+        int   r       = 0;
+        for (int secretInd : secrets) {
+            if (solutionSpace.contains(secretInd)) kept[k++] = secretInd;
+            else removed[r++] = secretInd;
+        }
+
+        for (int i = 0; i < guesses.length; i++) {
+            if (r <= k) {
+                count(guesses[i], removed, histograms[i], -1);
+            } else {
+                Arrays.fill(histograms[i], 0);
+                count(guesses[i], kept, histograms[i], 1);
+            }
+        }
+        secrets = kept;
+    }
+
+    /**
+     * @return long[] where [0]=retained guess of smallest rank (the first retained on
+     *         a tie), [1]=its rank against the whole solution space; or null if no
+     *         guess is retained
+     */
+    public long[] best() {
+        long[] best = null;
+        for (int i = 0; i < guesses.length; i++) {
+            long rank = 0;
+            for (int freq : histograms[i]) rank += (long) freq * freq;
+            if (best == null || rank < best[1]) best = new long[] { guesses[i], rank };
+        }
+        return best;
+    }
+
+    /** Forget every retained guess, e.g. when the solution space is rebuilt. */
+    public void clear() {
+        guesses = new int[0];
+        histograms = new int[0][];
+        secrets = new int[0];
+    }
+
+    /** @return number of guesses retained */
+    public int size() { return guesses.length; }
+
+    /** Add {@code delta} to the histogram bin of the feedback of each secret with the guess. */
+    private void count(int guessInd, int[] secretsInd, int[] histogram, int delta) {
+        FeedbackMatrix matrix = FeedbackMatrix.of(c, d);  // null for large games
+        if (matrix != null) {
+            for (int secretInd : secretsInd) histogram[matrix.getFeedback(guessInd, secretInd)] += delta;
+            return;
+        }
+
+        CodeTable table       = CodeTable.of(c, d);
+        long      guessPacked = table.packed(guessInd);
+        long      guessColors = table.colors(guessInd);
+        for (int secretInd : secretsInd) histogram[table.getFeedback(guessPacked, guessColors, secretInd)] += delta;
+    }
+
+    private static int indexOf(int[] array, int length, int value) {
+        for (int i = 0; i < length; i++) if (array[i] == value) return i;
+        return -1;
+    }
+}
@@ -0,0 +1,44 @@
+package org.mastermind.solver;
+
+/**
+ * Compares the scores of two candidates measured over the same independent
+ * trials (e.g. random secret samples), by a normal approximation of the
+ * difference of their means.
+ */
+final class ScoreStatistics {
+
+    /**
+     * Confidence that candidate A has the lower true mean score.
+     *
+     * @param sumA   sum of A's scores over the trials
+     * @param sum2A  sum of A's squared scores
+     * @param sumB   sum of B's scores over the same trials
+     * @param sum2B  sum of B's squared scores
+     * @param trials number of trials
+     * @return confidence in percent, 50 when the scores cannot be told apart
+     */
+    static double confidenceLower(double sumA, double sum2A, double sumB, double sum2B, int trials) {
+        double avgA   = sumA / trials;
+        double avgB   = sumB / trials;
+        double varA   = (sum2A / trials) - avgA * avgA;
+        double varB   = (sum2B / trials) - avgB * avgB;
+        double stdErr = Math.sqrt(Math.max(0, varA + varB) / trials);
+        if (stdErr == 0) return avgA < avgB ? 100.0 : avgA > avgB ? 0.0 : 50.0;
+
+        double z = (avgB - avgA) / stdErr;
+        return 100.0 * normalCDF(z);
+    }
+
+    /** Approximation of the standard normal CDF using Horner's method (Abramowitz & Stegun 26.2.17). */
+    static double normalCDF(double z) {
+        if (z < 0) return 1.0 - normalCDF(-z);
+        double t = 1.0 / (1.0 + 0.2316419 * z);
+        double poly = t * (0.319381530
+                                   + t * (-0.356563782
+                                                  + t * (1.781477937
+                                                                 + t * (-1.821255978
+                                                                                + t * 1.330274429))));
+        double pdf = Math.exp(-0.5 * z * z) / Math.sqrt(2 * Math.PI);
+        return 1.0 - pdf * poly;
+    }
+}
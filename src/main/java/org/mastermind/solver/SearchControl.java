@@ -0,0 +1,119 @@
+package org.mastermind.solver;
+
+import java.util.Arrays;
+import java.util.concurrent.atomic.LongAdder;
+
+/**
+ * Deadline, cancellation flag and progress of a running guess search.
+ *
+ * <p>{@link BestGuess} checks {@link #shouldStop()} before scoring each guess,
+ * and once it returns true every worker stops and the best guess scored so far
+ * is returned. At least one guess is always scored, so a search stopped early
+ * still returns a valid guess. {@link #cancel()} can be called from any thread.
+ *
+ * <p>The search also reports its progress here: the tier chosen by
+ * {@link GuessStrategy}, the number of guesses scored (added in batches by each
+ * worker) and each new overall best guess. {@link #progress()} takes a snapshot
+ * from any thread, and {@link #bestGuesses()} lists every guess that was the
+ * best when it was found. None of this touches the per-secret loops.
+ *
+ * <p>When asked with {@link #keepBestFeedbacks()}, the search also leaves the
+ * feedback of the guess it returns against every secret it scored, so that
+ * recording that guess does not compute them again.
+ */
+public final class SearchControl {
+    private final    long      deadline;     // System.nanoTime() value at which to stop
+    private final    boolean   hasDeadline;
+    private final    long      startTime   = System.nanoTime();
+    private final    LongAdder evaluations = new LongAdder();
+    private volatile boolean   cancelled;
+    private volatile boolean   keepFeedbacks;
+
+    // Search space and best guess so far, guarded by this
+    private GuessStrategy.Tier tier;
+    private int                guesses;
+    private int                secrets;
+    private int                bestGuess   = -1;
+    private long               bestRank    = Long.MAX_VALUE;
+    private int[]              bestGuesses = new int[8];  // every new best guess, in the order found
+    private int                bestCount;
+    private byte[]             bestFeedbacks;  // feedback of the returned guess against each secret
+
+    private SearchControl(long deadline, boolean hasDeadline) {
+        this.deadline = deadline;
+        this.hasDeadline = hasDeadline;
+    }
+
+    /** @return a control that only stops when cancelled */
+    public static SearchControl unlimited() {
+        return new SearchControl(0, false);
+    }
+
+    /**
+     * @param timeoutMillis time allowed from now, in milliseconds
+     * @return a control that stops when the time is up or when cancelled
+     */
+    public static SearchControl withTimeout(long timeoutMillis) {
+        return new SearchControl(System.nanoTime() + timeoutMillis * 1_000_000L, true);
+    }
+
+    /** Ask the search to stop and return the best guess found so far. */
+    public void cancel() { cancelled = true; }
+
+    /** @return {@code true} if {@link #cancel()} was called */
+    public boolean isCancelled() { return cancelled; }
+
+    /** @return {@code true} if the search was cancelled or its deadline has passed */
+    public boolean shouldStop() {
+        return cancelled || (hasDeadline && System.nanoTime() - deadline >= 0);
+    }
+
+    /**
+     * Record the search space about to be searched.
+     *
+     * @param tier    tier chosen by {@link GuessStrategy}
+     * @param guesses number of candidate guesses
+     * @param secrets number of secrets each guess is scored against
+     */
+    public synchronized void setSearchSpace(GuessStrategy.Tier tier, int guesses, int secrets) {
+        this.tier = tier;
+        this.guesses = guesses;
+        this.secrets = secrets;
+    }
+
+    /** @param n number of guesses just scored */
+    void addEvaluations(long n) { evaluations.add(n); }
+
+    /** Record a guess if it beats the best one reported so far. */
+    synchronized void offerBest(int guessInd, long rank) {
+        if (rank < bestRank) {
+            bestRank = rank;
+            bestGuess = guessInd;
+            if (bestCount == bestGuesses.length) bestGuesses = Arrays.copyOf(bestGuesses, bestCount * 2);
+            bestGuesses[bestCount++] = guessInd;
+        }
+    }
+
+    /** @return every guess that was the best so far when found, the best one last */
+    public synchronized int[] bestGuesses() { return Arrays.copyOf(bestGuesses, bestCount); }
+
+    /** Ask the search to keep the feedbacks of the guess it returns (see {@link #bestFeedbacks()}). */
+    public void keepBestFeedbacks() { keepFeedbacks = true; }
+
+    /** @return {@code true} if {@link #keepBestFeedbacks()} was called */
+    boolean keepsBestFeedbacks() { return keepFeedbacks; }
+
+    synchronized void setBestFeedbacks(byte[] feedbacks) { bestFeedbacks = feedbacks; }
+
+    /**
+     * @return feedback of the returned guess against each scored secret, in the order
+     *         of the secrets; or null if not kept
+     */
+    public synchronized byte[] bestFeedbacks() { return bestFeedbacks; }
+
+    /** @return snapshot of the search progress */
+    public synchronized SearchProgress progress() {
+        return new SearchProgress(tier, guesses, secrets, evaluations.sum(), bestGuess, bestRank,
+                                  System.nanoTime() - startTime);
+    }
+}
@@ -0,0 +1,15 @@
+package org.mastermind.solver;
+
+/**
+ * Snapshot of a running guess search, for live display.
+ *
+ * @param tier         search space chosen by {@link GuessStrategy}, or null before it is chosen
+ * @param guesses      number of candidate guesses in the search space
+ * @param secrets      number of secrets each guess is scored against
+ * @param evaluations  number of candidate guesses scored so far
+ * @param bestGuess    best guess found so far (0-based, base-c encoding), or -1
+ * @param bestRank     rank of the best guess found so far, or {@link Long#MAX_VALUE}
+ * @param elapsedNanos time since the search started, in nanoseconds
+ */
+public record SearchProgress(GuessStrategy.Tier tier, int guesses, int secrets, long evaluations, int bestGuess,
+                             long bestRank, long elapsedNanos) { }
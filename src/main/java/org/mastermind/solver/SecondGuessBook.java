@@ -0,0 +1,124 @@
+package org.mastermind.solver;
+
+import java.io.BufferedReader;
+import java.io.IOException;
+import java.io.InputStream;
+import java.io.InputStreamReader;
+import java.io.Reader;
+import java.io.UncheckedIOException;
+import java.nio.charset.StandardCharsets;
+import java.util.HashMap;
+import java.util.Map;
+
+/**
+ * Precomputed best second guesses, looked up by the feedback to the first guess.
+ *
+ * <p>On large games the second suggestion is the most expensive search of the
+ * game, but it only depends on the size of the game and the feedback to the
+ * first guess of {@link BestFirstGuess}. The book stores its answer for every
+ * such feedback in the resource file {@value #RESOURCE}, generated offline by
+ * {@link SecondGuessBookGenerator}, so that turn two becomes a table lookup.
+ *
+ * <p>The file is plain text. Lines starting with {@code #} are comments, the
+ * first other line is {@code version <n>}, and each entry line reads
+ * {@code c d firstGuess feedback secondGuess rank secrets tier}, with guesses as
+ * codes (e.g. 1123). {@code tier} is the {@link GuessStrategy.Tier} the entry was
+ * searched with, and {@code rank} is against {@code secrets} secrets: every
+ * remaining secret for the exhaustive tiers, a sample of them otherwise. The
+ * resource is read on first use. A book of another version, or an
+ * entry whose first guess is no longer the one {@link BestFirstGuess} suggests,
+ * is ignored and the session falls back to searching.
+ */
+public final class SecondGuessBook {
+    /** Format version of the book; bump when entries must be regenerated. */
+    static final int    VERSION  = 2;
+    /** Name of the book resource, relative to this class. */
+    static final String RESOURCE = "second-guess-book.txt";
+
+    private static volatile boolean enabled = true;
+
+    /**
+     * Look up the best second guess of a game.
+     *
+     * @param c          number of colors (2–9)
+     * @param d          number of digits (1–9)
+     * @param firstGuess code of the first guess (e.g. 1123)
+     * @param feedback   feedback to the first guess (black*10 + white)
+     * @return long[3] where [0] = best second guess code, [1] = its rank, [2] = number of
+     *         secrets the rank is against; or null if the book has no entry or is disabled
+     */
+    public static long[] of(int c, int d, int firstGuess, int feedback) {
+        if (!enabled) return null;
+
+        long[] entry = Holder.ENTRIES.get(key(c, d, feedback));
+        if (entry == null || entry[0] != firstGuess) return null;
+        return new long[] { entry[1], entry[2], entry[3] };
+    }
+
+    /**
+     * Enable or disable lookups in the book (enabled by default).
+     *
+     * @param enable {@code true} to let {@link #of} return book entries
+     */
+    public static void setEnabled(boolean enable) { enabled = enable; }
+
+    /**
+     * Parse a book, keeping only the entries whose first guess is still the one
+     * of {@link BestFirstGuess}.
+     *
+     * @param reader text of the book
+     * @return entries by {@link #key}, each {firstGuess, secondGuess, rank, secrets}; empty
+     *         if the book is of another version
+     * @throws IllegalArgumentException if a line is malformed
+     */
+    static Map<Integer, long[]> parse(Reader reader) throws IOException {
+        Map<Integer, long[]> entries = new HashMap<>();
+        BufferedReader       lines   = new BufferedReader(reader);
+        boolean              header  = true;
+
+        for (String line = lines.readLine(); line != null; line = lines.readLine()) {
+            line = line.strip();
+            if (line.isEmpty() || line.startsWith("#")) continue;
+
+            String[] fields = line.split("\\s+");
+            if (header) {
+                if (fields.length != 2 || !fields[0].equals("version"))
+                    throw new IllegalArgumentException("Missing version line in second guess book: " + line);
+                if (Integer.parseInt(fields[1]) != VERSION) return entries;
+                header = false;
+                continue;
+            }
+
+            if (fields.length != 8) throw new IllegalArgumentException("Malformed second guess book entry: " + line);
+            GuessStrategy.Tier.valueOf(fields[7]);  // rejects unknown tiers
+            int  c          = Integer.parseInt(fields[0]);
+            int  d          = Integer.parseInt(fields[1]);
+            long firstGuess = Long.parseLong(fields[2]);
+            if (firstGuess != BestFirstGuess.of(c, d)[0]) continue;
+
+            entries.put(key(c, d, Integer.parseInt(fields[3])), new long[] {
+                    firstGuess, Long.parseLong(fields[4]), Long.parseLong(fields[5]), Long.parseLong(fields[6])
+            });
+        }
+        return entries;
+    }
+
+    /** Key of an entry: c, d and the two feedback digits. */
+    static int key(int c, int d, int feedback) {
+        return (c * 10 + d) * 100 + feedback;
+    }
+
+    /** Holds the entries of the resource, read when first accessed. */
+    private static final class Holder {
+        static final Map<Integer, long[]> ENTRIES = load();
+
+        private static Map<Integer, long[]> load() {
+            try (InputStream in = SecondGuessBook.class.getResourceAsStream(RESOURCE)) {
+                if (in == null) return Map.of();
+                return parse(new InputStreamReader(in, StandardCharsets.UTF_8));
+            } catch (IOException e) {
+                throw new UncheckedIOException(e);
+            }
+        }
+    }
+}
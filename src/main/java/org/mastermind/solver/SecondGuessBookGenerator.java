@@ -0,0 +1,169 @@
+package org.mastermind.solver;
+
+import org.mastermind.codes.CanonicalCode;
+import org.mastermind.codes.ConvertCode;
+import org.mastermind.compute.Feedback;
+import org.mastermind.compute.SecretOrbits;
+import org.mastermind.compute.SolutionSpace;
+
+import java.io.IOException;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.nio.file.StandardCopyOption;
+import java.util.ArrayList;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+
+/**
+ * Offline generator of the resource file read by {@link SecondGuessBook}.
+ * Not used at runtime — run main() after algorithm changes or a change of
+ * {@link BestFirstGuess}, then bump {@link SecondGuessBook#VERSION} if the
+ * format changed.
+ *
+ * <p>Usage: {@code SecondGuessBookGenerator [output [checkpointDir [CxD ...]]]},
+ * e.g. {@code SecondGuessBookGenerator book.txt book-checkpoints 6x4 8x5}, by
+ * default the book resource and {@code second-guess-checkpoints}. Without games,
+ * every game from 2x2 to 9x9 is generated. The jar build copies the resource in.
+ * The {@code mastermind.book.latency} system property sets another target latency
+ * for the sampled searches, in milliseconds, for machines where the default would
+ * take too long.
+ *
+ * <p>Games of at most {@value #EXHAUSTIVE_WORK} guesses × codes get exhaustive
+ * entries: one guess per symmetry class left by the first guess, against every
+ * remaining secret. This is what the session itself searches whenever that fits
+ * its time budget, so these games get the same second guess with or without the
+ * book. Larger games go through {@link GuessStrategy} with candidate racing and a
+ * target latency of {@value #SAMPLED_LATENCY_MS} ms per search, far more than a
+ * live session allows, and the tier and sample size it chose are recorded with
+ * each entry.
+ *
+ * <p>Each finished entry is saved to the game's checkpoint file (written to a
+ * temporary file, then moved in place), so an interrupted run resumes with the
+ * entries it has not computed yet when started again with the same checkpoint
+ * directory, as {@link BestFirstGuessCalculator} does.
+ */
+final class SecondGuessBookGenerator {
+
+    private static final String DEFAULT_OUTPUT      = "src/main/resources/org/mastermind/solver/"
+            + SecondGuessBook.RESOURCE;
+    private static final String DEFAULT_CHECKPOINTS = "second-guess-checkpoints";
+
+    /** Largest guesses × codes of a game whose entries are all exhaustive searches. */
+    static final long EXHAUSTIVE_WORK = 30_000_000_000L;
+    /** Default target latency of each sampled search, in milliseconds. */
+    static final long SAMPLED_LATENCY_MS = 600_000;
+
+    public static void main(String[] args) throws IOException {
+        Path        output        = Path.of(args.length > 0 ? args[0] : DEFAULT_OUTPUT);
+        Path        checkpointDir = Path.of(args.length > 1 ? args[1] : DEFAULT_CHECKPOINTS);
+        List<int[]> games         = new ArrayList<>();
+        for (int i = 2; i < args.length; i++) {
+            String[] game = args[i].split("x");
+            games.add(new int[] { Integer.parseInt(game[0]), Integer.parseInt(game[1]) });
+        }
+        if (games.isEmpty()) {
+            for (int c = 2; c <= 9; c++) {
+                for (int d = 2; d <= 9; d++) games.add(new int[] { c, d });
+            }
+        }
+        Files.createDirectories(checkpointDir);
+        GuessStrategy.setAdaptiveSampling(true);
+        GuessStrategy.setTargetLatency(Long.getLong("mastermind.book.latency", SAMPLED_LATENCY_MS));
+
+        List<String> lines = new ArrayList<>();
+        lines.add("# Best second guess after the first guess of BestFirstGuess, by feedback to the first guess.");
+        lines.add("# Generated by SecondGuessBookGenerator, do not edit by hand.");
+        lines.add("# c d firstGuess feedback secondGuess rank secrets tier");
+        lines.add("version " + SecondGuessBook.VERSION);
+        for (int[] game : games) {
+            lines.addAll(entries(game[0], game[1], checkpointDir.resolve(game[0] + "x" + game[1] + ".book")));
+        }
+
+        Files.write(output, lines);
+        System.out.println("Wrote " + output);
+    }
+
+    /** @return the book lines of one game, one per feedback that leaves at least two secrets */
+    static List<String> entries(int c, int d) {
+        try {
+            return entries(c, d, null);
+        } catch (IOException e) {
+            throw new IllegalStateException(e);  // nothing is read or written without a checkpoint
+        }
+    }
+
+    /**
+     * Compute the book lines of one game, resuming from and saving to its checkpoint.
+     *
+     * @param checkpoint file of the lines computed so far, or null to keep none
+     * @return the book lines of the game, one per feedback that leaves at least two secrets
+     */
+    static List<String> entries(int c, int d, Path checkpoint) throws IOException {
+        int     firstGuess = (int) BestFirstGuess.of(c, d)[0];
+        int[]   past       = { ConvertCode.toIndex(c, d, firstGuess) };
+        int[]   guesses    = CanonicalCode.enumerateCanonicalGuesses(c, d, past);
+        boolean exhaustive = (long) guesses.length * (long) Math.pow(c, d) <= EXHAUSTIVE_WORK;
+
+        // Lines of a previous run, by feedback
+        Map<Integer, String> done = new LinkedHashMap<>();
+        if (checkpoint != null && Files.exists(checkpoint)) {
+            for (String line : Files.readAllLines(checkpoint)) done.put(Integer.parseInt(line.split(" ")[3]), line);
+        }
+
+        List<String> lines = new ArrayList<>();
+        for (int feedback : Feedback.enumerateFeedback(d)) {
+            if (feedback == d * 10) continue;
+            if (done.containsKey(feedback)) {
+                lines.add(done.get(feedback));
+                continue;
+            }
+
+            SolutionSpace space = new SolutionSpace(c, d);
+            space.filterSolution(past[0], feedback);
+            if (space.getSize() < 2) continue;  // the session answers these without searching
+
+            long   start = System.nanoTime();
+            String line  = exhaustive ? exhaustiveEntry(c, d, past, guesses, feedback, space)
+                                      : sampledEntry(c, d, past, feedback, space);
+            lines.add(line);
+            if (checkpoint != null) save(checkpoint, lines);
+            System.out.printf("%-60s  (%d secrets, %.1fs)%n", line, space.getSize(),
+                              (System.nanoTime() - start) / 1e9);
+        }
+        return lines;
+    }
+
+    /** Every canonical guess against every remaining secret. */
+    private static String exhaustiveEntry(int c, int d, int[] past, int[] guesses, int feedback,
+                                          SolutionSpace space) {
+        SecretOrbits orbits = new SecretOrbits(space, CanonicalCode.unusedColors(c, d, past), c, d);
+        long[]       best   = BestGuess.findBestGuess(guesses, space.getSecrets(), orbits, c, d, null);
+        return line(c, d, past[0], feedback, best, space.getSize(), GuessStrategy.Tier.CANONICAL_GUESSES);
+    }
+
+    /** The search space {@link GuessStrategy} picks for the generator's latency, as a session would search it. */
+    private static String sampledEntry(int c, int d, int[] past, int feedback, SolutionSpace space) {
+        SearchControl      control     = SearchControl.unlimited();
+        int[][]            searchSpace = GuessStrategy.select(c, d, space, past, control);
+        GuessStrategy.Tier tier        = control.progress().tier();
+        SecretOrbits       orbits      = tier.scoresAllSecrets() ?
+                new SecretOrbits(space, CanonicalCode.unusedColors(c, d, past), c, d) : null;
+        long[]             best        = BestGuess.findBestGuess(searchSpace[0], searchSpace[1], orbits, c, d,
+                                                                 control);
+        return line(c, d, past[0], feedback, best, searchSpace[1].length, tier);
+    }
+
+    private static String line(int c, int d, int firstGuessInd, int feedback, long[] best, int secrets,
+                               GuessStrategy.Tier tier) {
+        return String.format("%d %d %d %d %d %d %d %s", c, d, ConvertCode.toCode(c, d, firstGuessInd), feedback,
+                             ConvertCode.toCode(c, d, (int) best[0]), best[1], secrets, tier);
+    }
+
+    /** Write the lines to a temporary file, then move it in place so a crash never leaves half of one. */
+    private static void save(Path checkpoint, List<String> lines) throws IOException {
+        Path tmp = checkpoint.resolveSibling(checkpoint.getFileName() + ".tmp");
+        Files.write(tmp, lines);
+        Files.move(tmp, checkpoint, StandardCopyOption.REPLACE_EXISTING, StandardCopyOption.ATOMIC_MOVE);
+    }
+}
@@ -1,11 +1,13 @@
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
 
 from jpype.types import JInt
 from mastermind.jvm import ConvertCode, ExpectedSize, Feedback, MastermindSession
-from rich.console import Console
+from rich.console import Console, Group
 from rich.live import Live
 from rich.table import Table
+from rich.text import Text
 
 console = Console()
 
@@ -16,6 +18,39 @@ SECRET_IND = 641899762  # index of the secret code (0-based, base-c encoding)
 # ─────────────────────────────────────────────────────────────────────────
 
 
+def _suggest_with_progress(session, live: Live, table: Table, c: int, d: int):
+    """Run suggestGuessWithDetails in a thread, showing its progress under the table.
+
+    A solver jar built before searches reported their progress gets the plain call.
+    """
+    if not hasattr(session, "getSearchProgress"):
+        return session.suggestGuessWithDetails()
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        search = pool.submit(session.suggestGuessWithDetails)
+        while not wait([search], timeout=0.1).done:
+            progress = session.getSearchProgress()
+            if progress is not None and progress.tier() is not None:
+                text = Text(_describe_progress(progress, c, d), style="dim")
+                live.update(Group(table, text))
+    live.update(table)
+    return search.result()  # re-raises an error of the search here
+
+
+def _describe_progress(progress, c: int, d: int) -> str:
+    elapsed = progress.elapsedNanos() / 1e9
+    evaluations = int(progress.evaluations())
+    rate = evaluations * int(progress.secrets()) / elapsed if elapsed > 0 else 0.0
+    text = (
+        f"Searching ({progress.tier()}): {evaluations}/{int(progress.guesses())} guesses"
+        f" x {int(progress.secrets())} secrets, {rate / 1e6:.1f}M pairs/s, {elapsed:.1f}s"
+    )
+    if progress.bestGuess() >= 0:
+        best_code = ConvertCode.toCode(c, d, progress.bestGuess())
+        text += f", best so far {int(best_code)} (rank {int(progress.bestRank())})"
+    return text
+
+
 def demo():
     c, d, secret_ind = C, D, SECRET_IND
 
@@ -45,12 +80,12 @@ def demo():
     exp_size = ExpectedSize(d)
     color_freq: list[int] = JInt[c]
 
-    with Live(table, console=console, refresh_per_second=10):
+    with Live(table, console=console, refresh_per_second=10) as live:
         while not session.isSolved():
             space_before = session.getSolutionSpaceSize()
 
             t0 = time.perf_counter()
-            details = session.suggestGuessWithDetails()
+            details = _suggest_with_progress(session, live, table, c, d)
             t_suggest = time.perf_counter() - t0
 
             guess_ind = int(details[0])
@@ -0,0 +1,62 @@
+"""Bulk feedback for analysis scripts.
+
+Calling ``Feedback.getFeedback`` once per (guess, secret) pair pays the JPype
+bridge overhead on every call, which dominates when millions of feedbacks are
+needed. ``get_feedback_batch`` copies the secrets to the JVM in one block, makes
+a single ``Feedback.getFeedbackBatch`` call and copies the results back.
+
+Scripts that call it in a loop should pass the same ``out`` buffer every time:
+the Java arrays behind it are then reused instead of allocated on every call.
+Each thread keeps its own arrays, so threads can call it at the same time.
+"""
+
+import threading
+
+from jpype.types import JArray, JByte, JInt
+
+from mastermind.jvm import Feedback, require
+
+# Java arrays reused between calls of one thread, for the last length it used: (int[], byte[])
+_local = threading.local()
+
+
+def _java_buffers(n: int):
+    buffers = getattr(_local, "buffers", None)
+    if buffers is None or len(buffers[0]) != n:
+        buffers = _local.buffers = (JArray(JInt)(n), JArray(JByte)(n))
+    return buffers
+
+
+def get_feedback_batch(guess_ind: int, secrets, c: int, d: int, out=None):
+    """Return the feedback (black * 10 + white) of one guess against many secrets.
+
+    ``secrets`` is any sequence of code indices; a NumPy int32 array is copied
+    through the buffer protocol without a Python-level loop, and a Java ``int[]``
+    is passed as is. If ``out`` is given it must have the same length and is
+    filled in place and returned: a Java ``byte[]`` (``JArray(JByte)(n)``) is
+    written by the JVM directly, any other writable 1-byte buffer (e.g.
+    ``np.empty(n, np.uint8)``) is copied from a Java array kept for the next call.
+    Otherwise a new Java ``byte[]`` is returned, which ``np.asarray`` views
+    without copying.
+    """
+    require(Feedback, "getFeedbackBatch")
+    n = len(secrets)
+    if out is not None and len(out) != n:
+        raise ValueError(f"out has length {len(out)}, expected {n}")
+
+    secrets_j, feedbacks = _java_buffers(n)
+    if isinstance(secrets, JArray(JInt)):
+        secrets_j = secrets
+    elif n:
+        secrets_j[:] = secrets
+    if out is None:
+        feedbacks = JArray(JByte)(n)  # returned to the caller, so never reused
+    elif isinstance(out, JArray(JByte)):
+        feedbacks = out
+
+    Feedback.getFeedbackBatch(guess_ind, secrets_j, c, d, feedbacks)
+
+    if out is None or feedbacks is out:
+        return feedbacks
+    memoryview(out).cast("B")[:] = memoryview(feedbacks).cast("B")
+    return out
@@ -8,6 +8,9 @@ from mastermind.ui.prompts import ask_game_settings
 from rich.prompt import IntPrompt, Prompt
 from rich.rule import Rule
 
+# Undo is common here, so keep room for one dense solution space of any game (48 MB for 9x9)
+_UNDO_BUDGET = 64 << 20
+
 
 def _parse_feedback(raw: str, d: int) -> int | None:
     """Parse 'XbYw' or 'X Y' into feedback int (black*10 + white)."""
@@ -40,6 +43,8 @@ def play():
     console.print("[dim]Enter 'u' at any prompt to undo.[/dim]\n")
 
     session = MastermindSession(c, d)
+    if hasattr(session, "setUndoBudget"):  # missing from jars built before the undo journal
+        session.setUndoBudget(_UNDO_BUDGET)
     prev_remaining: list[int] = [
         c**d
     ]  # index 0 = before turn 1, index i = after turn i
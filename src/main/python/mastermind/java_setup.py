@@ -22,6 +22,7 @@ from mastermind.ui import console
 _PKG = Path(__file__).parent
 _ROOT = _PKG.parents[3]  # repo root, only valid in dev (not in installed package)
 _SRC_JAVA = _ROOT / "src" / "main" / "java"
+_SRC_RESOURCES = _ROOT / "src" / "main" / "resources"
 _CLASSES = _ROOT / "target" / "classes"
 _JDK = _ROOT / "target" / "java-jdk"
 _BUNDLED_JAR = _PKG / "mastermind-solver.jar"
@@ -193,6 +194,9 @@ def _build_jar():
     t = time.time()
     with console.status("Compiling Java sources..."):
         subprocess.run([str(javac), "-d", str(_CLASSES)] + sources, check=True)
+        # Resources (e.g. the second guess book) are packaged next to the classes
+        if _SRC_RESOURCES.is_dir():
+            shutil.copytree(_SRC_RESOURCES, _CLASSES, dirs_exist_ok=True)
         subprocess.run(
             [
                 str(jar_tool),
@@ -1,3 +1,5 @@
+import os
+
 import jpype
 from mastermind.java_setup import ensure_ready
 
@@ -19,6 +21,9 @@ else:
     jvmpath = str(jre / "lib" / "server" / "libjvm.so")
 
 _jvm_flags = ["-Xlog:os+container=off"]
+if "MASTERMIND_PROFILE" in os.environ:
+    # Machine profile path, or "reference" to skip calibration (see MachineProfile)
+    _jvm_flags.append(f"-Dmastermind.profile={os.environ['MASTERMIND_PROFILE']}")
 if jre is None:
     # Android/Termux: SerialGC avoids pointer-tagging conflicts with MTE on ARM64
     _jvm_flags.append("-XX:+UseSerialGC")
@@ -34,3 +39,16 @@ MastermindSession = jpype.JClass("org.mastermind.MastermindSession")
 ConvertCode = jpype.JClass("org.mastermind.codes.ConvertCode")
 ExpectedSize = jpype.JClass("org.mastermind.compute.ExpectedSize")
 Feedback = jpype.JClass("org.mastermind.compute.Feedback")
+
+
+def require(java_class, method: str):
+    """Raise a clear error if the loaded jar predates a Java method the caller needs.
+
+    The bundled jar is only rebuilt by ``python src/build.py jar``; without this
+    check a stale jar surfaces as an AttributeError deep inside the caller.
+    """
+    if not hasattr(java_class, method):
+        raise RuntimeError(
+            f"{jar} has no {java_class.__name__}.{method}(): the solver jar is older than the"
+            " Python code. Rebuild it with `python src/build.py jar`."
+        )
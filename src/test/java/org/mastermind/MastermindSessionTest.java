@@ -1,11 +1,16 @@
 package org.mastermind;
 
 import org.junit.jupiter.api.Test;
+import org.junit.jupiter.api.io.TempDir;
 import org.mastermind.codes.ConvertCode;
 import org.mastermind.compute.ExpectedSize;
 import org.mastermind.compute.Feedback;
 import org.mastermind.solver.BestFirstGuess;
 
+import java.io.IOException;
+import java.nio.file.Path;
+import java.util.Arrays;
+
 import static org.junit.jupiter.api.Assertions.*;
 
 public class MastermindSessionTest {
@@ -50,12 +55,86 @@ public class MastermindSessionTest {
         assertEquals(expectedSpace, details[2], "Secrets length should be the full solution space");
     }
 
+    /**
+     * A suggestion with an expired deadline still returns a scored guess, from the
+     * cheapest search space.
+     */
+    @Test
+    void testSuggestGuessWithTimeout() {
+        int               c       = 8, d = 6;
+        MastermindSession session = new MastermindSession(c, d);
+        session.recordGuess(ConvertCode.toIndex(c, d, 112234), 11);
+
+        long[] details = session.suggestGuessWithDetails(0);
+        assertTrue(details[0] >= 0 && details[0] < Math.pow(c, d), "Guess should be a valid index");
+        assertTrue(details[1] > 0, "Returned guess should have been scored");
+        assertTrue(details[2] > 0 && details[2] < session.getSolutionSpaceSize(), "Secrets should be sampled");
+    }
+
+    /**
+     * Cancelling from another thread stops the search with a scored guess;
+     * cancelling while no search runs does nothing.
+     */
+    @Test
+    void testCancelSearch() throws Exception {
+        int               c       = 8, d = 6;
+        MastermindSession session = new MastermindSession(c, d);
+        session.recordGuess(ConvertCode.toIndex(c, d, 112234), 11);
+        session.cancelSearch();
+
+        Thread canceller = new Thread(() -> {
+            try {
+                Thread.sleep(50);
+            } catch (InterruptedException e) {
+                return;
+            }
+            session.cancelSearch();
+        });
+        canceller.start();
+        long[] details = session.suggestGuessWithDetails();
+        canceller.join();
+
+        assertTrue(details[0] >= 0 && details[0] < Math.pow(c, d), "Guess should be a valid index");
+        assertTrue(details[1] > 0, "Returned guess should have been scored");
+        assertNull(session.getSearchProgress(), "No progress once the search is over");
+    }
+
     /** Simulate a full game with secret 1562 (arbitrary mid-range code). */
     @Test
     void testSolveSecret1562() {
         runGame(ind(1562));
     }
 
+    /**
+     * Play the same game with and without retained candidates, undoing a turn
+     * midway, and verify every suggestion and its rank are the same.
+     */
+    @Test
+    void testCandidateRetentionDoesNotChangeSuggestions() {
+        int[]             colorFreq = new int[C];
+        MastermindSession retained  = new MastermindSession(C, D);
+        MastermindSession plain     = new MastermindSession(C, D);
+        plain.setCandidateRetention(0);
+
+        boolean undone = false;
+        while (!plain.isSolved()) {
+            long[] expected = plain.suggestGuessWithDetails();
+            assertArrayEquals(expected, retained.suggestGuessWithDetails(), "turn " + plain.getTurnCount());
+
+            int guess    = (int) expected[0];
+            int feedback = Feedback.getFeedback(guess, ind(1562), C, D, colorFreq);
+            plain.recordGuess(guess, feedback);
+            retained.recordGuess(guess, feedback);
+
+            if (!undone && plain.getTurnCount() == 3 && !plain.isSolved()) {
+                plain.undo(1);
+                retained.undo(1);
+                undone = true;
+            }
+        }
+        assertTrue(retained.isSolved());
+    }
+
     /** Record two guesses, undo both at once, and verify the session is fully reset. */
     @Test
     void testUndoMultiple() {
@@ -121,6 +200,119 @@ public class MastermindSessionTest {
         assertEquals(fb1, session.getHistory().getFirst()[1]);
     }
 
+    /** Undo past the journal's budget, which replays the remaining history instead. */
+    @Test
+    void testUndoWithoutJournal() {
+        int[]             colorFreqCounter = new int[C];
+        MastermindSession session          = new MastermindSession(C, D);
+        session.setUndoBudget(0);
+
+        int guess1 = ind(1122);
+        session.recordGuess(guess1, Feedback.getFeedback(guess1, ind(1234), C, D, colorFreqCounter));
+        int[] secretsAfter1 = session.getSolutionSpaceSecrets();
+
+        int guess2 = ind(1344);
+        session.recordGuess(guess2, Feedback.getFeedback(guess2, ind(1234), C, D, colorFreqCounter));
+        int guess3 = ind(2345);
+        session.recordGuess(guess3, Feedback.getFeedback(guess3, ind(1234), C, D, colorFreqCounter));
+
+        session.undo(2);
+        assertEquals(1, session.getTurnCount());
+        assertArrayEquals(secretsAfter1, session.getSolutionSpaceSecrets());
+    }
+
+    /** Recording a game in one batch gives the same state as recording it guess by guess. */
+    @Test
+    void testRecordGuesses() {
+        int[] guesses   = { ind(1122), ind(1344), ind(2345), ind(1234) };
+        int[] feedbacks = new int[guesses.length];
+        for (int i = 0; i < guesses.length; i++) {
+            feedbacks[i] = Feedback.getFeedback(guesses[i], ind(1234), C, D, new int[C]);
+        }
+
+        MastermindSession single = new MastermindSession(C, D);
+        MastermindSession batch  = new MastermindSession(C, D);
+        for (int i = 0; i < 3; i++) single.recordGuess(guesses[i], feedbacks[i]);
+        batch.recordGuesses(Arrays.copyOf(guesses, 3), Arrays.copyOf(feedbacks, 3));
+        assertEquals(3, batch.getTurnCount());
+        assertArrayEquals(single.getSolutionSpaceSecrets(), batch.getSolutionSpaceSecrets());
+
+        // Undo inside the batch replays the rest
+        batch.undo(1);
+        single.undo(1);
+        assertArrayEquals(single.getSolutionSpaceSecrets(), batch.getSolutionSpaceSecrets());
+
+        // A winning guess ends the batch
+        batch.recordGuesses(Arrays.copyOfRange(guesses, 2, 4), Arrays.copyOfRange(feedbacks, 2, 4));
+        assertTrue(batch.isSolved());
+        assertThrows(IllegalArgumentException.class,
+                     () -> new MastermindSession(C, D).recordGuesses(new int[] { guesses[3], guesses[0] },
+                                                                     new int[] { feedbacks[3], feedbacks[0] }));
+    }
+
+    /** Recording the suggested guess from its kept feedbacks leaves the same secrets. */
+    @Test
+    void testPartitionReuse() {
+        int[]             colorFreq = new int[C];
+        MastermindSession reused    = new MastermindSession(C, D);
+        MastermindSession plain     = new MastermindSession(C, D);
+        plain.setPartitionReuse(false);
+
+        int secret = ind(5164);
+        while (!reused.isSolved()) {
+            int guess = reused.suggestGuess();
+            assertEquals(guess, plain.suggestGuess());
+
+            int feedback = Feedback.getFeedback(guess, secret, C, D, colorFreq);
+            reused.recordGuess(guess, feedback);
+            plain.recordGuess(guess, feedback);
+            if (reused.isSolved()) break;
+            assertArrayEquals(plain.getSolutionSpaceSecrets(), reused.getSolutionSpaceSecrets());
+        }
+    }
+
+    /** A resumed session has the saved history and secrets, and plays on like the original. */
+    @Test
+    void testSaveAndResume(@TempDir Path dir) throws IOException {
+        int[]             colorFreq = new int[C];
+        int               secret    = ind(2461);
+        MastermindSession original  = new MastermindSession(C, D);
+        for (int guess : new int[] { ind(1122), ind(1344) }) {
+            original.recordGuess(guess, Feedback.getFeedback(guess, secret, C, D, colorFreq));
+        }
+
+        Path file = dir.resolve("session.bin");
+        original.save(file);
+        MastermindSession resumed = MastermindSession.resume(file);
+        assertEquals(C, resumed.getC());
+        assertEquals(D, resumed.getD());
+        assertEquals(original.getTurnCount(), resumed.getTurnCount());
+        for (int i = 0; i < original.getTurnCount(); i++) {
+            assertArrayEquals(original.getHistory().get(i), resumed.getHistory().get(i));
+        }
+        assertArrayEquals(original.getSolutionSpaceSecrets(), resumed.getSolutionSpaceSecrets());
+
+        // Same suggestions to the end of the game (retained guesses are not saved), and undo replays the history
+        original.setCandidateRetention(0);
+        resumed.setCandidateRetention(0);
+        while (!original.isSolved()) {
+            int guess = original.suggestGuess();
+            assertEquals(guess, resumed.suggestGuess());
+            int feedback = Feedback.getFeedback(guess, secret, C, D, colorFreq);
+            original.recordGuess(guess, feedback);
+            resumed.recordGuess(guess, feedback);
+        }
+        assertTrue(resumed.isSolved());
+        resumed.undo(resumed.getTurnCount() - 1);
+        assertEquals(1, resumed.getTurnCount());
+
+        // A solved session stays solved
+        Path solvedFile = dir.resolve("solved.bin");
+        original.save(solvedFile);
+        assertTrue(MastermindSession.resume(solvedFile).isSolved());
+        assertThrows(IOException.class, () -> MastermindSession.resume(dir.resolve("missing.bin")));
+    }
+
     /** Verify that undo throws when n is out of range. */
     @Test
     void testUndoInvalidN() {
@@ -0,0 +1,87 @@
+package org.mastermind;
+
+import org.junit.jupiter.api.Test;
+import org.mastermind.compute.Feedback;
+
+import java.io.ByteArrayInputStream;
+import java.io.ByteArrayOutputStream;
+import java.io.IOException;
+import java.util.List;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+class StrategyTreeTest {
+
+    private static final int C = 4;
+    private static final int D = 3;
+
+    /**
+     * Play every secret with and without the tree, and verify the tree gives the
+     * same suggestion with the same details at every turn.
+     */
+    @Test
+    void testTreeMatchesSearch() {
+        StrategyTree tree      = StrategyTree.build(C, D);
+        int[]        colorFreq = new int[C];
+
+        for (int secretInd = 0; secretInd < Math.pow(C, D); secretInd++) {
+            MastermindSession searched = new MastermindSession(C, D);
+            MastermindSession walked   = new MastermindSession(C, D);
+            walked.setStrategyTree(tree);
+
+            while (!searched.isSolved()) {
+                long[] expected = searched.suggestGuessWithDetails();
+                assertArrayEquals(expected, walked.suggestGuessWithDetails(), "secret " + secretInd);
+
+                int guess    = (int) expected[0];
+                int feedback = Feedback.getFeedback(guess, secretInd, C, D, colorFreq);
+                searched.recordGuess(guess, feedback);
+                walked.recordGuess(guess, feedback);
+            }
+        }
+    }
+
+    /** Write a tree, read it back, and verify every lookup is unchanged. */
+    @Test
+    void testWriteReadRoundTrip() throws IOException {
+        StrategyTree          tree  = StrategyTree.build(C, D);
+        ByteArrayOutputStream bytes = new ByteArrayOutputStream();
+        tree.write(bytes);
+        StrategyTree read = StrategyTree.read(new ByteArrayInputStream(bytes.toByteArray()));
+
+        assertEquals(tree.size(), read.size());
+        assertEquals(C, read.getC());
+        assertEquals(D, read.getD());
+
+        long[] root = tree.lookup(List.of());
+        assertArrayEquals(root, read.lookup(List.of()));
+        for (int feedback : Feedback.enumerateFeedback(D)) {
+            List<int[]> history = List.of(new int[] { (int) root[0], feedback });
+            assertArrayEquals(tree.lookup(history), read.lookup(history), "feedback " + feedback);
+        }
+
+        assertThrows(IOException.class, () -> StrategyTree.read(new ByteArrayInputStream(new byte[8])));
+    }
+
+    /** Histories that leave the tree have no suggestion, and the session falls back to searching. */
+    @Test
+    void testOffTreeHistory() {
+        StrategyTree tree = StrategyTree.build(C, D);
+        int          root = (int) tree.lookup(List.of())[0];
+        int          off  = root == 0 ? 1 : 0;
+
+        assertNull(tree.lookup(List.of(new int[] { off, 0 })));
+
+        MastermindSession session = new MastermindSession(C, D);
+        session.setStrategyTree(tree);
+        session.recordGuess(off, Feedback.getFeedback(off, 5, C, D, new int[C]));
+        assertTrue(session.suggestGuessWithDetails()[0] >= 0);
+    }
+
+    @Test
+    void testInvalidGames() {
+        assertThrows(IllegalArgumentException.class, () -> StrategyTree.build(8, 5));
+        StrategyTree tree = StrategyTree.build(3, 2);
+        assertThrows(IllegalArgumentException.class, () -> new MastermindSession(C, D).setStrategyTree(tree));
+    }
+}
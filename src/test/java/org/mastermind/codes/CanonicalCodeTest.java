@@ -6,6 +6,8 @@ import org.junit.jupiter.api.Test;
 import org.junit.jupiter.params.ParameterizedTest;
 import org.junit.jupiter.params.provider.CsvSource;
 
+import java.util.Arrays;
+
 import static org.junit.jupiter.api.Assertions.*;
 
 class CanonicalCodeTest {
@@ -91,4 +93,58 @@ class CanonicalCodeTest {
             assertEquals(0, results[0]);
         }
     }
+
+    @Nested
+    @DisplayName("Enumerate Canonical Guesses")
+    class CanonicalGuesses {
+        private int ind(int c, int d, int code) { return ConvertCode.toIndex(c, d, code); }
+
+        @ParameterizedTest
+        @DisplayName("Without history, one guess per integer partition")
+        @CsvSource({ "2, 3", "6, 4", "9, 9", "3, 7" })
+        void testNoHistory(int c, int d) {
+            int[] guesses = CanonicalCode.enumerateCanonicalGuesses(c, d, new int[0]);
+            assertEquals(CanonicalCode.countCanonicalForms(c, d), guesses.length);
+        }
+
+        @Test
+        @DisplayName("Number of symmetry classes after some guesses")
+        void testKnownCounts() {
+            // Counted by brute force over all codes and all symmetries
+            assertEquals(58, CanonicalCode.enumerateCanonicalGuesses(4, 4, new int[] { ind(4, 4, 1122) }).length);
+            assertEquals(232, CanonicalCode.enumerateCanonicalGuesses(6, 4, new int[] { ind(6, 4, 1123) }).length);
+            assertEquals(636, CanonicalCode.enumerateCanonicalGuesses(5, 5, new int[] { ind(5, 5, 11223) }).length);
+            // Every color used and every position distinguished: no symmetry left
+            assertEquals(1296, CanonicalCode.enumerateCanonicalGuesses(
+                    6, 4, new int[] { ind(6, 4, 1123), ind(6, 4, 3456) }).length);
+        }
+
+        @Test
+        @DisplayName("Guesses are distinct valid indices, and the count matches")
+        void testDistinct() {
+            int[] past    = { ind(6, 5, 11234) };
+            int[] guesses = CanonicalCode.enumerateCanonicalGuesses(6, 5, past);
+            assertEquals(guesses.length, Arrays.stream(guesses).distinct().count());
+            for (int guess : guesses) assertTrue(guess >= 0 && guess < 7776);
+            assertEquals(guesses.length, CanonicalCode.countCanonicalGuesses(6, 5, past, Long.MAX_VALUE));
+        }
+
+        @Test
+        @DisplayName("Counting stops above the limit")
+        void testCountLimit() {
+            long count = CanonicalCode.countCanonicalGuesses(9, 9, new int[] { ind(9, 9, 112233445) }, 1000);
+            assertTrue(count > 1000 && count < 2000);
+        }
+
+        @Test
+        @DisplayName("Symmetry order, and the lower bound on the count it gives")
+        void testSymmetryOrder() {
+            assertEquals(720 * 24, CanonicalCode.symmetryOrder(6, 4, new int[0]));
+            // Colors 4, 5, 6 unused, and the two leading positions interchangeable
+            int[] past = { ind(6, 4, 1123) };
+            assertEquals(12, CanonicalCode.symmetryOrder(6, 4, past));
+            assertTrue(1296 / 12 <= CanonicalCode.countCanonicalGuesses(6, 4, past, Long.MAX_VALUE));
+            assertEquals(1, CanonicalCode.symmetryOrder(6, 4, new int[] { ind(6, 4, 1123), ind(6, 4, 3456) }));
+        }
+    }
 }
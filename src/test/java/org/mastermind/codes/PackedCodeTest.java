@@ -0,0 +1,37 @@
+package org.mastermind.codes;
+
+import org.junit.jupiter.api.Test;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+class PackedCodeTest {
+
+    @Test
+    void testFromIndexExamples() {
+        assertEquals(0x0000L, PackedCode.fromIndex(6, 4, ConvertCode.toIndex(6, 4, 1111)));
+        assertEquals(0x0001L, PackedCode.fromIndex(6, 4, ConvertCode.toIndex(6, 4, 1112)));
+        assertEquals(0x0123L, PackedCode.fromIndex(6, 4, ConvertCode.toIndex(6, 4, 1234)));
+        assertEquals(0x5555L, PackedCode.fromIndex(6, 4, ConvertCode.toIndex(6, 4, 6666)));
+        assertEquals(0x8_7654_3210L, PackedCode.fromIndex(9, 9, ConvertCode.toIndex(9, 9, 987654321)));
+    }
+
+    @Test
+    void testRoundTrip() {
+        for (int[] game : new int[][] { { 2, 3 }, { 6, 4 }, { 7, 5 } }) {
+            int c = game[0], d = game[1];
+            for (int index = 0; index < Math.pow(c, d); index++) {
+                assertEquals(index, PackedCode.toIndex(c, d, PackedCode.fromIndex(c, d, index)));
+            }
+        }
+        int last = (int) Math.pow(9, 9) - 1;
+        assertEquals(last, PackedCode.toIndex(9, 9, PackedCode.fromIndex(9, 9, last)));
+    }
+
+    @Test
+    void testColorCounts() {
+        assertEquals(0x000004L, PackedCode.colorCounts(4, 0x0000L));
+        assertEquals(0x000013L, PackedCode.colorCounts(4, 0x0001L));
+        assertEquals(0x400000L, PackedCode.colorCounts(4, 0x5555L));
+        assertEquals(0x1_1111_1111L, PackedCode.colorCounts(9, 0x8_7654_3210L));
+    }
+}
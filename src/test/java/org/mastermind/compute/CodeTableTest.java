@@ -0,0 +1,84 @@
+package org.mastermind.compute;
+
+import org.junit.jupiter.api.Test;
+import org.mastermind.codes.ConvertCode;
+
+import java.util.Random;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+class CodeTableTest {
+
+    @Test
+    void testSameTableIsShared() {
+        assertSame(CodeTable.of(6, 4), CodeTable.of(6, 4));
+        assertNotSame(CodeTable.of(6, 4), CodeTable.of(6, 5));
+    }
+
+    @Test
+    void testPackedAndColors() {
+        CodeTable table = CodeTable.of(6, 4);
+        int       ind   = ConvertCode.toIndex(6, 4, 1123);
+
+        // Position 0 is the rightmost digit: 3, 2, 1, 1 → 0-based 2, 1, 0, 0
+        assertEquals(0x0012L, table.packed(ind));
+        // Two of color 0, one of color 1, one of color 2
+        assertEquals(0x112L, table.colors(ind));
+    }
+
+    @Test
+    void testMatchesGetFeedbackAllPairs() {
+        // 6x4 fits entirely in the low half of the table
+        int       c     = 6, d = 4, total = 1296;
+        int[]     freq  = new int[c];
+        CodeTable table = CodeTable.of(c, d);
+
+        for (int guessInd = 0; guessInd < total; guessInd++) {
+            for (int secretInd = 0; secretInd < total; secretInd++) {
+                assertEquals(Feedback.getFeedback(guessInd, secretInd, c, d, freq),
+                             table.getFeedback(guessInd, secretInd),
+                             "Mismatch at guessInd=" + guessInd + " secretInd=" + secretInd);
+            }
+        }
+    }
+
+    @Test
+    void testMatchesGetFeedbackTwoLevel() {
+        // These games are split across the low and high halves of the table
+        Random random = new Random(42);
+        for (int[] game : new int[][] { { 9, 9 }, { 8, 7 }, { 5, 9 }, { 2, 9 } }) {
+            int       c     = game[0], d = game[1];
+            int       total = (int) Math.pow(c, d);
+            int[]     freq  = new int[c];
+            CodeTable table = CodeTable.of(c, d);
+
+            for (int t = 0; t < 100_000; t++) {
+                int guessInd  = random.nextInt(total);
+                int secretInd = t < 2 ? total - 1 - t : random.nextInt(total);
+                assertEquals(Feedback.getFeedback(guessInd, secretInd, c, d, freq),
+                             table.getFeedback(guessInd, secretInd),
+                             "Mismatch for c=" + c + ", d=" + d + " at guessInd=" + guessInd
+                                     + " secretInd=" + secretInd);
+            }
+        }
+    }
+
+    @Test
+    void testGetFeedbackRangeMatchesGetFeedback() {
+        // Ranges starting mid-block and crossing several high entries
+        for (int[] game : new int[][] { { 6, 4 }, { 9, 7 }, { 3, 9 } }) {
+            int       c         = game[0], d = game[1];
+            int       total     = (int) Math.pow(c, d);
+            CodeTable table     = CodeTable.of(c, d);
+            int       guessInd  = total / 3;
+            int       from      = Math.max(0, total - 3 * CodeTable.RANGE_CHUNK - 17);
+            int[]     feedbacks = new int[total - from];
+
+            table.getFeedbackRange(table.packed(guessInd), table.colors(guessInd), from, total, feedbacks);
+            for (int i = from; i < total; i++) {
+                assertEquals(table.getFeedback(guessInd, i), feedbacks[i - from],
+                             "Mismatch for c=" + c + ", d=" + d + " at secretInd=" + i);
+            }
+        }
+    }
+}
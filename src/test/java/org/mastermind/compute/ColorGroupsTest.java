@@ -0,0 +1,63 @@
+package org.mastermind.compute;
+
+import org.junit.jupiter.api.Test;
+import org.mastermind.codes.SampledCode;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+class ColorGroupsTest {
+
+    @Test
+    void testMatchesScalarRankAllGuesses() {
+        int          c            = 6, d = 4, total = 1296;
+        int[]        secretsInd   = new int[total];
+        int[]        feedbackFreq = new int[100];
+        ExpectedSize expectedSize = new ExpectedSize(d);
+        for (int i = 0; i < total; i++) secretsInd[i] = i;
+
+        ColorGroups groups = new ColorGroups(secretsInd, c, d);
+        assertEquals(total, groups.size());
+        assertEquals(126, groups.groups());  // multisets of 4 among 6 colors
+        assertEquals(126, ColorGroups.countMultisets(c, d));
+        assertEquals(24310, ColorGroups.countMultisets(9, 9));
+
+        for (int guessInd = 0; guessInd < total; guessInd++) {
+            assertEquals(expectedSize.calcExpectedRank(guessInd, secretsInd, c, d, feedbackFreq),
+                         expectedSize.calcExpectedRank(guessInd, groups, feedbackFreq),
+                         "Rank mismatch at guessInd=" + guessInd);
+        }
+    }
+
+    @Test
+    void testMatchesScalarFeedbackLargeGame() {
+        int   c          = 9, d = 9;
+        int[] secretsInd = SampledCode.getSample(c, d, 2500);
+        int[] guessesInd = SampledCode.getSample(c, d, 50);
+        int[] freq       = new int[c];
+
+        ColorGroups groups = new ColorGroups(secretsInd, c, d);
+        for (int guessInd : guessesInd) {
+            int[] expected = new int[100];
+            for (int secretInd : secretsInd) expected[Feedback.getFeedback(guessInd, secretInd, c, d, freq)]++;
+
+            int[] actual = new int[100];
+            groups.countFeedback(guessInd, actual);
+            assertArrayEquals(expected, actual, "Histogram mismatch at guessInd=" + guessInd);
+        }
+    }
+
+    @Test
+    void testBoundedRank() {
+        int          c            = 6, d = 4;
+        int[]        secretsInd   = SampledCode.getSample(c, d, 400);
+        int[]        feedbackFreq = new int[100];
+        ExpectedSize expectedSize = new ExpectedSize(d);
+
+        ColorGroups groups = new ColorGroups(secretsInd, c, d);
+        for (int guessInd = 0; guessInd < 1296; guessInd += 7) {
+            long rank = expectedSize.calcExpectedRank(guessInd, groups, feedbackFreq);
+            assertEquals(rank, expectedSize.calcExpectedRankBounded(guessInd, groups, rank, feedbackFreq));
+            assertTrue(expectedSize.calcExpectedRankBounded(guessInd, groups, rank - 1, feedbackFreq) > rank - 1);
+        }
+    }
+}
@@ -0,0 +1,41 @@
+package org.mastermind.compute;
+
+import org.junit.jupiter.api.Test;
+import org.mastermind.codes.SampledCode;
+
+import java.util.BitSet;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+class ConsistentCodesTest {
+
+    /** Every (guess, feedback) of small games gives exactly the codes a full scan keeps. */
+    @Test
+    void testMatchesFullScan() {
+        for (int[] game : new int[][] { { 6, 4 }, { 5, 5 }, { 3, 7 }, { 2, 3 }, { 9, 1 } }) {
+            int   c         = game[0], d = game[1];
+            int   total     = (int) Math.pow(c, d);
+            int[] colorFreq = new int[c];
+            for (int guessInd : SampledCode.getSample(c, d, 5)) {
+                for (int feedback : Feedback.enumerateFeedback(d)) {
+                    BitSet expected = new BitSet(total);
+                    for (int s = 0; s < total; s++) {
+                        if (Feedback.getFeedback(guessInd, s, c, d, colorFreq) == feedback) expected.set(s);
+                    }
+
+                    BitSet actual = new BitSet(total);
+                    assertEquals(expected.cardinality(), ConsistentCodes.enumerate(guessInd, feedback, c, d, actual));
+                    assertEquals(expected, actual, "c=" + c + ", d=" + d + ", guess=" + guessInd + ", fb=" + feedback);
+                }
+            }
+        }
+    }
+
+    @Test
+    void testImpossibleFeedback() {
+        BitSet out = new BitSet();
+        assertEquals(0, ConsistentCodes.enumerate(0, 31, 6, 4, out));  // three blacks and one white
+        assertEquals(0, ConsistentCodes.enumerate(0, 5, 6, 4, out));   // more pegs than positions
+        assertTrue(out.isEmpty());
+    }
+}
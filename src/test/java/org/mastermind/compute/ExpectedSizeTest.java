@@ -48,6 +48,33 @@ class ExpectedSizeTest {
         }
     }
 
+    @Test
+    void testCalcExpectedRankBounded() {
+        SecretLanes    lanes  = new SecretLanes(secretsInd, COLORS, DIGITS);
+        FeedbackMatrix matrix = FeedbackMatrix.of(COLORS, DIGITS);
+        for (int guessInd : new int[] { ind(1111), ind(1123), ind(1234) }) {
+            long rank = expectedSizeObj.calcExpectedRank(guessInd, secretsInd, COLORS, DIGITS, feedbackFreq);
+
+            // Within the bound: exact rank
+            assertEquals(rank, expectedSizeObj.calcExpectedRankBounded(guessInd, secretsInd, COLORS, DIGITS, rank,
+                                                                       feedbackFreq));
+            assertEquals(rank, expectedSizeObj.calcExpectedRankBounded(guessInd, secretsInd, matrix, rank,
+                                                                       feedbackFreq));
+            assertEquals(rank, expectedSizeObj.calcExpectedRankBounded(guessInd, lanes, rank, feedbackFreq));
+
+            // Beyond the bound: a value above the bound and at most the rank
+            long bound = rank / 2;
+            long cut   = expectedSizeObj.calcExpectedRankBounded(guessInd, secretsInd, COLORS, DIGITS, bound,
+                                                                 feedbackFreq);
+            assertTrue(cut > bound && cut <= rank);
+            cut = expectedSizeObj.calcExpectedRankBounded(guessInd, lanes, bound, feedbackFreq);
+            assertTrue(cut > bound && cut <= rank);
+
+            // feedbackFreq must be left cleared
+            for (int freq : feedbackFreq) assertEquals(0, freq);
+        }
+    }
+
     @Test
     void testConvertSampleRankToExpectedSize() {
         // Use full population as the "sample" (sampleSize == total).
@@ -0,0 +1,49 @@
+package org.mastermind.compute;
+
+import org.junit.jupiter.api.Test;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+class FeedbackMatrixTest {
+
+    @Test
+    void testMatchesGetFeedbackAllPairs() {
+        int            c      = 6, d = 4, total = 1296;
+        int[]          freq   = new int[c];
+        FeedbackMatrix matrix = FeedbackMatrix.of(c, d);
+        assertNotNull(matrix);
+
+        for (int guessInd = 0; guessInd < total; guessInd++) {
+            for (int secretInd = 0; secretInd < total; secretInd++) {
+                assertEquals(Feedback.getFeedback(guessInd, secretInd, c, d, freq),
+                             matrix.getFeedback(guessInd, secretInd),
+                             "Mismatch at guessInd=" + guessInd + " secretInd=" + secretInd);
+            }
+        }
+    }
+
+    @Test
+    void testSameMatrixIsShared() {
+        assertSame(FeedbackMatrix.of(8, 4), FeedbackMatrix.of(8, 4));
+    }
+
+    @Test
+    void testNoMatrixForLargeGames() {
+        assertNull(FeedbackMatrix.of(9, 9));
+        assertNull(FeedbackMatrix.of(7, 5));
+    }
+
+    @Test
+    void testCalcExpectedRankMatchesWithoutMatrix() {
+        int          c            = 6, d = 4;
+        int[]        secretsInd   = { 0, 7, 35, 100, 512, 777, 1000, 1295 };
+        int[]        feedbackFreq = new int[100];
+        ExpectedSize expectedSize = new ExpectedSize(d);
+
+        for (int guessInd = 0; guessInd < 1296; guessInd += 17) {
+            assertEquals(expectedSize.calcExpectedRank(guessInd, secretsInd, c, d, feedbackFreq),
+                         expectedSize.calcExpectedRank(guessInd, secretsInd, FeedbackMatrix.of(c, d),
+                                                       feedbackFreq));
+        }
+    }
+}
@@ -2,6 +2,10 @@ package org.mastermind.compute;
 
 import org.junit.jupiter.api.Test;
 import org.mastermind.codes.ConvertCode;
+import org.mastermind.codes.PackedCode;
+
+import java.util.BitSet;
+import java.util.Random;
 
 import static org.junit.jupiter.api.Assertions.*;
 
@@ -147,6 +151,78 @@ class FeedbackTest {
         }
     }
 
+    @Test
+    void testGetFeedbackPackedMatchesGetFeedback() {
+        int c = COLORS, d = DIGITS, total = TOTAL_COMBINATIONS;
+
+        for (int guessInd = 0; guessInd < total; guessInd++) {
+            long guessPacked = PackedCode.fromIndex(c, d, guessInd);
+            long guessColors = PackedCode.colorCounts(d, guessPacked);
+            for (int secretInd = 0; secretInd < total; secretInd++) {
+                long secretPacked = PackedCode.fromIndex(c, d, secretInd);
+                long secretColors = PackedCode.colorCounts(d, secretPacked);
+                assertEquals(getFeedbackQuick(guessInd, secretInd),
+                             Feedback.getFeedbackPacked(guessPacked, guessColors, secretPacked, secretColors, d),
+                             "Mismatch at guessInd=" + guessInd + " secretInd=" + secretInd);
+            }
+        }
+    }
+
+    @Test
+    void testGetFeedbackPackedNineColorsNineDigits() {
+        // Exercise all nine color nibbles and all nine digit nibbles
+        int    c      = 9, d = 9, total = (int) Math.pow(c, d);
+        int[]  freq   = new int[c];
+        Random random = new Random(7);
+
+        for (int t = 0; t < 200_000; t++) {
+            int  guessInd     = random.nextInt(total);
+            int  secretInd    = t % 10 == 0 ? guessInd : random.nextInt(total);
+            long guessPacked  = PackedCode.fromIndex(c, d, guessInd);
+            long secretPacked = PackedCode.fromIndex(c, d, secretInd);
+            assertEquals(Feedback.getFeedback(guessInd, secretInd, c, d, freq),
+                         Feedback.getFeedbackPacked(guessPacked, PackedCode.colorCounts(d, guessPacked),
+                                                    secretPacked, PackedCode.colorCounts(d, secretPacked), d),
+                         "Mismatch at guessInd=" + guessInd + " secretInd=" + secretInd);
+        }
+    }
+
+    @Test
+    void testGetFeedbackBatchMatchesGetFeedback() {
+        int    c          = 7, d = 5, total = 16807;
+        int[]  freq       = new int[c];
+        int[]  secretsInd = new Random(3).ints(5000, 0, total).toArray();
+        byte[] bytes      = new byte[secretsInd.length];
+        int[]  ints       = new int[secretsInd.length];
+
+        for (int guessInd : new int[] { 0, 1234, total - 1 }) {
+            Feedback.getFeedbackBatch(guessInd, secretsInd, c, d, bytes);
+            Feedback.getFeedbackBatch(guessInd, secretsInd, c, d, ints);
+            for (int i = 0; i < secretsInd.length; i++) {
+                int expected = Feedback.getFeedback(guessInd, secretsInd[i], c, d, freq);
+                assertEquals(expected, bytes[i], "Mismatch (byte) at secretInd=" + secretsInd[i]);
+                assertEquals(expected, ints[i], "Mismatch (int) at secretInd=" + secretsInd[i]);
+            }
+        }
+    }
+
+    @Test
+    void testGetFeedbackBatchBitSetRange() {
+        int    c       = 6, d = 4, guessInd = 500;
+        int[]  freq    = new int[c];
+        BitSet secrets = new BitSet(TOTAL_COMBINATIONS);
+        for (int i = 0; i < TOTAL_COMBINATIONS; i += 3) secrets.set(i);
+
+        int[] feedbacks = new int[TOTAL_COMBINATIONS];
+        int   n         = Feedback.getFeedbackBatch(guessInd, secrets, 100, 200, c, d, feedbacks);
+
+        assertEquals(secrets.get(100, 200).cardinality(), n);
+        int k = 0;
+        for (int i = secrets.nextSetBit(100); i >= 0 && i < 200; i = secrets.nextSetBit(i + 1)) {
+            assertEquals(Feedback.getFeedback(guessInd, i, c, d, freq), feedbacks[k++]);
+        }
+    }
+
     @Test
     void testCalcFeedbackSize() {
         assertEquals(55, Feedback.calcFeedbackSize(9));
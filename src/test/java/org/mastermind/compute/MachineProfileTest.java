@@ -0,0 +1,53 @@
+package org.mastermind.compute;
+
+import org.junit.jupiter.api.Test;
+import org.junit.jupiter.api.io.TempDir;
+
+import java.io.IOException;
+import java.nio.file.Files;
+import java.nio.file.Path;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+class MachineProfileTest {
+
+    @Test
+    void testReferenceKeepsTunedThresholds() {
+        assertEquals(130_000_000L, MachineProfile.REFERENCE.searchBudget(1000));
+        assertEquals(13_000_000L, MachineProfile.REFERENCE.searchBudget(100));
+        assertEquals(3_000_000L, MachineProfile.REFERENCE.parallelSearchThreshold());
+        assertEquals(16384, MachineProfile.REFERENCE.parallelFilterThreshold());
+    }
+
+    @Test
+    void testCalibrate() {
+        MachineProfile profile = MachineProfile.calibrate();
+        assertEquals(SolverPool.getParallelism(), profile.cores());
+        assertTrue(profile.evaluationsPerSecondPerCore() > 0);
+        assertTrue(profile.evaluationsPerSecond() >= profile.evaluationsPerSecondPerCore());
+        assertTrue(profile.parallelSearchThreshold() > 0);
+        assertTrue(profile.parallelFilterThreshold() >= 1024);
+    }
+
+    @Test
+    void testSaveLoadRoundTrip(@TempDir Path dir) throws IOException {
+        Path           path    = dir.resolve("sub").resolve("profile.properties");
+        MachineProfile profile = new MachineProfile(12, 7.5e7, 8.25e8, 3_750_000, 18750);
+        MachineProfile.save(profile, path);
+        assertEquals(profile, MachineProfile.load(path));
+
+        assertNull(MachineProfile.load(dir.resolve("missing.properties")));
+        Files.writeString(path, "version=1\ncores=four\n");
+        assertNull(MachineProfile.load(path));
+    }
+
+    @Test
+    void testSetCurrent() {
+        try {
+            MachineProfile.setCurrent(MachineProfile.REFERENCE);
+            assertSame(MachineProfile.REFERENCE, MachineProfile.current());
+        } finally {
+            MachineProfile.setCurrent(null);
+        }
+    }
+}
@@ -0,0 +1,47 @@
+package org.mastermind.compute;
+
+import org.junit.jupiter.api.Test;
+
+import java.util.BitSet;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+class PositionMasksTest {
+
+    @Test
+    void testPruneMatchesFeedback() {
+        int           c     = 6, d = 4, total = 1296;
+        int[]         freq  = new int[c];
+        PositionMasks masks = PositionMasks.of(c, d);
+        assertNotNull(masks);
+
+        for (int guessInd = 0; guessInd < total; guessInd += 3) {
+            for (int feedback : new int[] { 0, 1, 2, 4, 10 }) {
+                BitSet codes = new BitSet(total);
+                codes.set(0, total);
+                boolean exact = masks.prune(codes, guessInd, feedback);
+                assertEquals(feedback == 0, exact);
+
+                // Never drops a consistent code, and drops every other code when exact
+                for (int s = 0; s < total; s++) {
+                    int     actual     = Feedback.getFeedback(guessInd, s, c, d, freq);
+                    boolean consistent = actual == feedback;
+                    if (consistent) assertTrue(codes.get(s), "Dropped " + s + " for guessInd=" + guessInd);
+                    if (exact) assertEquals(consistent, codes.get(s));
+                    if (feedback < 10 && actual / 10 > 0) assertFalse(codes.get(s));
+                }
+            }
+        }
+    }
+
+    @Test
+    void testSameIndexIsShared() {
+        assertSame(PositionMasks.of(7, 5), PositionMasks.of(7, 5));
+    }
+
+    @Test
+    void testNoIndexForLargeGames() {
+        assertNull(PositionMasks.of(9, 9));
+        assertNull(PositionMasks.of(9, 8));
+    }
+}
@@ -0,0 +1,62 @@
+package org.mastermind.compute;
+
+import org.junit.jupiter.api.Test;
+import org.mastermind.codes.SampledCode;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+class SecretLanesTest {
+
+    @Test
+    void testMatchesScalarRankAllGuesses() {
+        int          c            = 6, d = 4, total = 1296;
+        int[]        secretsInd   = new int[total];
+        int[]        feedbackFreq = new int[100];
+        ExpectedSize expectedSize = new ExpectedSize(d);
+        for (int i = 0; i < total; i++) secretsInd[i] = i;
+
+        SecretLanes lanes = new SecretLanes(secretsInd, c, d);
+        assertEquals(total, lanes.size());
+
+        for (int guessInd = 0; guessInd < total; guessInd++) {
+            assertEquals(expectedSize.calcExpectedRank(guessInd, secretsInd, c, d, feedbackFreq),
+                         expectedSize.calcExpectedRank(guessInd, lanes, feedbackFreq),
+                         "Rank mismatch at guessInd=" + guessInd);
+        }
+    }
+
+    @Test
+    void testMatchesScalarFeedbackLargeGame() {
+        // More secrets than one block, with a partial last block
+        int   c          = 9, d = 9;
+        int[] secretsInd = SampledCode.getSample(c, d, 2500);
+        int[] guessesInd = SampledCode.getSample(c, d, 50);
+        int[] freq       = new int[c];
+
+        SecretLanes lanes = new SecretLanes(secretsInd, c, d);
+        for (int guessInd : guessesInd) {
+            int[] expected = new int[100];
+            for (int secretInd : secretsInd) expected[Feedback.getFeedback(guessInd, secretInd, c, d, freq)]++;
+
+            int[] actual = new int[100];
+            lanes.countFeedback(guessInd, actual);
+            assertArrayEquals(expected, actual, "Histogram mismatch at guessInd=" + guessInd);
+        }
+    }
+
+    @Test
+    void testGetFeedbacks() {
+        int   c          = 9, d = 9;
+        int[] secretsInd = SampledCode.getSample(c, d, 2500);
+        int[] freq       = new int[c];
+
+        SecretLanes lanes     = new SecretLanes(secretsInd, c, d);
+        byte[]      feedbacks = new byte[secretsInd.length];
+        for (int guessInd : SampledCode.getSample(c, d, 20)) {
+            lanes.getFeedbacks(guessInd, feedbacks);
+            for (int j = 0; j < secretsInd.length; j++) {
+                assertEquals(Feedback.getFeedback(guessInd, secretsInd[j], c, d, freq), feedbacks[j]);
+            }
+        }
+    }
+}
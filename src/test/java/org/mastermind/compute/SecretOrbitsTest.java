@@ -0,0 +1,47 @@
+package org.mastermind.compute;
+
+import org.junit.jupiter.api.Test;
+import org.mastermind.codes.CanonicalCode;
+import org.mastermind.codes.ConvertCode;
+import org.mastermind.solver.BestGuess;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+class SecretOrbitsTest {
+
+    private static final int C = 6;
+    private static final int D = 4;
+
+    private static int ind(int code) { return ConvertCode.toIndex(C, D, code); }
+
+    @Test
+    void testForGuessNeedsTwoAbsentUnusedColors() {
+        SolutionSpace space = new SolutionSpace(C, D);
+        space.filterSolution(ind(1123), 11);
+        SecretOrbits orbits = new SecretOrbits(space, new int[] { 3, 4, 5 }, C, D);
+
+        assertNotNull(orbits.forGuess(ind(1111)));  // 4, 5 and 6 absent
+        assertNotNull(orbits.forGuess(ind(1114)));  // 5 and 6 absent
+        assertNull(orbits.forGuess(ind(1145)));     // only 6 absent
+        assertNull(orbits.forGuess(ind(1456)));     // no unused color absent
+
+        // Guesses missing the same unused colors share one compression
+        assertSame(orbits.forGuess(ind(1111)), orbits.forGuess(ind(2323)));
+    }
+
+    @Test
+    void testBestGuessMatchesUnweighted() {
+        int[] pastGuesses = { ind(1123) };
+        for (int feedback : new int[] { 0, 2, 11, 20 }) {
+            SolutionSpace space = new SolutionSpace(C, D);
+            space.filterSolution(pastGuesses[0], feedback);
+            int[]        guesses = CanonicalCode.enumerateCanonicalGuesses(C, D, pastGuesses);
+            int[]        secrets = space.getSecrets();
+            SecretOrbits orbits  = new SecretOrbits(space, CanonicalCode.unusedColors(C, D, pastGuesses), C, D);
+
+            assertArrayEquals(BestGuess.findBestGuess(guesses, secrets, C, D),
+                              BestGuess.findBestGuess(guesses, secrets, orbits, C, D, null),
+                              "feedback=" + feedback);
+        }
+    }
+}
@@ -1,8 +1,15 @@
 package org.mastermind.compute;
 
 import org.junit.jupiter.api.Test;
+import org.junit.jupiter.api.io.TempDir;
 import org.mastermind.codes.ConvertCode;
 
+import java.io.IOException;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.util.Arrays;
+import java.util.BitSet;
+
 import static org.junit.jupiter.api.Assertions.*;
 
 class SolutionSpaceTest {
@@ -43,6 +50,17 @@ class SolutionSpaceTest {
         }
     }
 
+    @Test
+    void testFilterSolutionWithoutMatrix() {
+        // Force the incremental and CodeTable paths used by games too large for a FeedbackMatrix
+        FeedbackMatrix.setEnabled(false);
+        try {
+            testFilterSolutionTwice();
+        } finally {
+            FeedbackMatrix.setEnabled(true);
+        }
+    }
+
     @Test
     void testFilterSolution() {
         int   guessIdx         = ind(1123);
@@ -75,4 +93,291 @@ class SolutionSpaceTest {
                          "Remaining secret index " + s + " should produce feedback " + obtainedFeedback);
         }
     }
+
+    @Test
+    void testGetWeightedSecrets() {
+        // 1122 leaves colors 3..6 (0-based 2..5) unused
+        SolutionSpace space = new SolutionSpace(C, D);
+        space.filterSolution(ind(1122), 10);
+
+        int[][] weighted = space.getWeightedSecrets(new int[] { 2, 3, 4, 5 });
+        assertTrue(weighted[0].length < space.getSize());
+        assertEquals(space.getSize(), Arrays.stream(weighted[1]).sum());
+
+        // Same rank as the full secrets for guesses without the interchangeable colors
+        ExpectedSize expectedSize = new ExpectedSize(D);
+        int[]        feedbackFreq = new int[100];
+        int[]        secrets      = space.getSecrets();
+        for (int guessInd : new int[] { ind(1212), ind(2111), ind(1221) }) {
+            assertEquals(expectedSize.calcExpectedRank(guessInd, secrets, C, D, feedbackFreq),
+                         expectedSize.calcExpectedRank(guessInd, weighted[0], weighted[1], C, D, feedbackFreq));
+        }
+    }
+
+    @Test
+    void testSparseFilter() {
+        int[] guesses   = { ind(1123), ind(2456), ind(3345), ind(6612) };
+        int   secretIdx = ind(4563);
+        int[] colorFreq = new int[C];
+
+        SolutionSpace space    = new SolutionSpace(C, D);
+        boolean[]     expected = new boolean[TOTAL];
+        Arrays.fill(expected, true);
+        for (int guessIdx : guesses) {
+            int feedback = Feedback.getFeedback(guessIdx, secretIdx, C, D, colorFreq);
+            space.filterSolution(guessIdx, feedback);
+            for (int s = 0; s < TOTAL; s++) {
+                expected[s] &= Feedback.getFeedback(guessIdx, s, C, D, colorFreq) == feedback;
+            }
+
+            // Same secrets whichever representation the space switched to
+            int[]  secrets   = space.getSecrets();
+            BitSet remaining = space.getRemaining();
+            assertEquals(secrets.length, space.getSize());
+            assertEquals(space.getSize() * SolutionSpace.SPARSE_RATIO <= TOTAL, space.isSparse());
+            assertEquals(space.getSize(), remaining.cardinality());
+            for (int s = 0; s < TOTAL; s++) {
+                assertEquals(expected[s], space.contains(s));
+                assertEquals(expected[s], remaining.get(s));
+                assertEquals(expected[s], Arrays.binarySearch(secrets, s) >= 0);
+            }
+        }
+        assertTrue(space.isSparse());
+        assertTrue(space.contains(secretIdx));
+
+        space.reset();
+        assertFalse(space.isSparse());
+        assertEquals(TOTAL, space.getSize());
+    }
+
+    @Test
+    void testSparseFilterWithoutMatrix() {
+        FeedbackMatrix.setEnabled(false);
+        try {
+            testSparseFilter();
+        } finally {
+            FeedbackMatrix.setEnabled(true);
+        }
+    }
+
+    @Test
+    void testUndo() {
+        int[]   guesses   = { ind(1123), ind(2456), ind(3345) };
+        int[][] secrets   = new int[guesses.length + 1][];
+        int[]   colorFreq = new int[C];
+
+        SolutionSpace space = new SolutionSpace(C, D);
+        space.setJournalBudget(Long.MAX_VALUE);
+        secrets[0] = space.getSecrets();
+        for (int i = 0; i < guesses.length; i++) {
+            space.filterSolution(guesses[i], Feedback.getFeedback(guesses[i], ind(4563), C, D, colorFreq));
+            secrets[i + 1] = space.getSecrets();
+        }
+        assertEquals(guesses.length, space.getJournalDepth());
+
+        // Back from sparse to sparse, then to dense and the full space
+        assertTrue(space.undo(1));
+        assertArrayEquals(secrets[2], space.getSecrets());
+        assertTrue(space.undo(1));
+        assertArrayEquals(secrets[1], space.getSecrets());
+        assertFalse(space.isSparse());
+        assertFalse(space.undo(2));
+        assertTrue(space.undo(1));
+        assertArrayEquals(secrets[0], space.getSecrets());
+
+        // Filtering again after the undo gives the same states
+        for (int i = 0; i < guesses.length; i++) {
+            space.filterSolution(guesses[i], Feedback.getFeedback(guesses[i], ind(4563), C, D, colorFreq));
+            assertArrayEquals(secrets[i + 1], space.getSecrets());
+        }
+    }
+
+    @Test
+    void testJournalBudget() {
+        SolutionSpace space = new SolutionSpace(C, D);
+        space.setJournalBudget(Long.MAX_VALUE);
+        space.filterSolution(ind(1123), 1);
+        space.filterSolution(ind(2456), 2);
+        assertEquals(2, space.getJournalDepth());
+
+        // The dense state before the second filter no longer fits, and the oldest states go first
+        space.setJournalBudget(0);
+        assertEquals(0, space.getJournalDepth());
+        assertFalse(space.undo(1));
+        assertTrue(space.undo(0));
+    }
+
+    /** The journal is off by default: only the free state before the first filter is kept. */
+    @Test
+    void testJournalOffByDefault() {
+        SolutionSpace space = new SolutionSpace(C, D);
+        space.filterSolution(ind(1123), 1);
+        assertEquals(1, space.getJournalDepth());
+        space.filterSolution(ind(2456), 2);
+        assertEquals(0, space.getJournalDepth());
+    }
+
+    @Test
+    void testFilterSolutions() {
+        int[] guesses   = { ind(1123), ind(2456), ind(3345), ind(6612) };
+        int[] feedbacks = new int[guesses.length];
+        for (int i = 0; i < guesses.length; i++) {
+            feedbacks[i] = Feedback.getFeedback(guesses[i], ind(4563), C, D, new int[C]);
+        }
+
+        // One pass from the full space, and one from a sparse space, against one filter per guess
+        SolutionSpace separate = new SolutionSpace(C, D);
+        for (int i = 0; i < guesses.length; i++) separate.filterSolution(guesses[i], feedbacks[i]);
+        SolutionSpace fused = new SolutionSpace(C, D);
+        fused.filterSolutions(guesses, feedbacks);
+        assertArrayEquals(separate.getSecrets(), fused.getSecrets());
+
+        SolutionSpace split = new SolutionSpace(C, D);
+        split.setJournalBudget(Long.MAX_VALUE);
+        split.filterSolutions(Arrays.copyOf(guesses, 2), Arrays.copyOf(feedbacks, 2));
+        assertTrue(split.isSparse());
+        split.filterSolutions(Arrays.copyOfRange(guesses, 2, 4), Arrays.copyOfRange(feedbacks, 2, 4));
+        assertArrayEquals(separate.getSecrets(), split.getSecrets());
+
+        // Only the states before each batch are journaled
+        assertEquals(4, split.getJournalDepth());
+        assertFalse(split.undo(1));
+        assertTrue(split.undo(2));
+        assertFalse(split.undo(1));
+        assertTrue(split.undo(2));
+        assertEquals(TOTAL, split.getSize());
+    }
+
+    @Test
+    void testFilterSolutionsWithoutMatrix() {
+        FeedbackMatrix.setEnabled(false);
+        try {
+            testFilterSolutions();
+        } finally {
+            FeedbackMatrix.setEnabled(true);
+        }
+    }
+
+    @Test
+    void testFilterWithPositionMasks() {
+        // No 1 or 2 left: 4^4 = 256 codes, still dense for the second filter
+        int   first = ind(1122);
+        int[] freq  = new int[C];
+        for (int guessInd = 0; guessInd < TOTAL; guessInd += 5) {
+            int feedback = Feedback.getFeedback(guessInd, ind(3456), C, D, freq);
+            int expected = 0;
+            for (int s = 0; s < TOTAL; s++) {
+                if (Feedback.getFeedback(first, s, C, D, freq) == 0
+                        && Feedback.getFeedback(guessInd, s, C, D, freq) == feedback) expected++;
+            }
+
+            SolutionSpace space = new SolutionSpace(C, D);
+            space.filterSolution(first, 0);
+            space.filterSolution(guessInd, feedback);
+            assertEquals(expected, space.getSize(), "guessInd=" + guessInd);
+            for (int secretInd : space.getSecrets()) {
+                assertEquals(feedback, Feedback.getFeedback(guessInd, secretInd, C, D, freq));
+            }
+        }
+    }
+
+    @Test
+    void testFilterWithoutPositionMasks() {
+        PositionMasks.setEnabled(false);
+        try {
+            testFilterWithPositionMasks();
+        } finally {
+            PositionMasks.setEnabled(true);
+        }
+    }
+
+    @Test
+    void testParallelFilter() {
+        // Every dense filter on the pool, checked code by code
+        MachineProfile profile = MachineProfile.current();
+        MachineProfile.setCurrent(new MachineProfile(profile.cores(), profile.evaluationsPerSecondPerCore(),
+                                                     profile.evaluationsPerSecond(),
+                                                     profile.parallelSearchThreshold(), 1));
+        FeedbackMatrix.setEnabled(false);
+        try {
+            testFilterWithPositionMasks();
+            testFilterWithoutPositionMasks();
+            testFilterSolutions();
+        } finally {
+            FeedbackMatrix.setEnabled(true);
+            MachineProfile.setCurrent(profile);
+        }
+    }
+
+    @Test
+    void testSaveAndLoad(@TempDir Path dir) throws IOException {
+        int[]         guesses = { ind(1122), ind(3456) };
+        SolutionSpace space   = new SolutionSpace(C, D);
+
+        // Full, dense after one filter, then sparse after two (a new file each time, mapped files stay open)
+        for (int turn = 0; turn <= guesses.length; turn++) {
+            if (turn > 0) {
+                int guessInd = guesses[turn - 1];
+                space.filterSolution(guessInd, Feedback.getFeedback(guessInd, ind(4563), C, D, new int[C]));
+            }
+            Path file = dir.resolve("space" + turn + ".bin");
+            space.save(file);
+            SolutionSpace loaded = SolutionSpace.load(file);
+            assertEquals(space.getSize(), loaded.getSize());
+            assertEquals(space.isSparse(), loaded.isSparse());
+            assertArrayEquals(space.getSecrets(), loaded.getSecrets());
+            assertEquals(0, loaded.getJournalDepth());
+        }
+        assertTrue(space.isSparse());
+
+        // A loaded space filters on its own, without changing the file
+        Path          sparseFile = dir.resolve("space2.bin");
+        SolutionSpace loaded     = SolutionSpace.load(sparseFile);
+        loaded.filterSolution(ind(4563), 40);
+        assertEquals(1, loaded.getSize());
+        assertArrayEquals(space.getSecrets(), SolutionSpace.load(sparseFile).getSecrets());
+
+        // The full space is still undone for free after loading
+        SolutionSpace full = SolutionSpace.load(dir.resolve("space0.bin"));
+        full.filterSolution(ind(1122), 0);
+        assertTrue(full.undo(1));
+        assertEquals(TOTAL, full.getSize());
+
+        Path corrupt = dir.resolve("corrupt.bin");
+        Files.write(corrupt, new byte[] { 1, 2, 3 });
+        assertThrows(IOException.class, () -> SolutionSpace.load(corrupt));
+    }
+
+    @Test
+    void testFilterPartition() {
+        int[] guesses   = { ind(1123), ind(2456), ind(3345) };
+        int[] colorFreq = new int[C];
+
+        SolutionSpace space     = new SolutionSpace(C, D);
+        SolutionSpace reference = new SolutionSpace(C, D);
+        space.setJournalBudget(Long.MAX_VALUE);
+        for (int guessIdx : guesses) {
+            int[]  secrets   = space.getSecrets();
+            byte[] feedbacks = new byte[secrets.length];
+            Feedback.getFeedbackBatch(guessIdx, secrets, C, D, feedbacks);
+
+            int feedback = Feedback.getFeedback(guessIdx, ind(4563), C, D, colorFreq);
+            space.filterPartition(feedbacks, feedback);
+            reference.filterSolution(guessIdx, feedback);
+            assertArrayEquals(reference.getSecrets(), space.getSecrets());
+        }
+        assertThrows(IllegalArgumentException.class, () -> space.filterPartition(new byte[2], 0));
+
+        assertTrue(space.undo(guesses.length));
+        assertEquals(TOTAL, space.getSize());
+    }
+
+    @Test
+    void testGetSample() {
+        SolutionSpace space = new SolutionSpace(C, D);
+        for (int guessIdx : new int[] { ind(1123), ind(2456), ind(3345) }) {
+            space.filterSolution(guessIdx, Feedback.getFeedback(guessIdx, ind(4563), C, D, new int[C]));
+            for (int s : space.getSample(200)) assertTrue(space.contains(s));
+        }
+    }
 }
@@ -0,0 +1,40 @@
+package org.mastermind.compute;
+
+import org.junit.jupiter.api.Test;
+
+import java.util.concurrent.ForkJoinPool;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+class SolverPoolTest {
+
+    @Test
+    void testSharedPool() {
+        assertSame(SolverPool.get(), SolverPool.get());
+        assertNotSame(ForkJoinPool.commonPool(), SolverPool.get());
+        assertEquals(SolverPool.get().getParallelism(), SolverPool.getParallelism());
+    }
+
+    @Test
+    void testSetParallelism() {
+        int original = SolverPool.getParallelism();
+        try {
+            ForkJoinPool old = SolverPool.get();
+            SolverPool.setParallelism(original + 1);
+            assertEquals(original + 1, SolverPool.getParallelism());
+            assertTrue(old.isShutdown());
+
+            // Parallel filtering still works on the new pool
+            SolutionSpace space = new SolutionSpace(9, 5);
+            space.filterSolution(0, 10);
+            assertTrue(space.getSize() > 0);
+        } finally {
+            SolverPool.setParallelism(original);
+        }
+    }
+
+    @Test
+    void testRejectsZeroParallelism() {
+        assertThrows(IllegalArgumentException.class, () -> SolverPool.setParallelism(0));
+    }
+}
@@ -0,0 +1,49 @@
+package org.mastermind.solver;
+
+import org.junit.jupiter.api.Test;
+import org.junit.jupiter.api.io.TempDir;
+import org.mastermind.codes.ConvertCode;
+import org.mastermind.compute.ExpectedSize;
+import org.mastermind.solver.BestFirstGuessCalculator.CellState;
+
+import java.io.IOException;
+import java.nio.file.Files;
+import java.nio.file.Path;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+class BestFirstGuessCalculatorTest {
+
+    /** Small games are evaluated in full, so the calculator must reproduce the table. */
+    @Test
+    void solveCellMatchesTable(@TempDir Path dir) throws IOException {
+        for (int[] game : new int[][] { { 3, 3 }, { 4, 4 } }) {
+            Path      checkpoint = dir.resolve(game[0] + "x" + game[1] + ".ckpt");
+            CellState cell       = BestFirstGuessCalculator.solveCell(game[0], game[1], checkpoint);
+            assertArrayEquals(BestFirstGuess.of(game[0], game[1]), new long[] { cell.bestCode, cell.trueRank });
+            assertTrue(Files.exists(checkpoint));
+        }
+    }
+
+    /** A finished cell is read back from its checkpoint instead of being evaluated again. */
+    @Test
+    void solveCellResumesFromCheckpoint(@TempDir Path dir) throws IOException {
+        Path      checkpoint = dir.resolve("3x3.ckpt");
+        CellState first      = BestFirstGuessCalculator.solveCell(3, 3, checkpoint);
+        long      modified   = Files.getLastModifiedTime(checkpoint).toMillis();
+
+        CellState resumed = BestFirstGuessCalculator.solveCell(3, 3, checkpoint);
+        assertEquals(CellState.DONE, resumed.phase);
+        assertEquals(first.bestCode, resumed.bestCode);
+        assertEquals(first.trueRank, resumed.trueRank);
+        assertEquals(modified, Files.getLastModifiedTime(checkpoint).toMillis());
+    }
+
+    @Test
+    void fullRankMatchesSequentialRank() {
+        int  guessInd = ConvertCode.toIndex(7, 6, 112233);
+        int  total    = (int) Math.pow(7, 6);
+        long expected = new ExpectedSize(6).calcExpectedRankFirst(guessInd, 7, 6, total, new int[100]);
+        assertEquals(expected, BestFirstGuessCalculator.fullRank(guessInd, 7, 6, total));
+    }
+}
@@ -3,6 +3,10 @@ package org.mastermind.solver;
 import org.junit.jupiter.api.BeforeEach;
 import org.junit.jupiter.api.Test;
 import org.mastermind.codes.ConvertCode;
+import org.mastermind.compute.Feedback;
+import org.mastermind.compute.SolverPool;
+
+import java.util.Random;
 
 import static org.junit.jupiter.api.Assertions.*;
 
@@ -41,4 +45,126 @@ class BestGuessTest {
         int bestGuessInd = (int) BestGuess.findBestGuess(allInd, allInd, C, D, true)[0];
         assertEquals(ind(1123), bestGuessInd);
     }
+
+    /**
+     * Test the lane-wise kernel, with and without multi-threading.
+     * Verifies that the result matches the expected best guess of 1123.
+     */
+    @Test
+    void testLanesKernel() {
+        BestGuess.setKernel(BestGuess.Kernel.LANES);
+        try {
+            assertEquals(ind(1123), (int) BestGuess.findBestGuess(allInd, allInd, C, D, false)[0]);
+            assertEquals(ind(1123), (int) BestGuess.findBestGuess(allInd, allInd, C, D, true)[0]);
+        } finally {
+            BestGuess.setKernel(BestGuess.Kernel.AUTO);
+        }
+    }
+
+    /**
+     * Test the color-multiset grouped kernel on the standard (c=6,d=4) game.
+     * Verifies that the result matches the expected best guess of 1123.
+     */
+    @Test
+    void testGroupsKernel() {
+        BestGuess.setKernel(BestGuess.Kernel.GROUPS);
+        try {
+            assertEquals(ind(1123), (int) BestGuess.findBestGuess(allInd, allInd, C, D, false)[0]);
+            assertEquals(ind(1123), (int) BestGuess.findBestGuess(allInd, allInd, C, D, true)[0]);
+        } finally {
+            BestGuess.setKernel(BestGuess.Kernel.AUTO);
+        }
+    }
+
+    /**
+     * Test that early abort returns the same guess and rank as full scoring,
+     * for every kernel and with and without multi-threading.
+     */
+    @Test
+    void testEarlyAbortMatchesFullScoring() {
+        int[] secretsInd = new Random(11).ints(400, 0, allInd.length).distinct().toArray();
+        try {
+            for (BestGuess.Kernel kernel : BestGuess.Kernel.values()) {
+                BestGuess.setKernel(kernel);
+                for (boolean parallel : new boolean[] { false, true }) {
+                    BestGuess.setEarlyAbort(false);
+                    long[] full = BestGuess.findBestGuess(allInd, secretsInd, C, D, parallel);
+                    BestGuess.setEarlyAbort(true);
+                    long[] bounded = BestGuess.findBestGuess(allInd, secretsInd, C, D, parallel);
+                    assertArrayEquals(full, bounded, "kernel=" + kernel + ", parallel=" + parallel);
+                }
+            }
+        } finally {
+            BestGuess.setKernel(BestGuess.Kernel.AUTO);
+            BestGuess.setEarlyAbort(true);
+        }
+    }
+
+    /**
+     * Test that the fork/join search gives the same result whatever the number of workers.
+     */
+    @Test
+    void testParallelismDoesNotChangeResult() {
+        int[]  secretsInd = new Random(5).ints(600, 0, allInd.length).distinct().toArray();
+        long[] expected   = BestGuess.findBestGuess(allInd, secretsInd, C, D, false);
+        int    original   = SolverPool.getParallelism();
+        try {
+            for (int parallelism : new int[] { 1, 3, 8 }) {
+                SolverPool.setParallelism(parallelism);
+                assertArrayEquals(expected, BestGuess.findBestGuess(allInd, secretsInd, C, D, true),
+                                  "parallelism=" + parallelism);
+            }
+        } finally {
+            SolverPool.setParallelism(original);
+        }
+    }
+
+    /**
+     * Test that an incumbent bounds the search without changing which candidate
+     * wins, and is returned only when it beats every candidate.
+     */
+    @Test
+    void testIncumbent() {
+        int[]  secretsInd = new Random(3).ints(300, 0, allInd.length).distinct().toArray();
+        long[] expected   = BestGuess.findBestGuess(allInd, secretsInd, C, D, false);
+
+        // Tied by the winner itself, and bounded by a worse guess
+        long[] tied  = { allInd.length - 1, expected[1] };
+        long[] worse = { allInd.length - 1, expected[1] + 1 };
+        assertArrayEquals(expected, BestGuess.findBestGuess(allInd, secretsInd, null, C, D, null, tied));
+        assertArrayEquals(expected, BestGuess.findBestGuess(allInd, secretsInd, null, C, D, null, worse));
+
+        // Better than every candidate, or the search stopped before scoring any
+        int[]  others = { ind(1111), ind(2222) };
+        long[] best   = { expected[0], expected[1] };
+        assertArrayEquals(best, BestGuess.findBestGuess(others, secretsInd, null, C, D, null, best));
+
+        SearchControl control = SearchControl.unlimited();
+        control.cancel();
+        assertArrayEquals(best, BestGuess.findBestGuess(allInd, secretsInd, null, C, D, control, best));
+        assertArrayEquals(new int[] { (int) expected[0] }, control.bestGuesses());
+    }
+
+    /** The feedbacks kept for the returned guess match it against every secret, for every kernel. */
+    @Test
+    void testKeepBestFeedbacks() {
+        int[] colorFreq = new int[C];
+        for (BestGuess.Kernel k : BestGuess.Kernel.values()) {
+            BestGuess.setKernel(k);
+            try {
+                SearchControl control = SearchControl.unlimited();
+                control.keepBestFeedbacks();
+                long[] result = BestGuess.findBestGuess(allInd, allInd, null, C, D, control);
+
+                byte[] feedbacks = control.bestFeedbacks();
+                assertEquals(allInd.length, feedbacks.length);
+                for (int i = 0; i < allInd.length; i++) {
+                    assertEquals(Feedback.getFeedback((int) result[0], allInd[i], C, D, colorFreq), feedbacks[i]);
+                }
+            } finally {
+                BestGuess.setKernel(BestGuess.Kernel.AUTO);
+            }
+        }
+        assertNull(SearchControl.unlimited().bestFeedbacks());
+    }
 }
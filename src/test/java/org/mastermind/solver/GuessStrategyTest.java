@@ -0,0 +1,86 @@
+package org.mastermind.solver;
+
+import org.junit.jupiter.api.Test;
+import org.mastermind.codes.ConvertCode;
+import org.mastermind.compute.SolutionSpace;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+class GuessStrategyTest {
+
+    private static final int C = 6;
+    private static final int D = 4;
+
+    private static int ind(int code) { return ConvertCode.toIndex(C, D, code); }
+
+    /** A far better candidate wins the race against much worse ones. */
+    @Test
+    void testRaceKeepsClearWinner() {
+        SolutionSpace space   = new SolutionSpace(C, D);
+        int[]         guesses = { ind(1111), ind(2222), ind(1123), ind(3333), ind(4444) };
+        assertArrayEquals(new int[] { ind(1123) }, GuessStrategy.race(guesses, C, D, space, 4096, null));
+    }
+
+    /** Without room for a round, every candidate survives; each round at least halves them. */
+    @Test
+    void testRaceRounds() {
+        SolutionSpace space   = new SolutionSpace(C, D);
+        int[]         guesses = new int[200];
+        for (int i = 0; i < guesses.length; i++) guesses[i] = i * 6;
+
+        assertArrayEquals(guesses, GuessStrategy.race(guesses, C, D, space, 256, null));
+
+        int[] survivors = GuessStrategy.race(guesses, C, D, space, 257, null);
+        assertTrue(survivors.length >= 1 && survivors.length <= guesses.length / 2);
+        for (int i = 1; i < survivors.length; i++) assertTrue(survivors[i - 1] < survivors[i], "original order");
+    }
+
+    /** Adaptive sampling does not touch the exhaustive tiers. */
+    @Test
+    void testAdaptiveSamplingKeepsExhaustiveTiers() {
+        SolutionSpace space = new SolutionSpace(C, D);
+        space.filterSolution(ind(1123), 10);
+        int[][] expected = GuessStrategy.select(C, D, space, new int[] { ind(1123) });
+        try {
+            GuessStrategy.setAdaptiveSampling(true);
+            int[][] adaptive = GuessStrategy.select(C, D, space, new int[] { ind(1123) });
+            assertArrayEquals(expected[0], adaptive[0]);
+            assertArrayEquals(expected[1], adaptive[1]);
+        } finally {
+            GuessStrategy.setAdaptiveSampling(false);
+        }
+    }
+
+    /** The chosen tier is reported through the control, and only the exhaustive tiers score every secret. */
+    @Test
+    void testSelectReportsTier() {
+        SolutionSpace space = new SolutionSpace(C, D);
+        space.filterSolution(ind(1123), 10);
+        SearchControl control = SearchControl.unlimited();
+        GuessStrategy.select(C, D, space, new int[] { ind(1123) }, control);
+        assertEquals(GuessStrategy.Tier.CANONICAL_GUESSES, control.progress().tier());
+
+        assertTrue(GuessStrategy.Tier.CANONICAL_GUESSES.scoresAllSecrets());
+        assertTrue(GuessStrategy.Tier.SECRETS_AS_GUESSES.scoresAllSecrets());
+        assertFalse(GuessStrategy.Tier.SAMPLED_SECRETS.scoresAllSecrets());
+        assertFalse(GuessStrategy.Tier.SAMPLED_GUESSES.scoresAllSecrets());
+    }
+
+    /** Past the deadline, the cheapest tier is chosen and racing stops at once. */
+    @Test
+    void testSelectPastDeadline() {
+        SolutionSpace space = new SolutionSpace(C, D);
+        space.filterSolution(ind(1123), 10);
+        SearchControl control = SearchControl.withTimeout(0);
+        GuessStrategy.select(C, D, space, new int[] { ind(1123) }, control);
+        assertEquals(GuessStrategy.Tier.SAMPLED_GUESSES, control.progress().tier());
+
+        int[] guesses = { ind(1111), ind(2222), ind(1123), ind(3333), ind(4444) };
+        assertArrayEquals(guesses, GuessStrategy.race(guesses, C, D, new SolutionSpace(C, D), 4096, control));
+    }
+
+    @Test
+    void testTargetLatency() {
+        assertThrows(IllegalArgumentException.class, () -> GuessStrategy.setTargetLatency(0));
+    }
+}
@@ -0,0 +1,83 @@
+package org.mastermind.solver;
+
+import org.junit.jupiter.api.Test;
+import org.mastermind.compute.ExpectedSize;
+import org.mastermind.compute.Feedback;
+import org.mastermind.compute.SolutionSpace;
+
+import java.util.Random;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+class RetainedCandidatesTest {
+
+    /** Rank of the best of the guesses, scored from scratch against the current solution space. */
+    private static long freshBestRank(int[] guessesInd, SolutionSpace space, int c, int d) {
+        ExpectedSize expectedSize = new ExpectedSize(d);
+        long         best         = Long.MAX_VALUE;
+        for (int guessInd : guessesInd) {
+            best = Math.min(best, expectedSize.calcExpectedRank(guessInd, space.getSecrets(), c, d, new int[100]));
+        }
+        return best;
+    }
+
+    /**
+     * Test that the histograms follow a whole game, whether they are updated by the
+     * eliminated secrets or recounted from the kept ones, with and without a
+     * feedback matrix.
+     */
+    @Test
+    void testUpdateMatchesFreshScoring() {
+        for (int[] game : new int[][] { { 6, 4 }, { 7, 5 } }) {
+            int    c      = game[0];
+            int    d      = game[1];
+            int    total  = (int) Math.pow(c, d);
+            Random random = new Random(c * 10 + d);
+            int    secret = random.nextInt(total);
+
+            SolutionSpace      space    = new SolutionSpace(c, d);
+            RetainedCandidates retained = new RetainedCandidates(c, d, 4);
+            int[]              guesses  = random.ints(0, total).distinct().limit(6).toArray();
+            retained.retain(guesses, space.getSecrets());
+            assertEquals(4, retained.size());
+
+            int[] kept = { guesses[2], guesses[3], guesses[4], guesses[5] };  // the last four are retained
+            for (int turn = 0; turn < 4 && space.getSize() > 1; turn++) {
+                int guess = random.nextInt(total);
+                space.filterSolution(guess, Feedback.getFeedback(guess, secret, c, d, new int[10]));
+                retained.update(space);
+
+                long[] best = retained.best();
+                assertEquals(freshBestRank(kept, space, c, d), best[1], "c=" + c + ", d=" + d + ", turn=" + turn);
+                assertEquals(best[1], freshBestRank(new int[] { (int) best[0] }, space, c, d));
+            }
+        }
+    }
+
+    /**
+     * Test that guesses retained again keep their histograms, duplicates are
+     * dropped, and a capacity of 0 retains nothing.
+     */
+    @Test
+    void testRetain() {
+        SolutionSpace      space    = new SolutionSpace(6, 4);
+        RetainedCandidates retained = new RetainedCandidates(6, 4, 3);
+        retained.retain(new int[] { 7, 7, 7 }, space.getSecrets());
+        assertEquals(1, retained.size());
+        assertEquals(7, retained.best()[0]);
+
+        space.filterSolution(0, 10);
+        retained.update(space);
+        retained.retain(new int[] { 100, 7 }, space.getSecrets());
+        assertEquals(2, retained.size());
+        assertEquals(freshBestRank(new int[] { 7, 100 }, space, 6, 4), retained.best()[1]);
+
+        retained.clear();
+        assertNull(retained.best());
+
+        RetainedCandidates none = new RetainedCandidates(6, 4, 0);
+        none.retain(new int[] { 1, 2 }, space.getSecrets());
+        assertEquals(0, none.size());
+        assertThrows(IllegalArgumentException.class, () -> new RetainedCandidates(6, 4, -1));
+    }
+}
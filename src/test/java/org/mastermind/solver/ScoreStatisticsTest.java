@@ -0,0 +1,28 @@
+package org.mastermind.solver;
+
+import org.junit.jupiter.api.Test;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+class ScoreStatisticsTest {
+
+    @Test
+    void testNormalCDF() {
+        assertEquals(0.5, ScoreStatistics.normalCDF(0), 1e-6);
+        assertEquals(0.975, ScoreStatistics.normalCDF(1.96), 1e-4);
+        assertEquals(0.025, ScoreStatistics.normalCDF(-1.96), 1e-4);
+    }
+
+    @Test
+    void testConfidenceLower() {
+        // A: scores 1, 2, 3; B: scores 4, 5, 6
+        double confidence = ScoreStatistics.confidenceLower(6, 14, 15, 77, 3);
+        assertTrue(confidence > 99, "A is clearly lower");
+        assertEquals(100 - confidence, ScoreStatistics.confidenceLower(15, 77, 6, 14, 3), 1e-9);
+
+        // Identical constant scores cannot be told apart, different constant scores always can
+        assertEquals(50.0, ScoreStatistics.confidenceLower(6, 12, 6, 12, 3));
+        assertEquals(100.0, ScoreStatistics.confidenceLower(3, 3, 6, 12, 3));
+        assertEquals(0.0, ScoreStatistics.confidenceLower(6, 12, 3, 3, 3));
+    }
+}
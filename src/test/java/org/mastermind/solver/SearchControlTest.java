@@ -0,0 +1,56 @@
+package org.mastermind.solver;
+
+import org.junit.jupiter.api.Test;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+class SearchControlTest {
+
+    @Test
+    void testUnlimitedStopsOnlyWhenCancelled() {
+        SearchControl control = SearchControl.unlimited();
+        assertFalse(control.shouldStop());
+        control.cancel();
+        assertTrue(control.isCancelled());
+        assertTrue(control.shouldStop());
+    }
+
+    @Test
+    void testTimeout() throws InterruptedException {
+        assertTrue(SearchControl.withTimeout(0).shouldStop());
+
+        SearchControl control = SearchControl.withTimeout(20);
+        assertFalse(control.shouldStop());
+        Thread.sleep(40);
+        assertTrue(control.shouldStop());
+        assertFalse(control.isCancelled());
+    }
+
+    @Test
+    void testStoppedSearchReturnsScoredGuess() {
+        int[] allInd = new int[1296];
+        for (int i = 0; i < allInd.length; i++) allInd[i] = i;
+
+        SearchControl control = SearchControl.unlimited();
+        control.cancel();
+        long[] result = BestGuess.findBestGuess(allInd, allInd, null, 6, 4, control);
+        assertTrue(result[0] >= 0);
+        assertTrue(result[1] > 0);
+    }
+
+    @Test
+    void testProgressAfterFullSearch() {
+        int[] allInd = new int[1296];
+        for (int i = 0; i < allInd.length; i++) allInd[i] = i;
+
+        SearchControl control = SearchControl.unlimited();
+        control.setSearchSpace(GuessStrategy.Tier.SECRETS_AS_GUESSES, allInd.length, allInd.length);
+        long[] result = BestGuess.findBestGuess(allInd, allInd, null, 6, 4, control);
+
+        SearchProgress progress = control.progress();
+        assertEquals(GuessStrategy.Tier.SECRETS_AS_GUESSES, progress.tier());
+        assertEquals(allInd.length, progress.evaluations());
+        assertEquals(result[0], progress.bestGuess());
+        assertEquals(result[1], progress.bestRank());
+    }
+}
@@ -0,0 +1,74 @@
+package org.mastermind.solver;
+
+import org.junit.jupiter.api.Test;
+
+import java.io.IOException;
+import java.io.StringReader;
+import java.util.Arrays;
+import java.util.List;
+import java.util.Map;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+class SecondGuessBookTest {
+
+    private static Map<Integer, long[]> parse(String text) throws IOException {
+        return SecondGuessBook.parse(new StringReader(text));
+    }
+
+    @Test
+    void parseKeepsEntriesOfTheCurrentFirstGuess() throws IOException {
+        Map<Integer, long[]> entries = parse("""
+                # comment
+                version %d
+                6 4 1123 10 1245 12345 256 CANONICAL_GUESSES
+                6 4 1111 20 1234 999 96 SAMPLED_SECRETS
+                """.formatted(SecondGuessBook.VERSION));
+
+        assertEquals(1, entries.size());
+        assertArrayEquals(new long[] { 1123, 1245, 12345, 256 }, entries.get(SecondGuessBook.key(6, 4, 10)));
+    }
+
+    @Test
+    void parseIgnoresOtherVersions() throws IOException {
+        assertTrue(parse("version " + (SecondGuessBook.VERSION + 1) + "\n6 4 1123 10 1245 12345\n").isEmpty());
+        assertTrue(parse("version 1\n6 4 1123 10 1245 12345\n").isEmpty());
+    }
+
+    @Test
+    void parseRejectsMalformedBooks() {
+        String version = "version " + SecondGuessBook.VERSION + "\n";
+        assertThrows(IllegalArgumentException.class, () -> parse("6 4 1123 10 1245 12345 256 CANONICAL_GUESSES\n"));
+        assertThrows(IllegalArgumentException.class, () -> parse(version + "6 4 1123 10 1245 12345\n"));
+        assertThrows(IllegalArgumentException.class, () -> parse(version + "6 4 1123 10 1245 12345 256 EXACT\n"));
+    }
+
+    /**
+     * Test that the shipped book has every entry the generator computes, with the
+     * same values, for the games small enough to check here.
+     */
+    @Test
+    void shippedEntriesMatchGenerator() {
+        for (int c = 2; c <= 6; c++) {
+            for (int d = 2; d <= 4; d++) {
+                List<String> lines = SecondGuessBookGenerator.entries(c, d);
+                for (String line : lines) {
+                    long[] fields = Arrays.stream(line.split(" ")).limit(7).mapToLong(Long::parseLong).toArray();
+                    long[] entry  = SecondGuessBook.of(c, d, (int) fields[2], (int) fields[3]);
+                    assertNotNull(entry, line);
+                    assertArrayEquals(new long[] { fields[4], fields[5], fields[6] }, entry, line);
+                }
+            }
+        }
+    }
+
+    @Test
+    void disabledBookHasNoEntries() {
+        try {
+            SecondGuessBook.setEnabled(false);
+            assertNull(SecondGuessBook.of(6, 4, 1123, 10));
+        } finally {
+            SecondGuessBook.setEnabled(true);
+        }
+    }
+}
@@ -1,5 +1,11 @@
+import os
+
 import pytest
 
+# Skip calibrating the machine and writing its profile to the home directory. Set
+# before any test module is collected, as importing them starts the JVM.
+os.environ.setdefault("MASTERMIND_PROFILE", "reference")
+
 
 @pytest.fixture(scope="session", autouse=True)
 def jvm():
@@ -0,0 +1,66 @@
+"""Tests for demo._describe_progress() and _suggest_with_progress() — Python-side logic only.
+
+Mocks:
+  - SearchProgress    (Java record — replaced by a MagicMock with accessors)
+  - ConvertCode       (Java class — whole object replaced)
+  - MastermindSession (Java object — a MagicMock, without getSearchProgress for a stale jar)
+  - Live              (rich live display — a MagicMock)
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from mastermind.demo import _describe_progress, _suggest_with_progress
+
+
+def _progress(evaluations, best_guess=-1, best_rank=0, elapsed_s=2.0):
+    progress = MagicMock()
+    progress.tier.return_value = "CANONICAL_GUESSES"
+    progress.guesses.return_value = 1000
+    progress.secrets.return_value = 5000
+    progress.evaluations.return_value = evaluations
+    progress.bestGuess.return_value = best_guess
+    progress.bestRank.return_value = best_rank
+    progress.elapsedNanos.return_value = int(elapsed_s * 1e9)
+    return progress
+
+
+class TestDescribeProgress:
+    def test_counts_and_throughput(self):
+        text = _describe_progress(_progress(400), 6, 4)
+        assert "CANONICAL_GUESSES" in text
+        assert "400/1000 guesses" in text
+        assert "1.0M pairs/s" in text  # 400 * 5000 / 2s
+        assert "best so far" not in text
+
+    def test_best_guess_shown(self):
+        convert = MagicMock()
+        convert.toCode.return_value = 1123
+        with patch("mastermind.demo.ConvertCode", convert):
+            text = _describe_progress(_progress(10, best_guess=7, best_rank=99), 6, 4)
+        assert "best so far 1123 (rank 99)" in text
+        convert.toCode.assert_called_once_with(6, 4, 7)
+
+
+class TestSuggestWithProgress:
+    def test_returns_search_result(self):
+        session = MagicMock()
+        session.suggestGuessWithDetails.return_value = [7, 99, 1296]
+        session.getSearchProgress.return_value = None
+        live, table = MagicMock(), MagicMock()
+        assert _suggest_with_progress(session, live, table, 6, 4) == [7, 99, 1296]
+        live.update.assert_called_with(table)
+
+    def test_search_error_is_raised(self):
+        session = MagicMock()
+        session.suggestGuessWithDetails.side_effect = RuntimeError("solved")
+        session.getSearchProgress.return_value = None
+        with pytest.raises(RuntimeError, match="solved"):
+            _suggest_with_progress(session, MagicMock(), MagicMock(), 6, 4)
+
+    def test_stale_jar_falls_back_to_plain_call(self):
+        session = MagicMock(spec=["suggestGuessWithDetails"])
+        session.suggestGuessWithDetails.return_value = [7, 99, 1296]
+        live = MagicMock()
+        assert _suggest_with_progress(session, live, MagicMock(), 6, 4) == [7, 99, 1296]
+        live.update.assert_not_called()
@@ -0,0 +1,98 @@
+"""Tests for get_feedback_batch() — Python-side logic only.
+
+Mocks:
+  - Feedback (Java class — whole object replaced; fills the output buffer)
+  - Feedback of a stale jar (a mock without getFeedbackBatch)
+"""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from jpype.types import JArray, JByte, JInt
+from mastermind.feedback_batch import get_feedback_batch
+
+
+def _fake_feedback():
+    """Return a mock Feedback whose getFeedbackBatch writes secret % 91."""
+    fb = MagicMock()
+
+    def batch(guess_ind, secrets, c, d, feedbacks):
+        for i, secret in enumerate(secrets):
+            feedbacks[i] = secret % 91
+
+    fb.getFeedbackBatch.side_effect = batch
+    return fb
+
+
+class TestGetFeedbackBatch:
+    def test_single_bridge_call(self):
+        fb = _fake_feedback()
+        with patch("mastermind.feedback_batch.Feedback", fb):
+            get_feedback_batch(5, [1, 2, 3], 6, 4)
+        assert fb.getFeedbackBatch.call_count == 1
+        args = fb.getFeedbackBatch.call_args.args
+        assert (args[0], list(args[1]), args[2], args[3]) == (5, [1, 2, 3], 6, 4)
+
+    def test_returns_java_buffer(self):
+        with patch("mastermind.feedback_batch.Feedback", _fake_feedback()):
+            result = get_feedback_batch(0, [10, 40, 90], 6, 4)
+        assert list(result) == [10, 40, 90]
+
+    def test_fills_out_buffer(self):
+        out = bytearray(3)
+        with patch("mastermind.feedback_batch.Feedback", _fake_feedback()):
+            result = get_feedback_batch(0, [3, 20, 31], 6, 4, out=out)
+        assert result is out
+        assert list(out) == [3, 20, 31]
+
+    def test_empty_secrets(self):
+        with patch("mastermind.feedback_batch.Feedback", _fake_feedback()):
+            assert list(get_feedback_batch(0, [], 6, 4)) == []
+
+    def test_fills_java_out_buffer_directly(self):
+        fb = _fake_feedback()
+        out = JArray(JByte)(3)
+        with patch("mastermind.feedback_batch.Feedback", fb):
+            result = get_feedback_batch(0, JArray(JInt)([3, 20, 31]), 6, 4, out=out)
+        assert result is out
+        assert fb.getFeedbackBatch.call_args.args[4] is out
+        assert list(out) == [3, 20, 31]
+
+    def test_reuses_java_buffers_between_calls(self):
+        fb = _fake_feedback()
+        out = bytearray(3)
+        with patch("mastermind.feedback_batch.Feedback", fb):
+            get_feedback_batch(0, [1, 2, 3], 6, 4, out=out)
+            get_feedback_batch(0, [4, 5, 6], 6, 4, out=out)
+        first, second = (call.args for call in fb.getFeedbackBatch.call_args_list)
+        assert first[1] is second[1] and first[4] is second[4]
+        assert list(out) == [4, 5, 6]
+
+    def test_threads_use_their_own_java_buffers(self):
+        fb = _fake_feedback()
+        with patch("mastermind.feedback_batch.Feedback", fb):
+            get_feedback_batch(0, [1, 2, 3], 6, 4, out=bytearray(3))
+            worker = threading.Thread(
+                target=get_feedback_batch, args=(0, [4, 5, 6], 6, 4, bytearray(3))
+            )
+            worker.start()
+            worker.join()
+        first, second = (call.args for call in fb.getFeedbackBatch.call_args_list)
+        assert first[1] is not second[1] and first[4] is not second[4]
+
+    def test_rejects_out_of_other_length(self):
+        with (
+            patch("mastermind.feedback_batch.Feedback", _fake_feedback()),
+            pytest.raises(ValueError),
+        ):
+            get_feedback_batch(0, [1, 2, 3], 6, 4, out=bytearray(2))
+
+    def test_stale_jar_fails_clearly(self):
+        stale = MagicMock(spec=[])
+        stale.__name__ = "org.mastermind.compute.Feedback"
+        with (
+            patch("mastermind.feedback_batch.Feedback", stale),
+            pytest.raises(RuntimeError, match="build.py"),
+        ):
+            get_feedback_batch(0, [1, 2, 3], 6, 4)
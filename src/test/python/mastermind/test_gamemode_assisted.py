@@ -85,6 +85,7 @@ class TestAssistedPlay:
             printed = " ".join(str(c) for c in console.print.call_args_list)
             assert "Perfect" in printed or "✓" in printed
             pause.assert_called_once()
+            SessionClass.return_value.setUndoBudget.assert_called_once_with(64 << 20)
 
     def test_win_using_custom_guess(self):
         """Enter a different code (not suggestion) and win."""